@@ -0,0 +1,154 @@
+"""
+Generates synthetic ETSI SOL001 descriptors for benchmarking, with a configurable number of servers (Vdu.Compute.NovaServer),
+ports (VduCp.NeutronPort) per server, virtual links (VnfVirtualLink) and security groups. Ports are spread across the virtual links and
+each port references every security group, so the descriptor exercises the lookups made by the driver's translation plug-ins.
+
+Set extension_types to False to generate the base SOL001 types (Vdu.Compute and VduCp, without security groups) instead, which can be
+translated without the driver's translation plug-ins.
+
+Usage: python benchmarks/sol001_generator.py --nodes 1000 > descriptor.yaml
+"""
+import argparse
+from collections import OrderedDict
+import yaml
+
+COMPUTE_TYPE = 'tosca.nodes.nfv.Vdu.Compute.NovaServer'
+PORT_TYPE = 'tosca.nodes.nfv.VduCp.NeutronPort'
+BASE_COMPUTE_TYPE = 'tosca.nodes.nfv.Vdu.Compute'
+BASE_PORT_TYPE = 'tosca.nodes.nfv.VduCp'
+VIRTUAL_LINK_TYPE = 'tosca.nodes.nfv.VnfVirtualLink'
+SECURITY_GROUP_TYPE = 'tosca.nodes.network.NeutronSecurityGroup'
+
+
+class DescriptorShape():
+    """The number of each type of node in a generated descriptor"""
+
+    def __init__(self, servers, ports_per_server=2, virtual_links=1, security_groups=1, extension_types=True):
+        if servers < 1 or virtual_links < 1:
+            raise ValueError('A descriptor needs at least one server and one virtual link')
+        self.servers = servers
+        self.ports_per_server = ports_per_server
+        self.virtual_links = virtual_links
+        self.security_groups = security_groups if extension_types else 0
+        self.extension_types = extension_types
+
+    @classmethod
+    def for_node_count(cls, nodes, ports_per_server=2, extension_types=True):
+        """Shape with roughly the given number of nodes, with a virtual link for every 10 servers and a security group for every 20"""
+        per_server = 1 + ports_per_server + 0.1 + (0.05 if extension_types else 0)
+        servers = max(1, int(round(nodes / per_server)))
+        return cls(servers, ports_per_server=ports_per_server, virtual_links=max(1, servers // 10),
+                   security_groups=max(1, servers // 20), extension_types=extension_types)
+
+    @property
+    def ports(self):
+        return self.servers * self.ports_per_server
+
+    @property
+    def nodes(self):
+        return self.servers + self.ports + self.virtual_links + self.security_groups
+
+    def to_dict(self):
+        return {
+            'nodes': self.nodes,
+            'servers': self.servers,
+            'ports': self.ports,
+            'virtual_links': self.virtual_links,
+            'security_groups': self.security_groups,
+            'extension_types': self.extension_types
+        }
+
+
+def virtual_link_node(index):
+    return {
+        'type': VIRTUAL_LINK_TYPE,
+        'properties': {
+            'connectivity_type': {'layer_protocols': ['ipv4']},
+            'vl_profile': {
+                'max_bitrate_requirements': {'root': 1000},
+                'min_bitrate_requirements': {'root': 1000},
+                'virtual_link_protocol_data': [{
+                    'associated_layer_protocol': 'ipv4',
+                    'l3_protocol_data': {'ip_version': 'ipv4', 'cidr': '10.{0}.{1}.0/24'.format(index // 256, index % 256)}
+                }]
+            }
+        }
+    }
+
+
+def server_node(index, extension_types):
+    properties = {
+        'name': 'vdu-{0}'.format(index),
+        'description': 'Synthetic server {0}'.format(index),
+        'vdu_profile': {'min_number_of_instances': 1, 'max_number_of_instances': 1}
+    }
+    if extension_types:
+        properties.update({'flavor': 'm1.small', 'image': 'cirros', 'key_name': {'get_input': 'key_name'}, 'user_data_params': {}})
+        return {'type': COMPUTE_TYPE, 'properties': properties}
+    return {
+        'type': BASE_COMPUTE_TYPE,
+        'properties': properties,
+        'capabilities': {
+            'virtual_compute': {
+                'properties': {
+                    'virtual_memory': {'virtual_mem_size': '2 GB'},
+                    'virtual_cpu': {'num_virtual_cpu': 2},
+                    'virtual_local_storage': [{'size_of_storage': '10 GB'}]
+                }
+            }
+        }
+    }
+
+
+def port_node(server_index, port_index, virtual_link_name, security_group_names, extension_types):
+    properties = {'layer_protocols': ['ipv4'], 'order': port_index}
+    if extension_types:
+        # Include a group from outside the topology, which the translation must leave as a name
+        properties['security_groups'] = list(security_group_names) + ['default']
+    return {
+        'type': PORT_TYPE if extension_types else BASE_PORT_TYPE,
+        'properties': properties,
+        'requirements': [
+            {'virtual_binding': 'vdu_{0}'.format(server_index)},
+            {'virtual_link': virtual_link_name}
+        ]
+    }
+
+
+def build_descriptor(shape):
+    """Returns the descriptor (as a YAML string) with the given DescriptorShape"""
+    node_templates = OrderedDict()
+    security_group_names = ['sg_{0}'.format(i) for i in range(shape.security_groups)]
+    for name in security_group_names:
+        node_templates[name] = {'type': SECURITY_GROUP_TYPE, 'properties': {'name': name}}
+    virtual_link_names = ['vl_{0}'.format(i) for i in range(shape.virtual_links)]
+    for i, name in enumerate(virtual_link_names):
+        node_templates[name] = virtual_link_node(i)
+    for server_index in range(shape.servers):
+        node_templates['vdu_{0}'.format(server_index)] = server_node(server_index, shape.extension_types)
+        for port_index in range(shape.ports_per_server):
+            virtual_link_name = virtual_link_names[(server_index * shape.ports_per_server + port_index) % len(virtual_link_names)]
+            node_templates['cp_{0}_{1}'.format(server_index, port_index)] = port_node(server_index, port_index, virtual_link_name,
+                                                                                      security_group_names, shape.extension_types)
+    topology_template = {'node_templates': dict(node_templates)}
+    if shape.extension_types:
+        topology_template['inputs'] = {'key_name': {'type': 'string', 'default': 'benchmark'}}
+    return yaml.safe_dump({
+        'tosca_definitions_version': 'tosca_simple_yaml_1_3',
+        'imports': ['etsi_nfv_sol001'],
+        'topology_template': topology_template
+    }, default_flow_style=False, sort_keys=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=100)
+    parser.add_argument('--ports-per-server', type=int, default=2)
+    parser.add_argument('--base-types', action='store_true', help='Use the base SOL001 types rather than the driver extensions')
+    args = parser.parse_args()
+    shape = DescriptorShape.for_node_count(args.nodes, ports_per_server=args.ports_per_server, extension_types=not args.base_types)
+    print(build_descriptor(shape))
+
+
+if __name__ == '__main__':
+    main()
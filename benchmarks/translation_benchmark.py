@@ -0,0 +1,144 @@
+"""
+Measures how translating TOSCA to Heat scales with the size of the topology, using synthetic SOL001 descriptors (see sol001_generator.py).
+
+For each topology size the time taken to parse the descriptor and to translate it to Heat (the two steps of
+ToscaHeatTranslatorService.generate_heat_template), the peak memory allocated whilst doing so and the size of the Heat template are recorded.
+Results can be written to a JSON file and compared with those of another version, to find regressions.
+
+Usage: python benchmarks/translation_benchmark.py [--nodes 10,100,1000,5000] [--repeat N] [--base-types] [--output results.json]
+                                                  [--compare baseline.json [--max-regression 0.2]]
+"""
+import argparse
+import datetime
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import osvimdriver
+import osvimdriver.yamlutil as yamlutil
+from osvimdriver.service.tosca import ToscaParserService
+from osvimdriver.tosca.dumper import install_heat_dumper
+from translator.hot.tosca_translator import TOSCATranslator
+from sol001_generator import DescriptorShape, build_descriptor
+
+DEFAULT_NODE_COUNTS = '10,50,100,500,1000,2000,5000'
+TRANSLATION_DICT_KEY = 'main_hot'
+
+
+def parse(parser_service, descriptor):
+    return parser_service.parse_tosca_str(descriptor)
+
+
+def translate(tosca):
+    return TOSCATranslator(tosca, {}).translate_to_yaml_files_dict(TRANSLATION_DICT_KEY)[TRANSLATION_DICT_KEY]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def measure_peak_memory(parser_service, descriptor):
+    tracemalloc.start()
+    try:
+        translate(parse(parser_service, descriptor))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmark(parser_service, shape, repeat):
+    result = shape.to_dict()
+    descriptor = build_descriptor(shape)
+    result['descriptor_bytes'] = len(descriptor.encode('utf-8'))
+    parse_times = []
+    translate_times = []
+    try:
+        for _ in range(repeat):
+            tosca, parse_time = timed(parse, parser_service, descriptor)
+            heat, translate_time = timed(translate, tosca)
+            parse_times.append(parse_time)
+            translate_times.append(translate_time)
+        result['output_bytes'] = len(heat.encode('utf-8'))
+        result['peak_memory_bytes'] = measure_peak_memory(parser_service, descriptor)
+    except Exception as e:
+        result['error'] = '{0}: {1}'.format(type(e).__name__, str(e).strip().splitlines()[0] if str(e).strip() else '')
+    for name, times in [('parse_seconds', parse_times), ('translate_seconds', translate_times)]:
+        if len(times) > 0:
+            result[name] = {'min': min(times), 'median': statistics.median(times)}
+    return result
+
+
+def compare(results, baseline, max_regression):
+    """Prints the change in median parse and translate time against a baseline, returning False if any grew by more than max_regression"""
+    baseline_by_nodes = {result['nodes']: result for result in baseline['results']}
+    ok = True
+    for result in results['results']:
+        previous = baseline_by_nodes.get(result['nodes'], None)
+        if previous is None:
+            continue
+        for name in ['parse_seconds', 'translate_seconds']:
+            if name not in result or name not in previous:
+                continue
+            change = result[name]['median'] / previous[name]['median'] - 1
+            regressed = max_regression is not None and change > max_regression
+            ok = ok and not regressed
+            print('{0} nodes {1}: {2:.1f}ms -> {3:.1f}ms ({4:+.0%}){5}'.format(result['nodes'], name.split('_')[0], previous[name]['median'] * 1000,
+                                                                         result[name]['median'] * 1000, change, ' REGRESSION' if regressed else ''))
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', default=DEFAULT_NODE_COUNTS, help='Comma separated topology sizes (approximate number of nodes)')
+    parser.add_argument('--ports-per-server', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--base-types', action='store_true', help='Use the base SOL001 types rather than the driver extensions')
+    parser.add_argument('--output', help='File to write the results to, as JSON')
+    parser.add_argument('--compare', help='Results of a previous run to compare with')
+    parser.add_argument('--max-regression', type=float, default=None, help='Exit with an error if a median time grew by more than this fraction')
+    args = parser.parse_args()
+    baseline = None
+    if args.compare is not None:
+        # Read before any results are written, in case the same file is used for both
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+    # heat-translator logs every step of a translation, and warns about every bitrate it cannot translate
+    logging.disable(logging.WARNING)
+    install_heat_dumper()
+    parser_service = ToscaParserService()
+
+    results = {
+        'version': osvimdriver.__version__,
+        'python': platform.python_version(),
+        'libyaml': yamlutil.LIBYAML_AVAILABLE,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'repeat': args.repeat,
+        'results': []
+    }
+    for nodes in [int(value) for value in args.nodes.split(',')]:
+        shape = DescriptorShape.for_node_count(nodes, ports_per_server=args.ports_per_server, extension_types=not args.base_types)
+        result = benchmark(parser_service, shape, args.repeat)
+        results['results'].append(result)
+        if 'error' in result:
+            print('{0} nodes: failed: {1}'.format(result['nodes'], result['error']))
+        else:
+            print('{0} nodes: parse {1:.1f}ms, translate {2:.1f}ms, peak memory {3:.1f}MB, output {4}KB'.format(
+                result['nodes'], result['parse_seconds']['median'] * 1000, result['translate_seconds']['median'] * 1000,
+                result['peak_memory_bytes'] / (1024 * 1024), result['output_bytes'] // 1024))
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if baseline is not None:
+        if not compare(results, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Compares the time taken to load a TOSCA template and write a Heat template with the pure Python PyYAML implementations
+against the libyaml based implementations used by the driver (see osvimdriver.yamlutil), and checks both produce the same result.
+
+Usage: python benchmarks/yaml_benchmark.py [--servers N] [--iterations N]
+"""
+import argparse
+import copy
+import timeit
+from collections import OrderedDict
+import yaml
+import osvimdriver.yamlutil as yamlutil
+from osvimdriver.tosca.dumper import HeatYaml
+
+USER_DATA = '#!/bin/bash\n' + ''.join('echo "configuring step {0}" >> /var/log/setup.log\n'.format(i) for i in range(50))
+
+
+def build_tosca_template(servers):
+    node_templates = OrderedDict()
+    outputs = OrderedDict()
+    for i in range(servers):
+        node_templates['server_{0}'.format(i)] = {
+            'type': 'tosca.nodes.Compute',
+            'capabilities': {'host': {'properties': {'num_cpus': 2, 'disk_size': '10 GB', 'mem_size': '2 GB'}}},
+            'properties': {'image': {'get_input': 'image'}, 'key_name': {'get_input': 'key_name'}, 'user_data': USER_DATA}
+        }
+        node_templates['server_{0}_port'.format(i)] = {
+            'type': 'tosca.nodes.network.Port',
+            'requirements': [{'binding': {'node': 'server_{0}'.format(i)}}, {'link': {'node': 'private_network'}}]
+        }
+        outputs['server_{0}_ip'.format(i)] = {'value': {'get_attribute': ['server_{0}'.format(i), 'private_address']}}
+    node_templates['private_network'] = {'type': 'tosca.nodes.network.Network', 'properties': {'network_name': 'private'}}
+    return yaml.safe_dump({
+        'tosca_definitions_version': 'tosca_simple_yaml_1_0',
+        'topology_template': {
+            'inputs': {'image': {'type': 'string'}, 'key_name': {'type': 'string'}},
+            'node_templates': dict(node_templates),
+            'outputs': dict(outputs)
+        }
+    }, default_flow_style=False)
+
+
+def represent_ordereddict(dumper, data):
+    # As registered by heat-translator when writing Heat templates
+    nodes = [(dumper.represent_data(key), dumper.represent_data(value)) for key, value in data.items()]
+    return yaml.nodes.MappingNode('tag:yaml.org,2002:map', nodes)
+
+
+def build_heat_dict(servers):
+    resources = OrderedDict()
+    for i in range(servers):
+        resources['server_{0}'.format(i)] = OrderedDict([('type', 'OS::Nova::Server'), ('properties', OrderedDict([
+            ('flavor', 'm1.medium'), ('image', {'get_param': 'image'}), ('key_name', {'get_param': 'key_name'}),
+            ('user_data_format', 'SOFTWARE_CONFIG'), ('user_data', USER_DATA)
+        ]))])
+        resources['server_{0}_port'.format(i)] = OrderedDict([('type', 'OS::Neutron::Port'), ('properties', OrderedDict([
+            ('network', 'private')
+        ]))])
+    return OrderedDict([('parameters', OrderedDict()), ('resources', resources), ('outputs', OrderedDict())])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--servers', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=10)
+    args = parser.parse_args()
+    print('libyaml available: {0}'.format(yamlutil.LIBYAML_AVAILABLE))
+
+    tosca_template = build_tosca_template(args.servers)
+    python_loaded = yaml.load(tosca_template, Loader=yaml.SafeLoader)
+    libyaml_loaded = yamlutil.safe_load(tosca_template)
+    if python_loaded != libyaml_loaded:
+        raise SystemExit('Loaded templates differ')
+    python_load = timeit.timeit(lambda: yaml.load(tosca_template, Loader=yaml.SafeLoader), number=args.iterations)
+    libyaml_load = timeit.timeit(lambda: yamlutil.safe_load(tosca_template), number=args.iterations)
+    print('load {0} bytes: python {1:.1f}ms, libyaml {2:.1f}ms ({3:.1f}x)'.format(len(tosca_template), python_load * 1000 / args.iterations,
+                                                                              libyaml_load * 1000 / args.iterations, python_load / libyaml_load))
+
+    heat_dict = build_heat_dict(args.servers)
+    python_yaml = HeatYaml(dumper=yaml.Dumper)
+    libyaml_yaml = HeatYaml()
+    for heat_yaml in [python_yaml, libyaml_yaml]:
+        heat_yaml.add_representer(OrderedDict, represent_ordereddict)
+        heat_yaml.add_representer(dict, represent_ordereddict)
+    python_dumped = python_yaml.dump(copy.deepcopy(heat_dict), default_flow_style=False)
+    libyaml_dumped = libyaml_yaml.dump(copy.deepcopy(heat_dict), default_flow_style=False)
+    if python_dumped != libyaml_dumped:
+        raise SystemExit('Dumped templates differ')
+    python_dump = timeit.timeit(lambda: python_yaml.dump(heat_dict, default_flow_style=False), number=args.iterations)
+    libyaml_dump = timeit.timeit(lambda: libyaml_yaml.dump(heat_dict, default_flow_style=False), number=args.iterations)
+    print('dump {0} bytes: python {1:.1f}ms, libyaml {2:.1f}ms ({3:.1f}x)'.format(len(python_dumped), python_dump * 1000 / args.iterations,
+                                                                              libyaml_dump * 1000 / args.iterations, python_dump / libyaml_dump))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,11 @@ import ignition.boot.api as ignition
 import osvimdriver.config as osvimdriverconfig
 import pathlib
 import os
-from osvimdriver.service.resourcedriver import ResourceDriverHandler, AdditionalResourceDriverProperties, AdoptProperties
-from osvimdriver.openstack.environment import OpenstackDeploymentLocationTranslator
-from osvimdriver.service.tosca import ToscaParserCapability, ToscaHeatTranslatorCapability, ToscaParserService, ToscaHeatTranslatorService, ToscaTopologyDiscoveryService, ToscaTopologyDiscoveryCapability
+from osvimdriver.service.resourcedriver import ResourceDriverServiceConfigurator, AdditionalResourceDriverProperties, AdoptProperties, LocationPoolProperties, TokenCacheProperties, StackPollingProperties, NeutronCacheProperties, StackWatcherProperties, HeatNotificationsProperties, CreateDeduplicationProperties
+from osvimdriver.service.tosca import ToscaParserCapability, ToscaParserService, ToscaHeatTranslatorService, ToscaTopologyDiscoveryService, TranslationCacheProperties, PersistentStoreProperties, TranslationPoolProperties
 from osvimdriver.service.osadmin import OpenstackAdminApiConfigurator, OpenstackAdminServiceConfigurator, OpenstackAdminProperties
+from osvimdriver.service.metrics import MetricsApiConfigurator, MetricsServiceConfigurator, MetricsProperties
+from osvimdriver.service.tracing import TracingServiceConfigurator, TracingProperties
 
 default_config_dir_path = str(pathlib.Path(osvimdriverconfig.__file__).parent.resolve())
 default_config_path = os.path.join(default_config_dir_path, 'ovd_config.yml')
@@ -21,17 +22,32 @@ def create_app():
     app_builder.include_environment_config_properties('OVD_CONFIG', required=False)
     app_builder.add_property_group(AdditionalResourceDriverProperties())
     app_builder.add_property_group(AdoptProperties())
+    app_builder.add_property_group(LocationPoolProperties())
+    app_builder.add_property_group(TokenCacheProperties())
+    app_builder.add_property_group(StackPollingProperties())
+    app_builder.add_property_group(NeutronCacheProperties())
+    app_builder.add_property_group(StackWatcherProperties())
+    app_builder.add_property_group(HeatNotificationsProperties())
+    app_builder.add_property_group(CreateDeduplicationProperties())
+    app_builder.add_property_group(TranslationCacheProperties())
+    app_builder.add_property_group(PersistentStoreProperties())
+    app_builder.add_property_group(TranslationPoolProperties())
     app_builder.add_service(ToscaParserService)
-    app_builder.add_service(ToscaTopologyDiscoveryService, tosca_parser_service=ToscaParserCapability)
-    app_builder.add_service(ToscaHeatTranslatorService, tosca_parser_service=ToscaParserCapability)
-    app_builder.add_service(ResourceDriverHandler, OpenstackDeploymentLocationTranslator(),
-                            heat_translator_service=ToscaHeatTranslatorCapability, tosca_discovery_service=ToscaTopologyDiscoveryCapability,
-                            resource_driver_config=AdditionalResourceDriverProperties, adopt_config=AdoptProperties)
+    app_builder.add_service(ToscaTopologyDiscoveryService, tosca_parser_service=ToscaParserCapability, translation_pool_config=TranslationPoolProperties)
+    app_builder.add_service(ToscaHeatTranslatorService, tosca_parser_service=ToscaParserCapability, translation_cache_config=TranslationCacheProperties,
+                            persistent_store_config=PersistentStoreProperties, translation_pool_config=TranslationPoolProperties)
+    # The location translator is built from the loaded configuration, so the handler is registered by a service configurator
+    app_builder.add_service_configurator(ResourceDriverServiceConfigurator())
 
     # Custom Property Group, Service and API
     app_builder.add_property_group(OpenstackAdminProperties())
     app_builder.add_api_configurator(OpenstackAdminApiConfigurator())
     app_builder.add_service_configurator(OpenstackAdminServiceConfigurator())
+    app_builder.add_property_group(MetricsProperties())
+    app_builder.add_api_configurator(MetricsApiConfigurator())
+    app_builder.add_service_configurator(MetricsServiceConfigurator())
+    app_builder.add_property_group(TracingProperties())
+    app_builder.add_service_configurator(TracingServiceConfigurator())
 
     return app_builder.configure()
 
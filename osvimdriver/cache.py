@@ -0,0 +1,113 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class LRUCache():
+    """
+    Thread safe, size bounded cache which evicts the least recently used entry once full.
+
+    Entries may also be expired by age, measured from when they were added (max_age_seconds),
+    or by idleness, measured from when they were last read (max_idle_seconds).
+    The optional on_evict callback is called with (key, value) for every entry removed due to expiry,
+    eviction or clear() (but not pop(), as the caller receives the value).
+    """
+
+    def __init__(self, max_size=100, max_age_seconds=None, max_idle_seconds=None, on_evict=None, clock=time.monotonic):
+        if max_size is None or max_size < 1:
+            raise ValueError('max_size must be a positive integer')
+        self.max_size = max_size
+        self.max_age_seconds = max_age_seconds
+        self.max_idle_seconds = max_idle_seconds
+        self.on_evict = on_evict
+        self.clock = clock
+        self.__entries = OrderedDict()
+        self.__lock = threading.RLock()
+
+    def get(self, key, default=None):
+        evicted = []
+        try:
+            with self.__lock:
+                entry = self.__entries.get(key, None)
+                if entry is None:
+                    return default
+                now = self.clock()
+                if self.__is_expired(entry, now):
+                    del self.__entries[key]
+                    evicted.append((key, entry['value']))
+                    return default
+                entry['accessed'] = now
+                self.__entries.move_to_end(key)
+                return entry['value']
+        finally:
+            self.__notify_evicted(evicted)
+
+    def put(self, key, value):
+        evicted = []
+        try:
+            with self.__lock:
+                now = self.clock()
+                existing = self.__entries.pop(key, None)
+                if existing is not None and existing['value'] is not value:
+                    evicted.append((key, existing['value']))
+                self.__entries[key] = {'value': value, 'added': now, 'accessed': now}
+                evicted.extend(self.__remove_expired(now))
+                while len(self.__entries) > self.max_size:
+                    oldest_key, oldest_entry = self.__entries.popitem(last=False)
+                    evicted.append((oldest_key, oldest_entry['value']))
+        finally:
+            self.__notify_evicted(evicted)
+
+    def pop(self, key, default=None):
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+        return default if entry is None else entry['value']
+
+    def clear(self):
+        with self.__lock:
+            evicted = [(key, entry['value']) for key, entry in self.__entries.items()]
+            self.__entries.clear()
+        self.__notify_evicted(evicted)
+
+    def expire(self):
+        with self.__lock:
+            evicted = self.__remove_expired(self.clock())
+        self.__notify_evicted(evicted)
+
+    def keys(self):
+        with self.__lock:
+            return list(self.__entries.keys())
+
+    def items(self):
+        """Returns (key, value) for every unexpired entry, least recently used first, without marking any of them as used"""
+        with self.__lock:
+            now = self.clock()
+            return [(key, entry['value']) for key, entry in self.__entries.items() if not self.__is_expired(entry, now)]
+
+    def __contains__(self, key):
+        with self.__lock:
+            entry = self.__entries.get(key, None)
+            return entry is not None and not self.__is_expired(entry, self.clock())
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
+
+    def __is_expired(self, entry, now):
+        if self.max_age_seconds is not None and now - entry['added'] >= self.max_age_seconds:
+            return True
+        if self.max_idle_seconds is not None and now - entry['accessed'] >= self.max_idle_seconds:
+            return True
+        return False
+
+    def __remove_expired(self, now):
+        if self.max_age_seconds is None and self.max_idle_seconds is None:
+            return []
+        expired_keys = [key for key, entry in self.__entries.items() if self.__is_expired(entry, now)]
+        return [(key, self.__entries.pop(key)['value']) for key in expired_keys]
+
+    def __notify_evicted(self, evicted):
+        if self.on_evict is None:
+            return
+        for key, value in evicted:
+            self.on_evict(key, value)
@@ -0,0 +1,183 @@
+import os
+import time
+import functools
+import contextlib
+from neutronclient.common import exceptions as neutronexceptions
+from ignition.service.resourcedriver import InfrastructureNotFoundError, RequestNotFoundError
+from osvimdriver.openstack.heat.driver import StackNotFoundError
+
+LIFECYCLE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+OPENSTACK_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+PHASE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+OUTCOME_SUCCESS = 'success'
+OUTCOME_NOT_FOUND = 'not_found'
+OUTCOME_ERROR = 'error'
+
+
+def outcome_of(error):
+    if error is None:
+        return OUTCOME_SUCCESS
+    if isinstance(error, (StackNotFoundError, neutronexceptions.NotFound, InfrastructureNotFoundError, RequestNotFoundError)):
+        return OUTCOME_NOT_FOUND
+    return OUTCOME_ERROR
+
+
+class DriverMetrics():
+    """Records the metrics of the driver. This implementation discards them and is used whilst metrics are disabled"""
+
+    enabled = False
+
+    def observe_lifecycle(self, lifecycle, seconds, outcome):
+        pass
+
+    def observe_openstack_call(self, service, operation, location, seconds, outcome):
+        pass
+
+    def observe_authentication(self, location, outcome):
+        pass
+
+    def observe_driver_files_cleanup(self, seconds):
+        pass
+
+    def observe_create_phase(self, phase, location, seconds):
+        pass
+
+    def generate_latest(self):
+        """Returns (content type, content) of the metrics in the Prometheus text format"""
+        return 'text/plain; version=0.0.4; charset=utf-8', b''
+
+    @contextlib.contextmanager
+    def time_lifecycle(self, lifecycle):
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.observe_lifecycle(lifecycle, time.perf_counter() - start, outcome_of(error))
+
+
+class PrometheusMetrics(DriverMetrics):
+    """
+    Records metrics with prometheus_client. When the PROMETHEUS_MULTIPROC_DIR environment variable is set (before prometheus_client is first
+    imported) the metrics of every process sharing the directory, such as the gunicorn workers in a pod, are aggregated when collected.
+    """
+
+    enabled = True
+
+    def __init__(self, registry=None):
+        import prometheus_client
+        self.__prometheus_client = prometheus_client
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+        self.registry = registry
+        self.lifecycle_requests = prometheus_client.Counter('ovd_lifecycle_requests', 'Lifecycle requests handled by the driver',
+                                                            ['lifecycle', 'outcome'], registry=registry)
+        self.lifecycle_duration = prometheus_client.Histogram('ovd_lifecycle_request_duration_seconds', 'Time taken to handle lifecycle requests',
+                                                              ['lifecycle'], buckets=LIFECYCLE_BUCKETS, registry=registry)
+        self.openstack_requests = prometheus_client.Counter('ovd_openstack_requests', 'Requests made to OpenStack APIs',
+                                                            ['service', 'operation', 'location', 'outcome'], registry=registry)
+        self.openstack_duration = prometheus_client.Histogram('ovd_openstack_request_duration_seconds', 'Time taken by requests to OpenStack APIs',
+                                                              ['service', 'operation', 'location'], buckets=OPENSTACK_BUCKETS, registry=registry)
+        self.authentications = prometheus_client.Counter('ovd_keystone_authentications', 'Authentications with Keystone',
+                                                         ['location', 'outcome'], registry=registry)
+        self.driver_files_cleanup = prometheus_client.Histogram('ovd_driver_files_cleanup_duration_seconds', 'Time taken to remove driver files',
+                                                                buckets=PHASE_BUCKETS, registry=registry)
+        self.create_phases = prometheus_client.Histogram('ovd_create_phase_duration_seconds', 'Time taken by each phase of Create requests',
+                                                         ['phase', 'location'], buckets=PHASE_BUCKETS, registry=registry)
+
+    def observe_lifecycle(self, lifecycle, seconds, outcome):
+        self.lifecycle_requests.labels(lifecycle, outcome).inc()
+        self.lifecycle_duration.labels(lifecycle).observe(seconds)
+
+    def observe_openstack_call(self, service, operation, location, seconds, outcome):
+        self.openstack_requests.labels(service, operation, location, outcome).inc()
+        self.openstack_duration.labels(service, operation, location).observe(seconds)
+
+    def observe_authentication(self, location, outcome):
+        self.authentications.labels(location, outcome).inc()
+
+    def observe_driver_files_cleanup(self, seconds):
+        self.driver_files_cleanup.observe(seconds)
+
+    def observe_create_phase(self, phase, location, seconds):
+        self.create_phases.labels(phase, location).observe(seconds)
+
+    def generate_latest(self):
+        prometheus_client = self.__prometheus_client
+        registry = self.registry
+        if 'PROMETHEUS_MULTIPROC_DIR' in os.environ and registry is prometheus_client.REGISTRY:
+            # Each process writes its values to files in the directory, which are read and aggregated on every collection
+            from prometheus_client import multiprocess
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        return prometheus_client.CONTENT_TYPE_LATEST, prometheus_client.generate_latest(registry)
+
+
+class InstrumentedDriver():
+    """Wraps a driver (e.g. a HeatDriver) so the duration and outcome of each of its public methods is recorded as a call to an OpenStack service"""
+
+    def __init__(self, driver, metrics, service, location):
+        self.driver = driver
+        self.metrics = metrics
+        self.service = service
+        self.location = location
+
+    def __getattr__(self, name):
+        attr = getattr(self.driver, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        @functools.wraps(attr)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            error = None
+            try:
+                return attr(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self.metrics.observe_openstack_call(self.service, name, self.location, time.perf_counter() - start, outcome_of(error))
+        return timed
+
+
+# Metrics of this process, replaced when metrics are enabled (see osvimdriver.service.metrics)
+_metrics = DriverMetrics()
+
+
+def get_metrics():
+    return _metrics
+
+
+def set_metrics(metrics):
+    global _metrics
+    _metrics = metrics if metrics is not None else DriverMetrics()
+
+
+def instrument_driver(driver, service, location):
+    metrics = get_metrics()
+    if not metrics.enabled:
+        return driver
+    return InstrumentedDriver(driver, metrics, service, location)
+
+
+def instrument_authentication(auth, location):
+    """Records each authentication made by a keystoneauth plugin (only calls which reach Keystone, not those answered by a cached token)"""
+    metrics = get_metrics()
+    if not metrics.enabled or not hasattr(auth, 'get_auth_ref'):
+        return auth
+    get_auth_ref = auth.get_auth_ref
+    def counted_get_auth_ref(session, **kwargs):
+        error = None
+        try:
+            return get_auth_ref(session, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            metrics.observe_authentication(location, outcome_of(error))
+    auth.get_auth_ref = counted_get_auth_ref
+    return auth
@@ -0,0 +1,57 @@
+import os
+import atexit
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class CertificateStore():
+    """
+    Writes certificate and key content to files named by a hash of that content, so each distinct certificate is written once per process
+    and the same path is handed out to every location using it. Once written, looking up a path does not touch the filesystem.
+
+    The files are kept in a private temporary directory (created on first use) which is removed when the process exits.
+    """
+
+    def __init__(self, directory=None):
+        self.__directory = directory
+        self.__paths = {}
+        self.__lock = threading.Lock()
+
+    def get_path(self, content):
+        if content is None:
+            raise ValueError('content must be provided')
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        path = self.__paths.get(digest, None)
+        if path is None:
+            with self.__lock:
+                path = self.__paths.get(digest, None)
+                if path is None:
+                    path = self.__write(digest, content)
+                    self.__paths[digest] = path
+        return path
+
+    def __write(self, digest, content):
+        path = os.path.join(self.__get_directory(), '{0}.pem'.format(digest))
+        logger.debug('Writing certificate to %s', path)
+        # Write to a temporary file then rename, so a partially written file is never used
+        fd, tmp_path = tempfile.mkstemp(dir=self.__get_directory(), prefix='.', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        return path
+
+    def __get_directory(self):
+        if self.__directory is None:
+            self.__directory = tempfile.mkdtemp(prefix='ovd_certs_')
+            atexit.register(shutil.rmtree, self.__directory, True)
+        elif not os.path.exists(self.__directory):
+            os.makedirs(self.__directory, mode=0o700)
+        return self.__directory
+
+
+default_certificate_store = CertificateStore()
@@ -1,11 +1,15 @@
-import tempfile
-import os
-import shutil
+import threading
 from keystoneauth1.identity import v3 as keystonev3
 from keystoneauth1 import session as keystonesession
 from osvimdriver.openstack.heat.driver import HeatDriver
 from osvimdriver.openstack.heat.template import HeatInputUtil
 from osvimdriver.openstack.neutron.driver import NeutronDriver
+from osvimdriver.openstack.neutron.cache import CachingNeutronDriver
+from osvimdriver.openstack.pool import fingerprint_deployment_location
+from osvimdriver.openstack.tokens import SharedTokenPassword
+from osvimdriver.openstack.certs import default_certificate_store
+from osvimdriver.metrics import instrument_driver, instrument_authentication
+from osvimdriver.tracing import trace_driver, trace_authentication
 
 AUTH_PROP_PREFIX = 'os_auth_'
 AUTH_ENABLED_PROP = 'os_auth_enabled'
@@ -17,40 +21,54 @@ OS_KEY_PROP = 'os_key'
 
 class OpenstackPasswordAuth():
 
-    def __init__(self, auth_api, auth_properties={}):
+    def __init__(self, auth_api, auth_properties={}, token_cache=None):
         if auth_api is None:
             raise ValueError('auth_api must be set')
         self.auth_api = auth_api
         self.auth_properties = auth_properties
+        self.token_cache = token_cache
 
     def build_os_auth(self, api_url):
         full_auth_url = api_url + '/' + self.auth_api
         full_auth_props = self.auth_properties.copy()
         full_auth_props['auth_url'] = full_auth_url
-        auth = keystonev3.Password(**full_auth_props)
+        if self.token_cache is not None:
+            auth = SharedTokenPassword(self.token_cache, **full_auth_props)
+        else:
+            auth = keystonev3.Password(**full_auth_props)
         return auth
 
 
 class OpenstackDeploymentLocation():
 
-    def __init__(self, name, api_url, auth, ca_cert=None, client_cert=None, client_key=None):
+    def __init__(self, name, api_url, auth, ca_cert=None, client_cert=None, client_key=None, certificate_store=None, persistent_store=None,
+                 neutron_cache=None, neutron_cache_key=None):
         self.name = name
+        self.persistent_store = persistent_store
+        self.neutron_cache = neutron_cache
+        self.neutron_cache_key = neutron_cache_key if neutron_cache_key is not None else name
+        # Locations handed out by an OpenstackLocationPool are shared between requests, so are returned to the pool on close
+        self.pool = None
         self.__api_url = api_url
         self.__auth = auth
         self.__session = None
         self.__heat_driver = None
         self.__neutron_driver = None
-        self.__tmp_workspace = tempfile.mkdtemp()
+        # Pooled locations are used by many threads at once, so the session and clients are created under a lock to create each only once
+        self.__lock = threading.RLock()
+        self.__certificate_store = certificate_store if certificate_store is not None else default_certificate_store
         self.__ca_cert = ca_cert
         self.__client_cert = client_cert
         self.__client_key = client_key
-        self.__ca_cert_path = os.path.join(self.__tmp_workspace, 'ca.cert') if ca_cert is not None else None
-        self.__client_cert_path = os.path.join(self.__tmp_workspace, 'client.cert') if client_cert is not None else None
-        self.__client_key_path = os.path.join(self.__tmp_workspace, 'client.key') if client_key is not None else None
+        self.__ca_cert_path = None
+        self.__client_cert_path = None
+        self.__client_key_path = None
 
     def create_session(self):
         auth_details = self.__auth.build_os_auth(self.__api_url) if self.__auth is not None else None
-        self.__write_certs()
+        if auth_details is not None:
+            auth_details = trace_authentication(instrument_authentication(auth_details, self.name), self.name)
+        self.__resolve_cert_paths()
         kwargs = {}
         kwargs['auth'] = auth_details
         if self.__ca_cert_path != None:
@@ -65,44 +83,66 @@ class OpenstackDeploymentLocation():
 
     def get_session(self):
         if self.__session is None:
-            self.create_session()
+            with self.__lock:
+                if self.__session is None:
+                    self.create_session()
         return self.__session
 
     @property
     def heat_driver(self):
         if self.__heat_driver is None:
-            self.__heat_driver = HeatDriver(self.get_session())
+            with self.__lock:
+                if self.__heat_driver is None:
+                    self.__heat_driver = trace_driver(instrument_driver(HeatDriver(self.get_session()), 'heat', self.name), 'heat', self.name)
         return self.__heat_driver
 
     def get_heat_input_util(self):
-        return HeatInputUtil()
+        return HeatInputUtil(store=self.persistent_store)
 
     @property
     def neutron_driver(self):
         if self.__neutron_driver is None:
-            self.__neutron_driver = NeutronDriver(self.get_session())
+            with self.__lock:
+                if self.__neutron_driver is None:
+                    # Instrumented inside the cache, so only the calls which reach Neutron are recorded and traced
+                    neutron_driver = trace_driver(instrument_driver(NeutronDriver(self.get_session()), 'neutron', self.name), 'neutron', self.name)
+                    if self.neutron_cache is not None:
+                        neutron_driver = CachingNeutronDriver(neutron_driver, self.neutron_cache, self.neutron_cache_key)
+                    self.__neutron_driver = neutron_driver
         return self.__neutron_driver
 
+    def invalidate_neutron_cache(self):
+        if self.neutron_cache is not None:
+            self.neutron_cache.invalidate(self.neutron_cache_key)
+
     def close(self):
-        if os.path.exists(self.__tmp_workspace):
-            shutil.rmtree(self.__tmp_workspace)
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            self.dispose()
 
-    def __write_certs(self):
-        if self.__ca_cert_path != None:
-            self.__write_if_needed(self.__ca_cert_path, self.__ca_cert)
-        if self.__client_cert_path != None:
-            self.__write_if_needed(self.__client_cert_path, self.__client_cert)
-        if self.__client_key_path != None:
-            self.__write_if_needed(self.__client_key_path, self.__client_key)
+    def dispose(self):
+        if self.__session is not None:
+            # Release the pooled HTTP connections held by the underlying requests session
+            self.__session.session.close()
 
-    def __write_if_needed(self, path, content):
-        if not os.path.exists(path):
-            with open(path, 'w') as f:
-                f.write(content)
+    def __resolve_cert_paths(self):
+        # Certificates are written once to a content addressed store and the files are shared by all locations using the same content
+        if self.__ca_cert is not None:
+            self.__ca_cert_path = self.__certificate_store.get_path(self.__ca_cert)
+        if self.__client_cert is not None:
+            self.__client_cert_path = self.__certificate_store.get_path(self.__client_cert)
+        if self.__client_key is not None:
+            self.__client_key_path = self.__certificate_store.get_path(self.__client_key)
 
 
 class OpenstackDeploymentLocationTranslator():
 
+    def __init__(self, token_cache=None, persistent_store=None, neutron_cache=None):
+        self.token_cache = token_cache
+        self.persistent_store = persistent_store
+        self.neutron_cache = neutron_cache
+
     def from_deployment_location(self, deployment_location):
         dl_name = deployment_location.get('name')
         if dl_name is None:
@@ -130,11 +170,14 @@ class OpenstackDeploymentLocationTranslator():
         if auth_enabled:
             if auth_api is None:
                 raise ValueError('Deployment Location must specify a value for property \'{0}\' when auth is enabled'.format(AUTH_API_PROP))
-            configured_auth = OpenstackPasswordAuth(auth_api, auth_properties)
+            configured_auth = OpenstackPasswordAuth(auth_api, auth_properties, token_cache=self.token_cache)
         else:
             configured_auth = None
         ca_cert, client_cert, client_key = self.__gather_certs(dl_properties)
-        return OpenstackDeploymentLocation(dl_name, api_url, configured_auth, ca_cert=ca_cert, client_cert=client_cert, client_key=client_key)
+        # Neutron results are cached by the content of the deployment location, so a change to its properties starts with an empty cache
+        neutron_cache_key = fingerprint_deployment_location(deployment_location) if self.neutron_cache is not None else None
+        return OpenstackDeploymentLocation(dl_name, api_url, configured_auth, ca_cert=ca_cert, client_cert=client_cert, client_key=client_key,
+                                           persistent_store=self.persistent_store, neutron_cache=self.neutron_cache, neutron_cache_key=neutron_cache_key)
 
     def __gather_certs(self, dl_properties):
         ca_cert = dl_properties.get(OS_CACERT_PROP, None)
@@ -0,0 +1,71 @@
+import logging
+import threading
+from osvimdriver.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUS_SUFFIXES = ('_COMPLETE', '_FAILED')
+
+
+def is_terminal_stack_status(stack_status):
+    return stack_status is not None and stack_status.endswith(TERMINAL_STATUS_SUFFIXES)
+
+
+class InFlightRequest():
+
+    def __init__(self):
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class StackStatusCache():
+    """
+    Short lived cache of stack status lookups. Only one lookup per stack is in flight at a time, concurrent callers for the same stack
+    wait for and share its result. Stacks in a terminal status (*_COMPLETE or *_FAILED) are not cached, as the next change in status
+    is the one the caller is waiting to see.
+    """
+
+    def __init__(self, ttl_seconds=2, max_size=1000):
+        self.__stacks = LRUCache(max_size=max_size, max_age_seconds=ttl_seconds)
+        self.__in_flight = {}
+        self.__lock = threading.Lock()
+
+    def get_stack(self, cache_key, loader):
+        stack = self.__stacks.get(cache_key)
+        if stack is not None:
+            logger.debug('Using cached status of stack %s', cache_key)
+            return stack
+        with self.__lock:
+            in_flight = self.__in_flight.get(cache_key, None)
+            leader = in_flight is None
+            if leader:
+                in_flight = InFlightRequest()
+                self.__in_flight[cache_key] = in_flight
+        if not leader:
+            logger.debug('Waiting for in flight status request of stack %s', cache_key)
+            return in_flight.wait()
+        try:
+            stack = loader()
+            if is_terminal_stack_status(stack.get('stack_status', None)):
+                self.__stacks.pop(cache_key)
+            else:
+                self.__stacks.put(cache_key, stack)
+            in_flight.result = stack
+            return stack
+        except Exception as e:
+            in_flight.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__in_flight[cache_key]
+            in_flight.done.set()
+
+    def evict(self, cache_key):
+        self.__stacks.pop(cache_key)
@@ -44,17 +44,67 @@ class HeatDriver():
         except heatexc.HTTPNotFound as e:
             raise StackNotFoundError(str(e)) from e
 
-    def get_stack(self, stack_id):
+    def get_stack(self, stack_id, resolve_outputs=True):
         if stack_id is None:
             raise ValueError('stack_id must be provided')
         heat_client = self.__get_heat_client()
         logger.debug('Retrieving stack with id %s', stack_id)
         try:
-            result = heat_client.stacks.get(stack_id)
+            if resolve_outputs:
+                result = heat_client.stacks.get(stack_id)
+            else:
+                # Resolving outputs is the most expensive part of showing a stack, so skip it when only the status is needed
+                result = heat_client.stacks.get(stack_id, resolve_outputs=False)
         except heatexc.HTTPNotFound as e:
             raise StackNotFoundError(str(e)) from e
         return result.to_dict()
 
+    def get_stacks_by_ids(self, stack_ids):
+        if stack_ids is None:
+            raise ValueError('stack_ids must be provided')
+        if len(stack_ids) == 0:
+            return []
+        heat_client = self.__get_heat_client()
+        logger.debug('Retrieving stacks with ids %s', stack_ids)
+        # Setting the limit makes the client follow the pages of results until all requested stacks are returned
+        result = heat_client.stacks.list(limit=len(stack_ids), filters={'id': list(stack_ids)})
+        return [stack.to_dict() for stack in result]
+
+    def get_stack_by_name(self, stack_name):
+        if stack_name is None:
+            raise ValueError('stack_name must be provided')
+        heat_client = self.__get_heat_client()
+        logger.debug('Retrieving stack with name %s', stack_name)
+        # Stacks being deleted no longer hold the name for the purpose of finding an existing stack
+        for stack in heat_client.stacks.list(filters={'name': stack_name}):
+            stack_dict = stack.to_dict()
+            if stack_dict.get('stack_name', None) == stack_name and not str(stack_dict.get('stack_status', '')).startswith('DELETE_'):
+                return stack_dict
+        return None
+
+    def get_stack_events(self, stack_id, marker=None, limit=None):
+        if stack_id is None:
+            raise ValueError('stack_id must be provided')
+        heat_client = self.__get_heat_client()
+        logger.debug('Retrieving events of stack with id %s after %s', stack_id, marker)
+        try:
+            # Oldest first, so the last event returned is the marker for the next request
+            result = heat_client.events.list(stack_id, marker=marker, limit=limit, sort_dir='asc')
+        except heatexc.HTTPNotFound as e:
+            raise StackNotFoundError(str(e)) from e
+        return [event.to_dict() for event in result]
+
+    def get_stack_resources(self, stack_id):
+        if stack_id is None:
+            raise ValueError('stack_id must be provided')
+        heat_client = self.__get_heat_client()
+        logger.debug('Retrieving resources of stack with id %s', stack_id)
+        try:
+            result = heat_client.resources.list(stack_id)
+        except heatexc.HTTPNotFound as e:
+            raise StackNotFoundError(str(e)) from e
+        return [resource.to_dict() for resource in result]
+
     def check_stack(self, stack_id):
         if stack_id is None:
             raise ValueError('stack_id must be provided')
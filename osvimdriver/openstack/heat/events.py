@@ -0,0 +1,111 @@
+import logging
+import threading
+from osvimdriver.cache import LRUCache
+from osvimdriver.openstack.heat.cache import is_terminal_stack_status
+
+logger = logging.getLogger(__name__)
+
+
+class StackProgress():
+    """Status of a stack and its resources, as derived from the stack events seen so far"""
+
+    def __init__(self, stack_id):
+        self.stack_id = stack_id
+        self.marker = None
+        self.stack_status = None
+        self.stack_status_reason = None
+        self.total_resources = None
+        self.resource_statuses = {}
+        self.lock = threading.Lock()
+
+    def apply(self, event):
+        self.marker = event.get('id', self.marker)
+        if event.get('physical_resource_id', None) == self.stack_id:
+            # Events of the stack itself (as opposed to one of its resources) carry the stack status
+            self.stack_status = event.get('resource_status', None)
+            self.stack_status_reason = event.get('resource_status_reason', None)
+        else:
+            resource_name = event.get('resource_name', None)
+            if resource_name is not None:
+                self.resource_statuses[resource_name] = event.get('resource_status', None)
+
+    @property
+    def action(self):
+        if self.stack_status is None:
+            return None
+        return self.stack_status.split('_', 1)[0]
+
+    @property
+    def completed_resources(self):
+        complete_status = '{0}_COMPLETE'.format(self.action)
+        return len([status for status in self.resource_statuses.values() if status == complete_status])
+
+    def describe(self):
+        if self.total_resources is not None:
+            return '{0}/{1} resources complete'.format(self.completed_resources, self.total_resources)
+        return '{0} resources complete'.format(self.completed_resources)
+
+    def to_stack(self):
+        return {'id': self.stack_id, 'stack_status': self.stack_status, 'stack_status_reason': self.stack_status_reason}
+
+
+class StackEventTracker():
+    """
+    Tracks the status of stacks from their Heat events rather than by retrieving the stack on every poll.
+
+    The id of the last event seen is kept for each tracked request, so each poll only retrieves newer events (in pages of page_size).
+    The stack status is taken from the latest event of the stack itself and the status of each resource from its latest event,
+    giving the progress of the current action (e.g. "37/120 resources complete"). The number of resources is retrieved once per request.
+    Until an event for the stack itself has been seen, the stack is retrieved instead.
+
+    Up to max_size requests are tracked. Requests not polled for max_idle_seconds, and those which reach a terminal status, are forgotten
+    (a later poll starts again from the first event).
+    """
+
+    def __init__(self, page_size=100, max_size=1000, max_idle_seconds=3600):
+        if page_size is None or page_size < 1:
+            raise ValueError('page_size must be a positive integer')
+        self.page_size = page_size
+        self.__progress = LRUCache(max_size=max_size, max_idle_seconds=max_idle_seconds)
+        self.__lock = threading.Lock()
+
+    def get_stack(self, tracking_key, heat_driver, stack_id):
+        if stack_id is None:
+            raise ValueError('stack_id must be provided')
+        progress = self.__get_progress(tracking_key, stack_id)
+        with progress.lock:
+            if progress.total_resources is None:
+                progress.total_resources = len(heat_driver.get_stack_resources(stack_id))
+            # The first read catches up on the events before tracking began, so only progress from later events is logged
+            catching_up = progress.marker is None
+            new_events = self.__read_new_events(progress, heat_driver)
+            if progress.stack_status is None:
+                logger.debug('No events found for stack %s, retrieving stack', stack_id)
+                return heat_driver.get_stack(stack_id, resolve_outputs=False)
+            if new_events > 0 and not catching_up:
+                logger.debug('Stack %s is %s: %s', stack_id, progress.stack_status, progress.describe())
+            stack = progress.to_stack()
+        if is_terminal_stack_status(stack['stack_status']):
+            self.__progress.pop(tracking_key)
+        return stack
+
+    def get_progress(self, tracking_key):
+        return self.__progress.get(tracking_key)
+
+    def __get_progress(self, tracking_key, stack_id):
+        with self.__lock:
+            progress = self.__progress.get(tracking_key)
+            if progress is None or progress.stack_id != stack_id:
+                progress = StackProgress(stack_id)
+                self.__progress.put(tracking_key, progress)
+            return progress
+
+    def __read_new_events(self, progress, heat_driver):
+        new_events = 0
+        while True:
+            events = heat_driver.get_stack_events(progress.stack_id, marker=progress.marker, limit=self.page_size)
+            for event in events:
+                progress.apply(event)
+            new_events += len(events)
+            if len(events) < self.page_size:
+                return new_events
@@ -0,0 +1,221 @@
+import os
+import json
+import time
+import logging
+import threading
+from osvimdriver.cache import LRUCache
+from osvimdriver.openstack.heat.cache import is_terminal_stack_status
+
+logger = logging.getLogger(__name__)
+
+STACK_EVENT_TYPE_PREFIX = 'orchestration.stack.'
+# Heat sends notifications of failures (e.g. orchestration.stack.create.error) at ERROR priority, which oslo.messaging publishes to <topic>.error
+DEFAULT_TOPICS = ['notifications.info', 'notifications.error']
+
+
+def parse_stack_identity(stack_identity):
+    """
+    Returns the id of a stack from its identity in a Heat notification, which is the ARN of the stack
+    (arn:openstack:heat::<tenant>:stacks/<stack name>/<stack id>) or the bare stack id. Returns None for an ARN which is not of a stack.
+    """
+    stack_identity = str(stack_identity)
+    if not stack_identity.startswith('arn:'):
+        return stack_identity
+    arn_parts = stack_identity.split(':', 5)
+    if len(arn_parts) < 6:
+        return None
+    path = arn_parts[5].split('/')
+    if len(path) < 3 or path[0] != 'stacks' or path[2] == '':
+        return None
+    return path[2]
+
+
+def parse_stack_notification(message):
+    """
+    Returns the stack (as a dict with id, stack_status and stack_status_reason) described by a Heat orchestration.stack.* notification,
+    or None if the message is not one. Accepts the notification as a dict or JSON string, optionally wrapped in the oslo.messaging envelope.
+    """
+    try:
+        if isinstance(message, (bytes, bytearray)):
+            message = message.decode('utf-8')
+        if isinstance(message, str):
+            message = json.loads(message)
+        if isinstance(message, dict) and 'oslo.message' in message:
+            message = json.loads(message['oslo.message'])
+    except ValueError as e:
+        logger.debug('Ignoring notification which is not valid JSON: %s', str(e))
+        return None
+    if not isinstance(message, dict) or not str(message.get('event_type', '')).startswith(STACK_EVENT_TYPE_PREFIX):
+        return None
+    payload = message.get('payload', None)
+    if not isinstance(payload, dict) or payload.get('stack_identity', None) is None or payload.get('state', None) is None:
+        return None
+    stack_id = parse_stack_identity(payload['stack_identity'])
+    if stack_id is None:
+        logger.debug('Ignoring notification with unrecognised stack_identity: %s', payload['stack_identity'])
+        return None
+    return {
+        'id': stack_id,
+        'stack_name': payload.get('stack_name', None),
+        'stack_status': payload['state'],
+        'stack_status_reason': payload.get('state_reason', None)
+    }
+
+
+class StackNotifications():
+    """
+    Latest status of each stack as reported by Heat notifications, so status checks can be answered without Heat.
+
+    A terminal status (*_COMPLETE or *_FAILED) is used for up to ttl_seconds after it was received. Any other status is only used for
+    in_progress_ttl_seconds, after which the stack is retrieved from Heat, so a missed notification delays a result by at most that long.
+    Up to max_size stacks are kept, the least recently updated are removed first.
+    """
+
+    def __init__(self, source, max_size=10000, ttl_seconds=3600, in_progress_ttl_seconds=60, clock=time.monotonic):
+        self.source = source
+        self.ttl_seconds = ttl_seconds
+        self.in_progress_ttl_seconds = in_progress_ttl_seconds
+        self.clock = clock
+        self.__stacks = LRUCache(max_size=max_size, max_age_seconds=ttl_seconds, clock=clock)
+
+    def start(self):
+        self.source.start(self.on_message)
+
+    def stop(self):
+        self.source.stop()
+
+    def on_message(self, message):
+        stack = parse_stack_notification(message)
+        if stack is None:
+            return
+        logger.debug('Received notification of stack %s: %s', stack['id'], stack['stack_status'])
+        self.__stacks.put(stack['id'], (stack, self.clock()))
+
+    def get_stack(self, stack_id, status_prefixes=None):
+        """Returns the last notified status of a stack, if known, recent enough and (if status_prefixes are given) for one of the expected actions"""
+        entry = self.__stacks.get(stack_id)
+        if entry is None:
+            return None
+        stack, received = entry
+        if status_prefixes is not None and not stack['stack_status'].startswith(tuple(status_prefixes)):
+            # A notification of an earlier action on the stack (e.g. its creation, when checking a delete)
+            return None
+        if not is_terminal_stack_status(stack['stack_status']) and self.clock() - received >= self.in_progress_ttl_seconds:
+            return None
+        return dict(stack)
+
+
+class InProcessNotificationSource():
+    """Notification source which delivers the messages passed to publish, for tests and embedding"""
+
+    def __init__(self):
+        self.callback = None
+
+    def start(self, callback):
+        self.callback = callback
+
+    def stop(self):
+        self.callback = None
+
+    def publish(self, message):
+        if self.callback is not None:
+            self.callback(message)
+
+
+class FileNotificationSource():
+    """Notification source which follows a file of notifications, one JSON document per line (e.g. written by a notification relay)"""
+
+    def __init__(self, path, poll_interval_seconds=1):
+        if path is None:
+            raise ValueError('path must be provided')
+        self.path = path
+        self.poll_interval_seconds = poll_interval_seconds
+        self.__stopped = threading.Event()
+        self.__thread = None
+
+    def start(self, callback):
+        # Only notifications written from now on are read
+        position = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        self.__stopped.clear()
+        self.__thread = threading.Thread(target=self.__follow, args=(callback, position), name='heat-notifications-file', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__stopped.set()
+
+    def __follow(self, callback, position):
+        while not self.__stopped.is_set():
+            try:
+                if os.path.exists(self.path):
+                    if os.path.getsize(self.path) < position:
+                        # Truncated or replaced
+                        position = 0
+                    with open(self.path, 'r') as f:
+                        f.seek(position)
+                        for line in iter(f.readline, ''):
+                            if not line.endswith('\n'):
+                                # Partially written, read again once complete
+                                break
+                            position = f.tell()
+                            if line.strip():
+                                callback(line)
+            except Exception as e:
+                logger.warning('Failed to read notifications from {0}: {1}'.format(self.path, str(e)))
+            self.__stopped.wait(self.poll_interval_seconds)
+
+
+class KafkaNotificationSource():
+    """
+    Notification source which consumes the Kafka topics Heat publishes notifications to (with the oslo.messaging Kafka driver), one per priority,
+    so both the .info and .error topics are needed to see stacks complete and fail.
+    No consumer group is used, so every driver process receives every notification, starting from the latest.
+    """
+
+    def __init__(self, connection_address, topics=DEFAULT_TOPICS, poll_timeout_ms=1000, **consumer_config):
+        if connection_address is None:
+            raise ValueError('connection_address must be provided')
+        if isinstance(topics, str):
+            topics = [topics]
+        if topics is None or len(topics) == 0:
+            raise ValueError('topics must be provided')
+        self.connection_address = connection_address
+        self.topics = list(topics)
+        self.poll_timeout_ms = poll_timeout_ms
+        self.consumer_config = consumer_config
+        self.__stopped = threading.Event()
+        self.__thread = None
+
+    def start(self, callback):
+        from kafka import KafkaConsumer
+        consumer = KafkaConsumer(*self.topics, bootstrap_servers=self.connection_address, group_id=None, auto_offset_reset='latest',
+                                 enable_auto_commit=False, **self.consumer_config)
+        self.__stopped.clear()
+        self.__thread = threading.Thread(target=self.__consume, args=(consumer, callback), name='heat-notifications-kafka', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__stopped.set()
+
+    def __consume(self, consumer, callback):
+        try:
+            while not self.__stopped.is_set():
+                try:
+                    records = consumer.poll(timeout_ms=self.poll_timeout_ms)
+                    for partition_records in records.values():
+                        for record in partition_records:
+                            callback(record.value)
+                except Exception as e:
+                    logger.warning('Failed to consume notifications from {0}: {1}'.format(', '.join(self.topics), str(e)))
+                    self.__stopped.wait(self.poll_timeout_ms / 1000)
+        finally:
+            consumer.close()
+
+
+def create_notification_source(source_type, **kwargs):
+    if source_type == 'kafka':
+        return KafkaNotificationSource(kwargs.get('connection_address', None), kwargs.get('topics', DEFAULT_TOPICS))
+    elif source_type == 'file':
+        return FileNotificationSource(kwargs.get('path', None))
+    elif source_type == 'in_process':
+        return InProcessNotificationSource()
+    raise ValueError('Unsupported notification source: {0}'.format(source_type))
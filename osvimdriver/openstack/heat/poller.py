@@ -0,0 +1,78 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class StackBatch():
+
+    def __init__(self):
+        self.stack_ids = []
+        self.stacks = None
+        self.error = None
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+    def add(self, stack_id):
+        if stack_id not in self.stack_ids:
+            self.stack_ids.append(stack_id)
+
+    def execute(self, heat_driver):
+        try:
+            logger.debug('Retrieving %s stack(s) in a single batch', len(self.stack_ids))
+            self.stacks = {stack['id']: stack for stack in heat_driver.get_stacks_by_ids(self.stack_ids)}
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+    def get_result(self, heat_driver, stack_id):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        stack = self.stacks.get(stack_id, None)
+        if stack is None:
+            # Stacks may be missing from a list (e.g. soft deleted stacks), so fallback to retrieving them individually
+            return heat_driver.get_stack(stack_id, resolve_outputs=False)
+        return stack
+
+
+class BatchedStackPoller():
+    """
+    Coalesces concurrent stack status lookups for the same deployment location into one Heat stacks list request, filtered by the stack ids.
+
+    The first caller for a location waits up to window_seconds (or until max_batch_size stacks have been requested) for other callers to join,
+    then retrieves all of the stacks on their behalf. Stacks returned by a list do not include outputs.
+    """
+
+    def __init__(self, window_seconds=0.05, max_batch_size=100):
+        if max_batch_size is None or max_batch_size < 1:
+            raise ValueError('max_batch_size must be a positive integer')
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.__batches = {}
+        self.__lock = threading.Lock()
+
+    def get_stack(self, batch_key, heat_driver, stack_id):
+        if stack_id is None:
+            raise ValueError('stack_id must be provided')
+        with self.__lock:
+            batch = self.__batches.get(batch_key, None)
+            leader = batch is None
+            if leader:
+                batch = StackBatch()
+                self.__batches[batch_key] = batch
+            batch.add(stack_id)
+            if len(batch.stack_ids) >= self.max_batch_size:
+                self.__close_batch(batch_key, batch)
+        if leader:
+            batch.full.wait(self.window_seconds)
+            with self.__lock:
+                self.__close_batch(batch_key, batch)
+            batch.execute(heat_driver)
+        return batch.get_result(heat_driver, stack_id)
+
+    def __close_batch(self, batch_key, batch):
+        if self.__batches.get(batch_key, None) is batch:
+            del self.__batches[batch_key]
+        batch.full.set()
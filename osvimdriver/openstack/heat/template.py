@@ -1,46 +1,101 @@
-import yaml
+import json
+import hashlib
+import osvimdriver.yamlutil as yamlutil
 from ignition.utils.propvaluemap import PropValueMap
+from osvimdriver.cache import LRUCache
 
 PUBLIC_KEY_SUFFIX = '_public'
 PRIVATE_KEY_SUFFIX = '_private'
+HEAT_PARAMETERS_NAMESPACE = 'heat_parameters'
+
+
+class HeatParameters():
+    """
+    The names of the parameters of a Heat template. For parameters named with a _public or _private suffix, the name of the key
+    property they may refer to and the part of the key they take are worked out once, rather than on every use.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.key_parts = {}
+        for name in self.names:
+            if name.endswith(PUBLIC_KEY_SUFFIX):
+                self.key_parts[name] = (name[:len(name)-len(PUBLIC_KEY_SUFFIX)], 'publicKey')
+            elif name.endswith(PRIVATE_KEY_SUFFIX):
+                self.key_parts[name] = (name[:len(name)-len(PRIVATE_KEY_SUFFIX)], 'privateKey')
+
+    def __len__(self):
+        return len(self.names)
+
+
+# Parameters of recently used Heat templates, keyed by the sha256 of the template, shared by all HeatInputUtil instances in the process
+parameters_cache = LRUCache(max_size=256)
+
 
 class HeatInputUtil:
 
+    def __init__(self, store=None, parameters_cache=parameters_cache):
+        # Optional osvimdriver.store.PersistentStore, used to share the parameters parsed from each Heat template between processes
+        self.store = store
+        self.parameters_cache = parameters_cache
+
     def filter_used_properties(self, heat_template_str, original_properties):
-        heat_tpl = yaml.safe_load(heat_template_str)
+        parameters = self.__get_parameters(heat_template_str)
         used_properties = {}
-        if 'parameters' in heat_tpl:
-            parameters = heat_tpl['parameters']
+        if parameters:
             if isinstance(original_properties, PropValueMap):
                 return self.__filter_from_propvaluemap(parameters, original_properties)
             else:
                 return self.__filter_from_dictionary(parameters, original_properties)
         return used_properties
 
+    def __get_parameters(self, heat_template_str):
+        cache_key = hashlib.sha256(heat_template_str.encode('utf-8')).hexdigest()
+        if self.parameters_cache is not None:
+            parameters = self.parameters_cache.get(cache_key)
+            if parameters is not None:
+                return parameters
+        parameters = self.__get_stored_parameters(cache_key, heat_template_str)
+        if self.parameters_cache is not None:
+            self.parameters_cache.put(cache_key, parameters)
+        return parameters
+
+    def __get_stored_parameters(self, cache_key, heat_template_str):
+        if self.store is None:
+            return HeatParameters(self.__parse_parameter_names(heat_template_str))
+        stored_parameters = self.store.get(HEAT_PARAMETERS_NAMESPACE, cache_key)
+        if stored_parameters is not None:
+            return HeatParameters(json.loads(stored_parameters.decode('utf-8')))
+        parameter_names = self.__parse_parameter_names(heat_template_str)
+        self.store.put(HEAT_PARAMETERS_NAMESPACE, cache_key, json.dumps({param_name: None for param_name in parameter_names}).encode('utf-8'))
+        return HeatParameters(parameter_names)
+
+    def __parse_parameter_names(self, heat_template_str):
+        heat_tpl = yamlutil.safe_load(heat_template_str)
+        parameters = heat_tpl.get('parameters', None) if isinstance(heat_tpl, dict) else None
+        if not parameters:
+            return []
+        # Only the parameter names are used, so the definitions are not kept
+        return list(parameters)
+
     def __filter_from_dictionary(self, parameters, properties_dict):
         used_properties = {}
-        for k, v in parameters.items():
-            if k in properties_dict:
-                used_properties[k] = properties_dict[k]
+        for param_name in parameters.names:
+            if param_name in properties_dict:
+                used_properties[param_name] = properties_dict[param_name]
         return used_properties
 
     def __filter_from_propvaluemap(self, parameters, prop_value_map):
         used_properties = {}
-        for param_name, param_def in parameters.items():
+        for param_name in parameters.names:
             if param_name in prop_value_map:
                 used_properties[param_name] = self.__extract_property_from_value_map(prop_value_map, param_name)
-            elif param_name.endswith(PUBLIC_KEY_SUFFIX):
-                key_name = param_name[:len(param_name)-len(PUBLIC_KEY_SUFFIX)]
-                if key_name in prop_value_map:
-                    full_value = prop_value_map.get_value_and_type(key_name)
-                    if full_value.get('type') == 'key' and 'publicKey' in full_value:
-                        used_properties[param_name] = full_value.get('publicKey')
-            elif param_name.endswith(PRIVATE_KEY_SUFFIX):
-                key_name = param_name[:len(param_name)-len(PRIVATE_KEY_SUFFIX)]
+            elif param_name in parameters.key_parts:
+                key_name, key_part = parameters.key_parts[param_name]
                 if key_name in prop_value_map:
                     full_value = prop_value_map.get_value_and_type(key_name)
-                    if full_value.get('type') == 'key' and 'privateKey' in full_value:
-                        used_properties[param_name] = full_value.get('privateKey')
+                    if full_value.get('type') == 'key' and key_part in full_value:
+                        used_properties[param_name] = full_value.get(key_part)
         return used_properties
 
     def __extract_property_from_value_map(self, prop_value_map, property_name):
@@ -0,0 +1,125 @@
+import copy
+import time
+import logging
+from neutronclient.common import exceptions as neutronexceptions
+from osvimdriver.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class NotFoundEntry():
+
+    def __init__(self, error, cached_at):
+        self.error = error
+        self.cached_at = cached_at
+
+
+class NeutronCache():
+    """
+    Read-through cache of Neutron networks and subnets, shared by all deployment locations. Keys start with a location key,
+    so the entries of one location can be invalidated without affecting others.
+
+    Entries expire ttl_seconds after they were retrieved and the least recently used are removed once max_size is reached.
+    Lookups which failed with NotFound are also cached (for negative_ttl_seconds, 0 to disable), so repeated searches for a network
+    which does not exist do not each go to Neutron. Callers receive copies of the cached values, so may modify them.
+    """
+
+    def __init__(self, ttl_seconds=300, negative_ttl_seconds=30, max_size=1000, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.clock = clock
+        self.__entries = LRUCache(max_size=max_size, max_age_seconds=ttl_seconds, clock=clock)
+
+    def get(self, key, loader):
+        found, value = self.lookup(key)
+        if found:
+            return value
+        try:
+            value = loader()
+        except neutronexceptions.NotFound as e:
+            if self.negative_ttl_seconds > 0:
+                self.__entries.put(key, NotFoundEntry(e, self.clock()))
+            raise
+        self.put(key, value)
+        return copy.deepcopy(value)
+
+    def lookup(self, key):
+        """Returns (True, value) if the key is cached, (False, None) if not. Raises the original NotFound error if the key is cached as not found."""
+        entry = self.__entries.get(key)
+        if entry is None:
+            return False, None
+        if isinstance(entry, NotFoundEntry):
+            if self.clock() - entry.cached_at >= self.negative_ttl_seconds:
+                self.__entries.pop(key)
+                return False, None
+            logger.debug('Using cached not found result for %s', key)
+            raise entry.error
+        logger.debug('Using cached result for %s', key)
+        return True, copy.deepcopy(entry)
+
+    def put(self, key, value):
+        self.__entries.put(key, copy.deepcopy(value))
+
+    def invalidate(self, location_key=None):
+        """Removes all entries for a location, or every entry if no location_key is given"""
+        if location_key is None:
+            self.__entries.clear()
+            return
+        for key in self.__entries.keys():
+            if key[0] == location_key:
+                self.__entries.pop(key)
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+class CachingNeutronDriver():
+    """Wraps a NeutronDriver so network and subnet lookups are answered from a NeutronCache when possible"""
+
+    def __init__(self, neutron_driver, neutron_cache, location_key):
+        self.neutron_driver = neutron_driver
+        self.neutron_cache = neutron_cache
+        self.location_key = location_key
+
+    def get_network_by_id(self, network_id):
+        if network_id is None:
+            raise ValueError('network_id must be provided')
+        return self.neutron_cache.get((self.location_key, 'network', network_id),
+                                      lambda: self.neutron_driver.get_network_by_id(network_id))
+
+    def get_network_by_name(self, network_name, fields=None):
+        if network_name is None:
+            raise ValueError('network_name must be provided')
+        fields_key = tuple(fields) if fields is not None else None
+        return self.neutron_cache.get((self.location_key, 'network_name', network_name, fields_key),
+                                      lambda: self.neutron_driver.get_network_by_name(network_name, fields=fields))
+
+    def get_subnet_by_id(self, subnet_id):
+        if subnet_id is None:
+            raise ValueError('subnet_id must be provided')
+        return self.neutron_cache.get((self.location_key, 'subnet', subnet_id),
+                                      lambda: self.neutron_driver.get_subnet_by_id(subnet_id))
+
+    def get_subnets_by_ids(self, subnet_ids):
+        if subnet_ids is None:
+            raise ValueError('subnet_ids must be provided')
+        subnets = []
+        missing_subnet_ids = []
+        for subnet_id in subnet_ids:
+            try:
+                found, subnet = self.neutron_cache.lookup((self.location_key, 'subnet', subnet_id))
+            except neutronexceptions.NotFound:
+                # Lists omit missing subnets rather than failing
+                continue
+            if found:
+                subnets.append(subnet)
+            else:
+                missing_subnet_ids.append(subnet_id)
+        if len(missing_subnet_ids) > 0:
+            for subnet in self.neutron_driver.get_subnets_by_ids(missing_subnet_ids):
+                self.neutron_cache.put((self.location_key, 'subnet', subnet['id']), subnet)
+                subnets.append(subnet)
+        return subnets
+
+    def invalidate(self):
+        self.neutron_cache.invalidate(self.location_key)
@@ -22,23 +22,27 @@ class NeutronDriver():
         result = neutron_client.show_network(network_id)
         return result['network']
 
-    def get_network_by_name(self, network_name):
+    def get_network_by_name(self, network_name, fields=None):
         if network_name is None:
             raise ValueError('network_name must be provided')
         neutron_client = self.__get_neutron_client()
         logger.debug('Retrieving network with name %s', network_name)
-        result = neutron_client.list_networks()
-        matches = []
-        for network in result['networks']:
-            if network['name'] == network_name:
-                matches.append(network)
-        if len(matches) > 1:
-            raise neutronexceptions.NeutronClientNoUniqueMatch(resource='Network',
-                                                               name=network_name)
-        elif len(matches) == 1:
-            return matches[0]
-        else:
+        kwargs = {}
+        if fields is not None:
+            kwargs['fields'] = list(fields)
+        # Filter by name in Neutron and read the results a page at a time, rather than retrieving every network in the project
+        pages = neutron_client.list_networks(retrieve_all=False, name=network_name, **kwargs)
+        match = None
+        for page in pages:
+            for network in page['networks']:
+                if network['name'] == network_name:
+                    if match is not None:
+                        raise neutronexceptions.NeutronClientNoUniqueMatch(resource='Network',
+                                                                           name=network_name)
+                    match = network
+        if match is None:
             raise neutronexceptions.NotFound(message='Unable to find network with name \'{0}\''.format(network_name))
+        return match
 
     def get_subnet_by_id(self, subnet_id):
         if subnet_id is None:
@@ -47,3 +51,14 @@ class NeutronDriver():
         logger.debug('Retrieving subnet with id %s', subnet_id)
         result = neutron_client.show_subnet(subnet_id)
         return result['subnet']
+
+    def get_subnets_by_ids(self, subnet_ids):
+        if subnet_ids is None:
+            raise ValueError('subnet_ids must be provided')
+        subnet_ids = list(subnet_ids)
+        if len(subnet_ids) == 0:
+            return []
+        neutron_client = self.__get_neutron_client()
+        logger.debug('Retrieving subnets with ids %s', subnet_ids)
+        result = neutron_client.list_subnets(id=subnet_ids)
+        return result['subnets']
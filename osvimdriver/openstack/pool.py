@@ -0,0 +1,89 @@
+import json
+import hashlib
+import logging
+import threading
+from osvimdriver.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint_deployment_location(deployment_location):
+    content = json.dumps({
+        'name': deployment_location.get('name'),
+        'properties': deployment_location.get('properties', {})
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class OpenstackLocationPool():
+    """
+    Hands out OpenstackDeploymentLocation instances which are shared between requests for the same deployment location,
+    so the keystone session (and the token it holds) plus the Heat/Neutron clients are re-used rather than rebuilt for every request.
+
+    Locations are keyed by a fingerprint of the deployment location name and properties, so a change to any property
+    (e.g. rotated credentials) results in a new location. The least recently used location is removed once max_size is reached
+    and locations which have not been used for max_idle_seconds are removed on the next access to the pool.
+
+    Each location handed out is leased until its close() (which calls release()), so a location removed from the pool whilst
+    requests are still using it is only disposed of once the last of them has released it.
+    """
+
+    def __init__(self, location_translator, max_size=50, max_idle_seconds=900):
+        if location_translator is None:
+            raise ValueError('location_translator must be provided')
+        self.location_translator = location_translator
+        self.__locations = LRUCache(max_size=max_size, max_idle_seconds=max_idle_seconds, on_evict=self.__remove)
+        # Number of unreleased leases of each location in use and the locations removed from the pool whilst in use
+        self.__leases = {}
+        self.__removed = set()
+        self.__lock = threading.Lock()
+
+    def from_deployment_location(self, deployment_location):
+        fingerprint = fingerprint_deployment_location(deployment_location)
+        with self.__lock:
+            self.__locations.expire()
+            openstack_location = self.__locations.get(fingerprint)
+            if openstack_location is None:
+                logger.debug('Adding Openstack location for deployment location %s to pool', deployment_location.get('name'))
+                openstack_location = self.location_translator.from_deployment_location(deployment_location)
+                openstack_location.pool = self
+                self.__locations.put(fingerprint, openstack_location)
+            self.__leases[openstack_location] = self.__leases.get(openstack_location, 0) + 1
+        return openstack_location
+
+    def release(self, openstack_location):
+        with self.__lock:
+            leases = self.__leases.pop(openstack_location, 0) - 1
+            if leases > 0:
+                self.__leases[openstack_location] = leases
+                return
+            if openstack_location not in self.__removed:
+                return
+            self.__removed.discard(openstack_location)
+        self.__dispose(openstack_location)
+
+    def clear(self):
+        with self.__lock:
+            self.__locations.clear()
+
+    def __len__(self):
+        return len(self.__locations)
+
+    def leases(self, openstack_location):
+        with self.__lock:
+            return self.__leases.get(openstack_location, 0)
+
+    def __remove(self, fingerprint, openstack_location):
+        # Called with the lock held, as the cache only removes locations during calls made by this pool
+        logger.debug('Removing Openstack location %s from pool', openstack_location.name)
+        if self.__leases.get(openstack_location, 0) > 0:
+            logger.debug('Openstack location %s is in use, it will be disposed of once released', openstack_location.name)
+            self.__removed.add(openstack_location)
+        else:
+            self.__dispose(openstack_location)
+
+    def __dispose(self, openstack_location):
+        try:
+            openstack_location.dispose()
+        except Exception as e:
+            logger.exception('Encountered an error whilst disposing of Openstack location {0}: {1}'.format(openstack_location.name, str(e)))
@@ -0,0 +1,116 @@
+import os
+import fcntl
+import hashlib
+import logging
+import tempfile
+import contextlib
+from keystoneauth1.identity import v3 as keystonev3
+
+logger = logging.getLogger(__name__)
+
+
+class FileTokenCache():
+    """
+    Stores keystone auth state as files in a directory, so tokens can be shared by every process using the same directory
+    (e.g. all gunicorn workers in a pod). Writes are atomic (write to a temporary file then rename) and a per-key file lock
+    is available so only one process authenticates for a set of credentials at a time.
+
+    Tokens are considered stale refresh_margin_seconds before they expire, so they are refreshed before Openstack rejects them.
+    """
+
+    def __init__(self, directory, refresh_margin_seconds=300):
+        if directory is None:
+            raise ValueError('directory must be provided')
+        self.directory = directory
+        self.refresh_margin_seconds = refresh_margin_seconds
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def load(self, cache_key):
+        try:
+            with open(self.__path(cache_key, 'json'), 'r') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning('Failed to read cached token {0}: {1}'.format(cache_key, str(e)))
+            return None
+
+    def save(self, cache_key, auth_state):
+        # mkstemp creates the file readable by the owner only
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(auth_state)
+            os.replace(tmp_path, self.__path(cache_key, 'json'))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def remove(self, cache_key, expected_auth_state=None):
+        """Removes the cached auth state. If expected_auth_state is set, the entry is only removed if it still holds that state (another process may have already replaced it)."""
+        with self.lock(cache_key):
+            if expected_auth_state is not None and self.load(cache_key) != expected_auth_state:
+                return
+            try:
+                os.remove(self.__path(cache_key, 'json'))
+            except FileNotFoundError:
+                pass
+
+    @contextlib.contextmanager
+    def lock(self, cache_key):
+        with open(self.__path(cache_key, 'lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __path(self, cache_key, extension):
+        file_name = hashlib.sha256(cache_key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, '{0}.{1}'.format(file_name, extension))
+
+
+class SharedTokenPassword(keystonev3.Password):
+    """
+    Keystone v3 password auth which obtains tokens through a token cache shared with other processes, only authenticating with keystone
+    when no usable token has been cached. Invalidation (which the session performs on a 401 response) also removes the token from the cache.
+    """
+
+    def __init__(self, token_cache, **kwargs):
+        super().__init__(**kwargs)
+        self.token_cache = token_cache
+
+    def get_access(self, session, **kwargs):
+        with self._lock:
+            if self._needs_reauthenticate() or self.auth_ref.will_expire_soon(self.token_cache.refresh_margin_seconds):
+                self.auth_ref = self.__get_shared_auth_ref(session)
+        return self.auth_ref
+
+    def invalidate(self):
+        if self.auth_ref is not None:
+            self.token_cache.remove(self.__cache_key(), expected_auth_state=self.get_auth_state())
+        return super().invalidate()
+
+    def __get_shared_auth_ref(self, session):
+        cache_key = self.__cache_key()
+        with self.token_cache.lock(cache_key):
+            # Another process may have authenticated whilst this one was waiting for the lock
+            self.__load_cached_auth_state(cache_key)
+            if self.auth_ref is not None and not self.auth_ref.will_expire_soon(self.token_cache.refresh_margin_seconds):
+                logger.debug('Using cached token for %s', self.auth_url)
+                return self.auth_ref
+            logger.debug('Authenticating with %s', self.auth_url)
+            self.auth_ref = self.get_auth_ref(session)
+            self.token_cache.save(cache_key, self.get_auth_state())
+            return self.auth_ref
+
+    def __load_cached_auth_state(self, cache_key):
+        try:
+            self.set_auth_state(self.token_cache.load(cache_key))
+        except (ValueError, KeyError) as e:
+            logger.warning('Ignoring invalid cached token for {0}: {1}'.format(self.auth_url, str(e)))
+            self.auth_ref = None
+
+    def __cache_key(self):
+        return self.get_cache_id()
@@ -0,0 +1,62 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class InFlightCreate():
+
+    def __init__(self):
+        self.stack_id = None
+        self.error = None
+        self.done = threading.Event()
+
+    def get_result(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.stack_id
+
+
+class CreateDeduplicator():
+    """
+    Makes creating a stack with a given name idempotent, so a Create request redelivered by the orchestrator does not translate and submit
+    the template again.
+
+    Concurrent creates with the same key (the deployment location and stack name) are coalesced onto the first, with the others waiting
+    for and returning its result. The first looks for an existing stack with the name before calling create_stack, so a retried create
+    returns the stack created by the original request.
+    """
+
+    def __init__(self):
+        self.__in_flight = {}
+        self.__lock = threading.Lock()
+
+    def create(self, key, heat_driver, stack_name, create_stack):
+        with self.__lock:
+            in_flight = self.__in_flight.get(key, None)
+            leader = in_flight is None
+            if leader:
+                in_flight = InFlightCreate()
+                self.__in_flight[key] = in_flight
+        if not leader:
+            logger.debug('Create of stack %s already in progress, waiting for its result', stack_name)
+            return in_flight.get_result()
+        try:
+            existing_stack = heat_driver.get_stack_by_name(stack_name)
+            if existing_stack is not None:
+                logger.info('Stack with name %s already exists with id %s, not creating it again', stack_name, existing_stack['id'])
+                in_flight.stack_id = existing_stack['id']
+            else:
+                in_flight.stack_id = create_stack()
+        except Exception as e:
+            in_flight.error = e
+        finally:
+            with self.__lock:
+                del self.__in_flight[key]
+            in_flight.done.set()
+        return in_flight.get_result()
+
+    def in_flight_count(self):
+        with self.__lock:
+            return len(self.__in_flight)
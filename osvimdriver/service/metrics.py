@@ -0,0 +1,89 @@
+import osvimdriver.api_specs as api_specs
+import os
+import logging
+import pathlib
+from ignition.service.framework import Capability, Service, interface, ServiceRegistration
+from ignition.service.api import BaseController
+from ignition.boot.connexionutils import build_resolver_to_instance
+from ignition.service.config import ConfigurationPropertiesGroup
+from osvimdriver.metrics import PrometheusMetrics, get_metrics, set_metrics
+
+logger = logging.getLogger(__name__)
+
+# Grabs the __init__.py from the api_specs package then takes it's parent, the api directory itself
+api_spec_path = str(pathlib.Path(api_specs.__file__).parent.resolve())
+
+MULTIPROCESS_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+
+class MetricsProperties(ConfigurationPropertiesGroup):
+
+    def __init__(self):
+        super().__init__('metrics')
+        self.enabled = False
+        self.multiprocess_directory = None
+
+
+def enable_metrics(metrics_properties):
+    """Starts recording metrics in this process, with prometheus_client (installed with the "metrics" extra of this package)"""
+    if get_metrics().enabled:
+        return
+    if metrics_properties.multiprocess_directory is not None:
+        # Must be set before prometheus_client is imported, as it decides then whether values are written to files shared between processes
+        os.environ.setdefault(MULTIPROCESS_DIR_ENV, metrics_properties.multiprocess_directory)
+        os.makedirs(os.environ[MULTIPROCESS_DIR_ENV], exist_ok=True)
+    try:
+        metrics = PrometheusMetrics()
+    except ImportError as e:
+        raise ValueError('metrics.enabled is True but prometheus_client is not installed (install os-vim-driver[metrics])') from e
+    set_metrics(metrics)
+
+
+class MetricsApiConfigurator():
+
+    def __init__(self):
+        pass
+
+    def configure(self, configuration, service_register, service_instances, api_register):
+        metrics_properties = configuration.property_groups.get_property_group(MetricsProperties)
+        if metrics_properties.enabled is True:
+            logger.debug('Configuring Metrics API')
+            api_spec = os.path.join(api_spec_path, 'metrics.yaml')
+            api_service_class = service_register.get_service_offering_capability(MetricsApiCapability)
+            if api_service_class is None:
+                raise ValueError('No service has been registered with the MetricsApiCapability')
+            api_service_instance = service_instances.get_instance(api_service_class)
+            if api_service_instance is None:
+                raise ValueError('No instance of the MetricsApiCapability service has been built')
+            api_register.register_api(api_spec, resolver=build_resolver_to_instance(api_service_instance))
+        else:
+            logger.debug('Disabled: Metrics API')
+
+
+class MetricsServiceConfigurator():
+
+    def __init__(self):
+        pass
+
+    def configure(self, configuration, service_register):
+        metrics_properties = configuration.property_groups.get_property_group(MetricsProperties)
+        if metrics_properties.enabled is True:
+            logger.debug('Configuring Metrics Services')
+            enable_metrics(metrics_properties)
+            service_register.add_service(ServiceRegistration(MetricsApiService))
+        else:
+            logger.debug('Disabled: Metrics Services')
+
+
+class MetricsApiCapability(Capability):
+
+    @interface
+    def metrics(self, **kwarg):
+        pass
+
+
+class MetricsApiService(Service, MetricsApiCapability, BaseController):
+
+    def metrics(self, **kwarg):
+        content_type, content = get_metrics().generate_latest()
+        return (content.decode('utf-8'), 200, {'Content-Type': content_type})
@@ -7,6 +7,7 @@ from ignition.service.api import BaseController
 from ignition.boot.connexionutils import build_resolver_to_instance
 from ignition.service.config import ConfigurationPropertiesGroup
 from osvimdriver.openstack.environment import OpenstackDeploymentLocationTranslator
+from osvimdriver.timing import phase_timings
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +67,10 @@ class OpenstackAdminApiCapability(Capability):
     def ping(self, **kwarg):
         pass
 
+    @interface
+    def timings(self, **kwarg):
+        pass
+
 
 class OpenstackAdminCapability(Capability):
 
@@ -73,6 +78,10 @@ class OpenstackAdminCapability(Capability):
     def ping(self, deployment_location):
         pass
 
+    @interface
+    def timings(self, request_type=None, template_hash=None):
+        pass
+
 
 class OpenstackAdminApiService(Service, OpenstackAdminApiCapability, BaseController):
 
@@ -88,11 +97,29 @@ class OpenstackAdminApiService(Service, OpenstackAdminApiCapability, BaseControl
         response = {'success': ping_response.success, 'description': ping_response.description}
         return (response, 200)
 
+    def timings(self, **kwarg):
+        series = self.service.timings(request_type=kwarg.get('requestType', None), template_hash=kwarg.get('templateHash', None))
+        response = {'timings': [self.__timing_response(labels, histogram) for labels, histogram in series]}
+        return (response, 200)
+
+    def __timing_response(self, labels, histogram):
+        return {
+            'requestType': labels['request_type'],
+            'phase': labels['phase'],
+            'location': labels['location'],
+            'templateHash': labels['template_hash'],
+            'count': histogram.count,
+            'sum': histogram.sum,
+            # Infinity is not valid JSON, so the last bucket is named as it is by Prometheus
+            'buckets': [{'le': '+Inf' if bound == float('inf') else bound, 'count': count} for bound, count in histogram.cumulative_counts()]
+        }
+
 
 class OpenstackAdminService(Service, OpenstackAdminCapability):
 
-    def __init__(self, location_translator):
+    def __init__(self, location_translator, timings=phase_timings):
         self.location_translator = location_translator
+        self.timings_source = timings
 
     def ping(self, deployment_location):
         openstack_location = self.location_translator.from_deployment_location(deployment_location)
@@ -106,6 +133,20 @@ class OpenstackAdminService(Service, OpenstackAdminCapability):
         except Exception as e:
             return PingResponse(False, str(e))
 
+    def timings(self, request_type=None, template_hash=None):
+        """
+        Returns (labels, histogram) for the phase timings of requests handled by this process, optionally only those of one request type or template hash.
+        Each worker process keeps its own timings, so they describe the requests handled by the worker which answers.
+        """
+        series = []
+        for labels, histogram in self.timings_source.collect():
+            if request_type is not None and labels['request_type'] != request_type:
+                continue
+            if template_hash is not None and labels['template_hash'] != template_hash:
+                continue
+            series.append((labels, histogram))
+        return series
+
 
 class PingResponse:
 
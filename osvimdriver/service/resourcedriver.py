@@ -1,16 +1,31 @@
 import uuid
+import time
 import logging
 import re
 import os
-from ignition.service.framework import Service, Capability, interface
+from ignition.service.framework import Service, Capability, interface, ServiceRegistration
 from ignition.service.config import ConfigurationPropertiesGroup
-from ignition.service.resourcedriver import ResourceDriverHandlerCapability, InfrastructureNotFoundError, InvalidDriverFilesError, ResourceDriverError, InvalidRequestError
+from ignition.service.resourcedriver import ResourceDriverHandlerCapability, LifecycleMessagingCapability, InfrastructureNotFoundError, InvalidDriverFilesError, ResourceDriverError, InvalidRequestError, TemporaryResourceDriverError, RequestNotFoundError
 from ignition.model.references import FindReferenceResponse, FindReferenceResult
 from ignition.model.associated_topology import AssociatedTopology
 from ignition.model.lifecycle import LifecycleExecuteResponse, LifecycleExecution, STATUS_IN_PROGRESS, STATUS_COMPLETE, STATUS_FAILED, STATUS_UNKNOWN
 from ignition.model.failure import FailureDetails, FAILURE_CODE_INFRASTRUCTURE_ERROR
-from osvimdriver.service.tosca import ToscaValidationError, NotDiscoveredError
+from osvimdriver.service.tosca import ToscaValidationError, NotDiscoveredError, PersistentStoreProperties, open_persistent_store, ToscaHeatTranslatorCapability, ToscaTopologyDiscoveryCapability, TranslationBusyError, TranslationTimeoutError, TranslationWorkerError
 from osvimdriver.openstack.heat.driver import StackNotFoundError
+from osvimdriver.openstack.environment import OpenstackDeploymentLocationTranslator
+from osvimdriver.openstack.pool import OpenstackLocationPool, fingerprint_deployment_location
+from osvimdriver.openstack.tokens import FileTokenCache
+from osvimdriver.openstack.heat.poller import BatchedStackPoller
+from osvimdriver.openstack.heat.cache import StackStatusCache
+from osvimdriver.openstack.heat.events import StackEventTracker
+from osvimdriver.openstack.heat.notifications import StackNotifications, create_notification_source, DEFAULT_TOPICS
+from osvimdriver.openstack.neutron.cache import NeutronCache
+from osvimdriver.cache import LRUCache
+from osvimdriver.timing import RequestTimer, activate_timer, timed_phase, phase_timings, template_hash
+from osvimdriver.metrics import get_metrics
+from osvimdriver.tracing import get_tracer
+from osvimdriver.service.watcher import StackWatcher, SharedWatchState
+from osvimdriver.service.deduplication import CreateDeduplicator
 from ignition.utils.propvaluemap import PropValueMap
 
 logger = logging.getLogger(__name__)
@@ -53,6 +68,79 @@ class AdoptProperties(ConfigurationPropertiesGroup, Service, Capability):
         super().__init__('adopt')
         self.skip_status_check = False
         self.adoptable_status_values = ['CREATE_COMPLETE','ADOPT_COMPLETE','RESUME_COMPLETE','CHECK_COMPLETE','UPDATE_COMPLETE']
+
+class LocationPoolProperties(ConfigurationPropertiesGroup, Service, Capability):
+
+    def __init__(self):
+        super().__init__('location_pool')
+        self.enabled = True
+        self.max_size = 50
+        self.max_idle_seconds = 900
+
+class TokenCacheProperties(ConfigurationPropertiesGroup, Service, Capability):
+
+    def __init__(self):
+        super().__init__('token_cache')
+        self.enabled = False
+        self.directory = '/var/ovd/token_cache'
+        self.refresh_margin_seconds = 300
+
+class StackPollingProperties(ConfigurationPropertiesGroup, Service, Capability):
+
+    def __init__(self):
+        super().__init__('stack_polling')
+        self.batch_enabled = False
+        self.batch_window_seconds = 0.05
+        self.batch_max_size = 100
+        self.status_cache_ttl_seconds = 0
+        self.status_cache_max_size = 1000
+        self.terminal_cache_ttl_seconds = 3600
+        self.terminal_cache_max_size = 1000
+        self.events_enabled = False
+        self.events_page_size = 100
+        self.events_max_tracked = 1000
+        self.events_max_idle_seconds = 3600
+
+class NeutronCacheProperties(ConfigurationPropertiesGroup, Service, Capability):
+
+    def __init__(self):
+        super().__init__('neutron_cache')
+        self.enabled = False
+        self.ttl_seconds = 300
+        self.negative_ttl_seconds = 30
+        self.max_size = 1000
+
+class CreateDeduplicationProperties(ConfigurationPropertiesGroup, Service, Capability):
+
+    def __init__(self):
+        super().__init__('create_deduplication')
+        self.enabled = False
+
+class HeatNotificationsProperties(ConfigurationPropertiesGroup, Service, Capability):
+
+    def __init__(self):
+        super().__init__('heat_notifications')
+        self.enabled = False
+        self.source = 'kafka'
+        self.connection_address = None
+        self.topics = list(DEFAULT_TOPICS)
+        self.path = None
+        self.max_size = 10000
+        self.ttl_seconds = 3600
+        self.in_progress_ttl_seconds = 60
+
+class StackWatcherProperties(ConfigurationPropertiesGroup, Service, Capability):
+
+    def __init__(self):
+        super().__init__('stack_watcher')
+        self.enabled = False
+        self.max_workers = 4
+        self.min_interval_seconds = 2
+        self.max_interval_seconds = 30
+        self.backoff_multiplier = 1.5
+        self.max_watched = 1000
+        self.max_watch_seconds = 7200
+        self.state_directory = '/var/ovd/watcher'
         
 class StackNameCreator:
 
@@ -76,6 +164,49 @@ class PropertiesMerger:
             new_props[new_key] = v
         return PropValueMap(new_props)
 
+def build_location_translator(token_cache_config=None, persistent_store_config=None, neutron_cache_config=None):
+    """Builds an OpenstackDeploymentLocationTranslator using the token cache, persistent store and Neutron cache enabled in configuration"""
+    token_cache = None
+    if token_cache_config is not None and token_cache_config.enabled:
+        token_cache = FileTokenCache(token_cache_config.directory, refresh_margin_seconds=token_cache_config.refresh_margin_seconds)
+    persistent_store = None
+    if persistent_store_config is not None:
+        persistent_store = open_persistent_store(persistent_store_config)
+    neutron_cache = None
+    if neutron_cache_config is not None and neutron_cache_config.enabled:
+        neutron_cache = NeutronCache(ttl_seconds=neutron_cache_config.ttl_seconds, negative_ttl_seconds=neutron_cache_config.negative_ttl_seconds,
+                                     max_size=neutron_cache_config.max_size)
+    return OpenstackDeploymentLocationTranslator(token_cache=token_cache, persistent_store=persistent_store, neutron_cache=neutron_cache)
+
+
+class ResourceDriverServiceConfigurator():
+    """Registers the ResourceDriverHandler, with a location translator built from the loaded configuration"""
+
+    def __init__(self):
+        pass
+
+    def configure(self, configuration, service_register):
+        property_groups = configuration.property_groups
+        location_translator = build_location_translator(token_cache_config=property_groups.get_property_group(TokenCacheProperties),
+                                                        persistent_store_config=property_groups.get_property_group(PersistentStoreProperties),
+                                                        neutron_cache_config=property_groups.get_property_group(NeutronCacheProperties))
+        required_capabilities = {
+            'heat_translator_service': ToscaHeatTranslatorCapability,
+            'tosca_discovery_service': ToscaTopologyDiscoveryCapability,
+            'resource_driver_config': AdditionalResourceDriverProperties,
+            'adopt_config': AdoptProperties,
+            'location_pool_config': LocationPoolProperties,
+            'stack_polling_config': StackPollingProperties,
+            'stack_watcher_config': StackWatcherProperties,
+            'heat_notifications_config': HeatNotificationsProperties,
+            'create_deduplication_config': CreateDeduplicationProperties
+        }
+        # Only the stack watcher sends messages, so the lifecycle messaging service is only required when it is enabled
+        if property_groups.get_property_group(StackWatcherProperties).enabled:
+            required_capabilities['lifecycle_messaging_service'] = LifecycleMessagingCapability
+        service_register.add_service(ServiceRegistration(ResourceDriverHandler, location_translator, **required_capabilities))
+
+
 class ResourceDriverHandler(Service, ResourceDriverHandlerCapability):
 
     def __init__(self, location_translator, **kwargs):
@@ -92,34 +223,148 @@ class ResourceDriverHandler(Service, ResourceDriverHandlerCapability):
         else:
             self.adopt_config = AdoptProperties()
         self.resource_driver_config = kwargs.get('resource_driver_config')
-        
-        self.location_translator = location_translator
+        if 'location_pool_config' in kwargs:
+            self.location_pool_config = kwargs.get('location_pool_config')
+        else:
+            self.location_pool_config = LocationPoolProperties()
+
+        if 'stack_polling_config' in kwargs:
+            self.stack_polling_config = kwargs.get('stack_polling_config')
+        else:
+            self.stack_polling_config = StackPollingProperties()
+
+        if 'create_deduplication_config' in kwargs:
+            self.create_deduplication_config = kwargs.get('create_deduplication_config')
+        else:
+            self.create_deduplication_config = CreateDeduplicationProperties()
+        self.create_deduplicator = CreateDeduplicator() if self.create_deduplication_config.enabled else None
+        if 'heat_notifications_config' in kwargs:
+            self.heat_notifications_config = kwargs.get('heat_notifications_config')
+        else:
+            self.heat_notifications_config = HeatNotificationsProperties()
+        if self.heat_notifications_config.enabled:
+            notification_source = create_notification_source(self.heat_notifications_config.source,
+                                                             connection_address=self.heat_notifications_config.connection_address,
+                                                             topics=self.heat_notifications_config.topics,
+                                                             path=self.heat_notifications_config.path)
+            self.stack_notifications = StackNotifications(notification_source, max_size=self.heat_notifications_config.max_size,
+                                                          ttl_seconds=self.heat_notifications_config.ttl_seconds,
+                                                          in_progress_ttl_seconds=self.heat_notifications_config.in_progress_ttl_seconds)
+            self.stack_notifications.start()
+        else:
+            self.stack_notifications = None
+        if 'stack_watcher_config' in kwargs:
+            self.stack_watcher_config = kwargs.get('stack_watcher_config')
+        else:
+            self.stack_watcher_config = StackWatcherProperties()
+        if self.stack_watcher_config.enabled:
+            if 'lifecycle_messaging_service' not in kwargs:
+                raise ValueError('lifecycle_messaging_service argument not provided (required when stack_watcher.enabled is True)')
+            if self.stack_watcher_config.state_directory is not None:
+                watch_state = SharedWatchState(self.stack_watcher_config.state_directory, max_age_seconds=self.stack_watcher_config.max_watch_seconds)
+            else:
+                logger.warning('stack_watcher.state_directory is not set, results may be sent more than once if there is more than one driver process')
+                watch_state = None
+            self.stack_watcher = StackWatcher(self.__poll_watched_requests, kwargs.get('lifecycle_messaging_service').send_lifecycle_execution,
+                                              max_workers=self.stack_watcher_config.max_workers,
+                                              min_interval_seconds=self.stack_watcher_config.min_interval_seconds,
+                                              max_interval_seconds=self.stack_watcher_config.max_interval_seconds,
+                                              backoff_multiplier=self.stack_watcher_config.backoff_multiplier,
+                                              max_watched=self.stack_watcher_config.max_watched,
+                                              max_watch_seconds=self.stack_watcher_config.max_watch_seconds,
+                                              state=watch_state)
+        else:
+            self.stack_watcher = None
+        if self.location_pool_config.enabled:
+            self.location_translator = OpenstackLocationPool(location_translator, max_size=self.location_pool_config.max_size,
+                                                             max_idle_seconds=self.location_pool_config.max_idle_seconds)
+        else:
+            self.location_translator = location_translator
+        if self.stack_polling_config.batch_enabled:
+            self.stack_poller = BatchedStackPoller(window_seconds=self.stack_polling_config.batch_window_seconds,
+                                                   max_batch_size=self.stack_polling_config.batch_max_size)
+        else:
+            self.stack_poller = None
+        if self.stack_polling_config.status_cache_ttl_seconds > 0:
+            self.stack_status_cache = StackStatusCache(ttl_seconds=self.stack_polling_config.status_cache_ttl_seconds,
+                                                       max_size=self.stack_polling_config.status_cache_max_size)
+        else:
+            self.stack_status_cache = None
+        if self.stack_polling_config.events_enabled:
+            self.stack_event_tracker = StackEventTracker(page_size=self.stack_polling_config.events_page_size,
+                                                         max_size=self.stack_polling_config.events_max_tracked,
+                                                         max_idle_seconds=self.stack_polling_config.events_max_idle_seconds)
+        else:
+            self.stack_event_tracker = None
+        if self.stack_polling_config.terminal_cache_ttl_seconds > 0:
+            # Completed and failed executions never change, so are kept to answer later requests for the same execution without Heat
+            self.terminal_executions = LRUCache(max_size=self.stack_polling_config.terminal_cache_max_size,
+                                                max_age_seconds=self.stack_polling_config.terminal_cache_ttl_seconds)
+        else:
+            self.terminal_executions = None
         self.stack_name_creator = StackNameCreator()
         self.props_merger = PropertiesMerger()
     
     def execute_lifecycle(self, lifecycle_name, driver_files, system_properties, resource_properties, request_properties, associated_topology, deployment_location):
+        lifecycle = lifecycle_name.capitalize() if lifecycle_name.upper() in ['CREATE', 'ADOPT', 'DELETE'] else 'unsupported'
+        with get_tracer().span('execute_lifecycle', {'ovd.lifecycle': lifecycle, 'ovd.location': self.__location_name(deployment_location)}) as span, \
+                get_metrics().time_lifecycle(lifecycle):
+            execute_response = self.__execute_lifecycle(lifecycle_name, driver_files, system_properties, resource_properties, request_properties, associated_topology, deployment_location)
+            span.set_attribute('ovd.request_id', execute_response.request_id)
+            return execute_response
+
+    def __location_name(self, deployment_location):
+        return deployment_location.get('name', None) if isinstance(deployment_location, dict) else None
+
+    def __execute_lifecycle(self, lifecycle_name, driver_files, system_properties, resource_properties, request_properties, associated_topology, deployment_location):
         openstack_location = None
         try:
             openstack_location = self.location_translator.from_deployment_location(deployment_location)
             if lifecycle_name.upper() == 'CREATE':
-                return self.__handle_create(driver_files, system_properties, resource_properties, request_properties, associated_topology, openstack_location)
+                execute_response = self.__handle_create(driver_files, system_properties, resource_properties, request_properties, associated_topology, openstack_location, deployment_location)
             elif lifecycle_name.upper() == 'ADOPT':
-                return self.__handle_adopt(driver_files, system_properties, resource_properties, request_properties, associated_topology, openstack_location)
+                execute_response = self.__handle_adopt(driver_files, system_properties, resource_properties, request_properties, associated_topology, openstack_location)
             elif lifecycle_name.upper() == 'DELETE':
-                return self.__handle_delete(driver_files, system_properties, resource_properties, request_properties, associated_topology, openstack_location)
+                execute_response = self.__handle_delete(driver_files, system_properties, resource_properties, request_properties, associated_topology, openstack_location)
             else:
                 raise InvalidRequestError(f'Openstack driver only supports Create, Adopt and Delete transitions, not {lifecycle_name}')
+            if self.stack_watcher is not None:
+                self.stack_watcher.watch(execute_response.request_id, deployment_location)
+            return execute_response
         finally:
             if not self.resource_driver_config.keep_files:
-                try:
-                    logger.debug(f'Attempting to remove driver files at {driver_files.root_path}')
-                    driver_files.remove_all()
-                except Exception as e:
-                    logger.exception('Encountered an error whilst trying to clear out driver files directory {0}: {1}'.format(driver_files.root_path, str(e)))
+                self.__remove_driver_files(driver_files)
             if openstack_location != None:
                 openstack_location.close()
 
-    def __handle_create(self, driver_files, system_properties, resource_properties, request_properties, associated_topology, openstack_location):
+    def __remove_driver_files(self, driver_files):
+        start = time.perf_counter()
+        try:
+            logger.debug(f'Attempting to remove driver files at {driver_files.root_path}')
+            driver_files.remove_all()
+        except Exception as e:
+            logger.exception('Encountered an error whilst trying to clear out driver files directory {0}: {1}'.format(driver_files.root_path, str(e)))
+        finally:
+            get_metrics().observe_driver_files_cleanup(time.perf_counter() - start)
+
+    def __handle_create(self, driver_files, system_properties, resource_properties, request_properties, associated_topology, openstack_location, deployment_location):
+        timer = RequestTimer(CREATE_REQUEST_PREFIX, timings=phase_timings, location=deployment_location.get('name', None))
+        execute_response = None
+        try:
+            with activate_timer(timer):
+                execute_response = self.__create(driver_files, system_properties, resource_properties, request_properties, openstack_location, deployment_location, timer)
+            return execute_response
+        finally:
+            total = timer.finish()
+            metrics = get_metrics()
+            # The template hash is left out of these metrics, as (unlike the phase_timings, served by the timings route of the Openstack Admin API) they are kept for every template ever used
+            for phase, seconds in timer.phases + [('total', total)]:
+                metrics.observe_create_phase(phase, timer.location, seconds)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Create request %s (template %s) took %.1fms: %s', execute_response.request_id if execute_response is not None else None,
+                             timer.template_hash, total * 1000, timer.describe())
+
+    def __create(self, driver_files, system_properties, resource_properties, request_properties, openstack_location, deployment_location, timer):
         heat_driver = openstack_location.heat_driver
         stack_id = None
         if 'stack_id' in resource_properties:
@@ -127,47 +372,60 @@ class ResourceDriverHandler(Service, ResourceDriverHandlerCapability):
             if input_stack_id != None and len(input_stack_id.strip())!=0 and input_stack_id.strip() != "0":
                 try:
                     ##Check for valid stack
-                    heat_driver.get_stack(input_stack_id.strip())
+                    heat_driver.get_stack(input_stack_id.strip(), resolve_outputs=False)
                 except StackNotFoundError as e:
                     raise InfrastructureNotFoundError(str(e)) from e
                 else:
                     stack_id = input_stack_id
         if stack_id is None:
-            kwargs = {}
-            template_type = request_properties.get('template-type', None)
-            if template_type == None:
-                # Try and guess based on files
-                # Heat to take precedence
-                if driver_files.has_file('heat.yaml') or driver_files.has_file('heat.yml'):
-                    template_type = HEAT_TEMPLATE_TYPE
-                elif driver_files.has_file('tosca.yaml') or driver_files.has_file('tosca.yml'):
-                    template_type = TOSCA_TEMPLATE_TYPE
-                else:
-                    # Default to Heat, there are no heat files but we'll let this fail later
-                    template_type = HEAT_TEMPLATE_TYPE
-            else:
-                template_type = template_type.upper()
-            if template_type == TOSCA_TEMPLATE_TYPE.upper():
-                heat_template = self.__get_heat_template_from_tosca(driver_files)
-            elif template_type == HEAT_TEMPLATE_TYPE.upper():
-                heat_template = self.__get_heat_template(driver_files)
-                files = self.__gather_additional_heat_files(driver_files)
-                if len(files) > 0:
-                    kwargs['files'] = files
-            else:
-                raise InvalidDriverFilesError('Cannot create using template of type \'{0}\'. Must be one of: {1}'.format(template_type, [TOSCA_TEMPLATE_TYPE, HEAT_TEMPLATE_TYPE]))
-            heat_input_util = openstack_location.get_heat_input_util()
-            input_props = self.props_merger.merge(resource_properties, system_properties)
-            heat_inputs = heat_input_util.filter_used_properties(heat_template, input_props)
             if 'resourceId' in system_properties and 'resourceName' in system_properties:
                 stack_name = self.stack_name_creator.create(system_properties['resourceId'], system_properties['resourceName'])
+                create_stack = lambda: self.__create_stack(stack_name, driver_files, system_properties, resource_properties, request_properties, openstack_location, timer)
+                if self.create_deduplicator is not None:
+                    # Only names derived from the resource identify the same create, so generated names are never deduplicated
+                    deduplication_key = (fingerprint_deployment_location(deployment_location), stack_name)
+                    stack_id = self.create_deduplicator.create(deduplication_key, heat_driver, stack_name, create_stack)
+                else:
+                    stack_id = create_stack()
             else:
                 stack_name = 's' + str(uuid.uuid4())
-            stack_id = heat_driver.create_stack(stack_name, heat_template, heat_inputs, **kwargs)
+                stack_id = self.__create_stack(stack_name, driver_files, system_properties, resource_properties, request_properties, openstack_location, timer)
         request_id = self.__build_request_id(CREATE_REQUEST_PREFIX, stack_id)
         associated_topology = self.__build_associated_topology_response(stack_id)
         return LifecycleExecuteResponse(request_id, associated_topology=associated_topology)
 
+    def __create_stack(self, stack_name, driver_files, system_properties, resource_properties, request_properties, openstack_location, timer):
+        kwargs = {}
+        template_type = request_properties.get('template-type', None)
+        if template_type == None:
+            # Try and guess based on files
+            # Heat to take precedence
+            if driver_files.has_file('heat.yaml') or driver_files.has_file('heat.yml'):
+                template_type = HEAT_TEMPLATE_TYPE
+            elif driver_files.has_file('tosca.yaml') or driver_files.has_file('tosca.yml'):
+                template_type = TOSCA_TEMPLATE_TYPE
+            else:
+                # Default to Heat, there are no heat files but we'll let this fail later
+                template_type = HEAT_TEMPLATE_TYPE
+        else:
+            template_type = template_type.upper()
+        if template_type == TOSCA_TEMPLATE_TYPE.upper():
+            heat_template = self.__get_heat_template_from_tosca(driver_files, timer)
+        elif template_type == HEAT_TEMPLATE_TYPE.upper():
+            heat_template = self.__get_heat_template(driver_files, timer)
+            with timed_phase('gather_files'):
+                files = self.__gather_additional_heat_files(driver_files)
+            if len(files) > 0:
+                kwargs['files'] = files
+        else:
+            raise InvalidDriverFilesError('Cannot create using template of type \'{0}\'. Must be one of: {1}'.format(template_type, [TOSCA_TEMPLATE_TYPE, HEAT_TEMPLATE_TYPE]))
+        heat_input_util = openstack_location.get_heat_input_util()
+        input_props = self.props_merger.merge(resource_properties, system_properties)
+        with timed_phase('filter_properties'):
+            heat_inputs = heat_input_util.filter_used_properties(heat_template, input_props)
+        with timed_phase('create_stack'):
+            return openstack_location.heat_driver.create_stack(stack_name, heat_template, heat_inputs, **kwargs)
+
     def __handle_adopt(self, driver_files, system_properties, resource_properties, request_properties, associated_topology, openstack_location):        
         stack_resource_entry = None
         if (associated_topology is None or len(associated_topology.to_dict()) != 1):
@@ -188,7 +446,7 @@ class ResourceDriverHandler(Service, ResourceDriverHandlerCapability):
         if stack_id != None and len(stack_id.strip())!=0 and stack_id.strip() != "0":
             try:
                 # Check for valid stack
-                stack_to_adopt = heat_driver.get_stack(stack_id.strip())
+                stack_to_adopt = heat_driver.get_stack(stack_id.strip(), resolve_outputs=False)
             except StackNotFoundError as e:
                 raise InfrastructureNotFoundError(str(e)) from e
         else:
@@ -223,6 +481,11 @@ class ResourceDriverHandler(Service, ResourceDriverHandlerCapability):
         return LifecycleExecuteResponse(request_id)
 
     def find_reference(self, instance_name, driver_files, deployment_location):
+        with get_tracer().span('find_reference', {'ovd.instance_name': instance_name, 'ovd.location': self.__location_name(deployment_location)}), \
+                get_metrics().time_lifecycle('find_reference'):
+            return self.__find_reference(instance_name, driver_files, deployment_location)
+
+    def __find_reference(self, instance_name, driver_files, deployment_location):
         openstack_location = None
         try:
             openstack_location = self.location_translator.from_deployment_location(deployment_location)
@@ -238,14 +501,12 @@ class ResourceDriverHandler(Service, ResourceDriverHandlerCapability):
                 pass  # Return empty result
             except ToscaValidationError as e:
                 raise InvalidDriverFilesError(str(e)) from e
+            except (TranslationBusyError, TranslationTimeoutError, TranslationWorkerError) as e:
+                raise TemporaryResourceDriverError(str(e)) from e
             return FindReferenceResponse(find_result)
         finally:
             if not self.resource_driver_config.keep_files:
-                try:
-                    logger.debug(f'Attempting to remove driver files at {driver_files.root_path}')
-                    driver_files.remove_all()
-                except Exception as e:
-                    logger.exception('Encountered an error whilst trying to clear out driver files directory {0}: {1}'.format(driver_files.root_path, str(e)))
+                self.__remove_driver_files(driver_files)
             if openstack_location != None:
                 openstack_location.close()
 
@@ -282,31 +543,39 @@ class ResourceDriverHandler(Service, ResourceDriverHandlerCapability):
             template = f.read()
         return template
 
-    def __get_heat_template_from_tosca(self, driver_files):
+    def __get_heat_template_from_tosca(self, driver_files, timer=None):
         if driver_files.has_file('tosca.yaml'):
             template_path = driver_files.get_file_path('tosca.yaml')
         elif driver_files.has_file('tosca.yml'):
             template_path = driver_files.get_file_path('tosca.yml')
         else:
             raise InvalidDriverFilesError('Missing \'tosca.yaml\' or \'tosca.yml\' file')
-        with open(template_path, 'r') as f:
-            template = f.read()
+        with timed_phase('read_files'):
+            with open(template_path, 'r') as f:
+                template = f.read()
+        if timer is not None:
+            timer.template_hash = template_hash(template)
         try:
             heat_template = self.heat_translator.generate_heat_template(template, template_path=template_path)
         except ToscaValidationError as e:
             raise InvalidDriverFilesError(str(e)) from e
+        except (TranslationBusyError, TranslationTimeoutError, TranslationWorkerError) as e:
+            raise TemporaryResourceDriverError(str(e)) from e
         logger.debug('Translated Tosca template:\n%s\nto Heat template:\n%s', template, heat_template)
         return heat_template
 
-    def __get_heat_template(self, driver_files):
+    def __get_heat_template(self, driver_files, timer=None):
         if driver_files.has_file('heat.yaml'):
             template_path = driver_files.get_file_path('heat.yaml')
         elif driver_files.has_file('heat.yml'):
             template_path = driver_files.get_file_path('heat.yml')
         else:
             raise InvalidDriverFilesError('Missing \'heat.yaml\' or \'heat.yml\' file')
-        with open(template_path, 'r') as f:
-            heat_template = f.read()
+        with timed_phase('read_files'):
+            with open(template_path, 'r') as f:
+                heat_template = f.read()
+        if timer is not None:
+            timer.template_hash = template_hash(heat_template)
         return heat_template
 
     def __gather_additional_heat_files(self, driver_files):
@@ -324,22 +593,117 @@ class ResourceDriverHandler(Service, ResourceDriverHandlerCapability):
         return files
 
     def get_lifecycle_execution(self, request_id, deployment_location):
+        with get_tracer().span('get_lifecycle_execution', {'ovd.request_id': request_id, 'ovd.location': self.__location_name(deployment_location)}), \
+                get_metrics().time_lifecycle('poll'):
+            return self.__get_reported_lifecycle_execution(request_id, deployment_location)
+
+    def __get_reported_lifecycle_execution(self, request_id, deployment_location):
+        # Executions are only requested by the lifecycle monitoring service, so reporting a request the watcher has already sent the result of
+        # as not found stops the monitoring service sending it again
+        if self.stack_watcher is not None:
+            if self.stack_watcher.is_reported(request_id):
+                raise RequestNotFoundError(f'Result of request {request_id} has already been sent')
+            if self.stack_watcher.is_watched(request_id):
+                # A watcher (possibly of another process) is checking the stack and will send the result, so Heat need not be asked
+                return LifecycleExecution(request_id, STATUS_IN_PROGRESS)
+        execution = self.__get_lifecycle_execution(request_id, deployment_location)
+        if self.stack_watcher is not None and execution.status in [STATUS_COMPLETE, STATUS_FAILED]:
+            if not self.stack_watcher.claim(request_id):
+                raise RequestNotFoundError(f'Result of request {request_id} has already been sent')
+        return execution
+
+    def __poll_watched_requests(self, deployment_location, request_ids):
         openstack_location = self.location_translator.from_deployment_location(deployment_location)
-        heat_driver = openstack_location.heat_driver
-        request_type, stack_id, operation_id = self.__split_request_id(request_id)
         try:
-            stack = heat_driver.get_stack(stack_id)            
-        except StackNotFoundError as e:
-            logger.debug('Stack not found: %s', stack_id)
-            if request_type == DELETE_REQUEST_PREFIX:
-                logger.debug('Stack not found on delete request, returning task as successful: %s', stack_id)
-                return LifecycleExecution(request_id, STATUS_COMPLETE)
-            else:
-                raise InfrastructureNotFoundError(str(e)) from e
-        logger.debug('Retrieved stack: %s', stack)
-        return self.__build_execution_response(stack, request_id)
+            stack_ids = {request_id: self.__split_request_id(request_id)[1] for request_id in request_ids}
+            stacks = {}
+            for request_id, stack_id in stack_ids.items():
+                notified_stack = self.__get_notified_stack(stack_id, request_id)
+                if notified_stack is not None:
+                    stacks[stack_id] = notified_stack
+            unknown_stack_ids = list(set(stack_id for stack_id in stack_ids.values() if stack_id not in stacks))
+            if len(unknown_stack_ids) > 0:
+                stacks.update({stack['id']: stack for stack in openstack_location.heat_driver.get_stacks_by_ids(unknown_stack_ids)})
+            executions = {}
+            for request_id, stack_id in stack_ids.items():
+                try:
+                    if stack_id in stacks:
+                        executions[request_id] = self.__build_execution_response(stacks[stack_id], request_id, openstack_location)
+                    else:
+                        # Stacks may be missing from a list (e.g. deleted stacks), so check them individually
+                        executions[request_id] = self.__get_lifecycle_execution(request_id, deployment_location)
+                except Exception as e:
+                    # Left to the lifecycle monitoring service
+                    logger.warning('Failed to check status of watched request {0}: {1}'.format(request_id, str(e)))
+            return executions
+        finally:
+            openstack_location.close()
+
+    def __get_lifecycle_execution(self, request_id, deployment_location):
+        if self.terminal_executions is None:
+            return self.__retrieve_lifecycle_execution(request_id, deployment_location)
+        cache_key = (deployment_location.get('name'), request_id)
+        execution = self.terminal_executions.get(cache_key)
+        if execution is not None:
+            logger.debug('Using cached result of completed execution: %s', request_id)
+            return execution
+        execution = self.__retrieve_lifecycle_execution(request_id, deployment_location)
+        if execution.status in [STATUS_COMPLETE, STATUS_FAILED]:
+            self.terminal_executions.put(cache_key, execution)
+        return execution
+
+    def __retrieve_lifecycle_execution(self, request_id, deployment_location):
+        openstack_location = self.location_translator.from_deployment_location(deployment_location)
+        try:
+            request_type, stack_id, operation_id = self.__split_request_id(request_id)
+            try:
+                stack = self.__get_stack_status(openstack_location, stack_id, request_id)
+            except StackNotFoundError as e:
+                logger.debug('Stack not found: %s', stack_id)
+                if request_type == DELETE_REQUEST_PREFIX:
+                    logger.debug('Stack not found on delete request, returning task as successful: %s', stack_id)
+                    return LifecycleExecution(request_id, STATUS_COMPLETE)
+                else:
+                    raise InfrastructureNotFoundError(str(e)) from e
+            logger.debug('Retrieved stack: %s', stack)
+            return self.__build_execution_response(stack, request_id, openstack_location)
+        finally:
+            openstack_location.close()
 
-    def __build_execution_response(self, stack, request_id):
+    def __get_notified_stack(self, stack_id, request_id):
+        if self.stack_notifications is None:
+            return None
+        request_type = request_id.split(REQUEST_ID_SEPARATOR)[0]
+        if request_type == CREATE_REQUEST_PREFIX:
+            status_prefixes = ['CREATE_', 'ADOPT_']
+        elif request_type == DELETE_REQUEST_PREFIX:
+            status_prefixes = ['DELETE_']
+        else:
+            # Adopted stacks already exist, so there is no action to be notified of
+            return None
+        stack = self.stack_notifications.get_stack(stack_id, status_prefixes=status_prefixes)
+        if stack is not None:
+            logger.debug('Using notified status of stack %s: %s', stack_id, stack['stack_status'])
+        return stack
+
+    def __get_stack_status(self, openstack_location, stack_id, request_id):
+        notified_stack = self.__get_notified_stack(stack_id, request_id)
+        if notified_stack is not None:
+            return notified_stack
+        # Stacks are retrieved without outputs whilst polling for status, outputs are only retrieved once the stack has completed
+        if self.stack_event_tracker is not None:
+            return self.stack_event_tracker.get_stack((openstack_location.name, request_id), openstack_location.heat_driver, stack_id)
+        if self.stack_status_cache is not None:
+            return self.stack_status_cache.get_stack((openstack_location.name, stack_id), lambda: self.__retrieve_stack_status(openstack_location, stack_id))
+        return self.__retrieve_stack_status(openstack_location, stack_id)
+
+    def __retrieve_stack_status(self, openstack_location, stack_id):
+        heat_driver = openstack_location.heat_driver
+        if self.stack_poller is not None:
+            return self.stack_poller.get_stack(openstack_location.name, heat_driver, stack_id)
+        return heat_driver.get_stack(stack_id, resolve_outputs=False)
+
+    def __build_execution_response(self, stack, request_id, openstack_location):
         request_type, stack_id, operation_id = self.__split_request_id(request_id)
         stack_status = stack.get('stack_status', None)
         failure_details = None
@@ -358,8 +722,19 @@ class ResourceDriverHandler(Service, ResourceDriverHandlerCapability):
         outputs = None
         associated_topology = None
         if request_type == CREATE_REQUEST_PREFIX or request_type == ADOPT_REQUEST_PREFIX:
-            outputs_from_stack = stack.get('outputs', [])
-            outputs = self.__translate_outputs_to_values_dict(outputs_from_stack)                               
+            if status == STATUS_COMPLETE:
+                logger.debug('Retrieving outputs of completed stack: %s', stack_id)
+                try:
+                    stack_with_outputs = openstack_location.heat_driver.get_stack(stack_id)
+                except StackNotFoundError as e:
+                    # The stack may have been deleted since its status was retrieved
+                    logger.debug('Stack not found whilst retrieving outputs: %s', stack_id)
+                    raise InfrastructureNotFoundError(str(e)) from e
+                outputs_from_stack = stack_with_outputs.get('outputs', [])
+                outputs = self.__translate_outputs_to_values_dict(outputs_from_stack)                               
+        if request_type in [CREATE_REQUEST_PREFIX, DELETE_REQUEST_PREFIX] and status in [STATUS_COMPLETE, STATUS_FAILED]:
+            # The stack may have added or removed networks, so later lookups should not be answered from the cache
+            openstack_location.invalidate_neutron_cache()
         return LifecycleExecution(request_id, status, failure_details=failure_details, outputs=outputs)
 
     def __determine_create_status(self, request_id, stack_id, stack_status):
@@ -1,12 +1,21 @@
 import logging
 from ignition.service.framework import Capability, interface, Service
+from ignition.service.config import ConfigurationPropertiesGroup
 from toscaparser.tosca_template import ToscaTemplate
 from translator.hot.tosca_translator import TOSCATranslator
 from osvimdriver.tosca.discover import ToscaTopologySearchEngine, NotDiscoveredError
+from osvimdriver.tosca.cache import TranslationCache, translation_cache_key
+from osvimdriver.store import get_shared_store
+from osvimdriver.tosca.loader import install_definitions_loader
+from osvimdriver.tosca.dumper import install_heat_dumper
+from osvimdriver.tosca.executor import get_shared_executor, TranslationBusyError, TranslationTimeoutError, TranslationWorkerError
 import osvimdriver.tosca.definitions as tosca_definitions
 import toscaparser.common.exception as toscaparser_exceptions
-import yaml
+import osvimdriver.yamlutil as yamlutil
+from osvimdriver.timing import RequestTimer, activate_timer, active_timer, timed_phase
+from osvimdriver.tracing import get_tracer
 import os
+import sqlite3
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +23,54 @@ class ToscaValidationError(Exception):
     pass
 
 
+class TranslationCacheProperties(ConfigurationPropertiesGroup, Service, Capability):
+
+    def __init__(self):
+        super().__init__('translation_cache')
+        self.enabled = True
+        self.max_size = 100
+        self.directory = None
+
+
+class PersistentStoreProperties(ConfigurationPropertiesGroup, Service, Capability):
+
+    def __init__(self):
+        super().__init__('persistent_store')
+        self.enabled = False
+        self.path = '/var/ovd/cache/ovd_cache.db'
+        self.max_size_mb = 256
+        self.seed_path = None
+
+
+class TranslationPoolProperties(ConfigurationPropertiesGroup, Service, Capability):
+
+    def __init__(self):
+        super().__init__('translation_pool')
+        self.enabled = False
+        self.max_workers = 2
+        self.timeout_seconds = 300
+        self.max_queue_depth = 10
+        self.memory_limit_mb = 0
+
+
+def open_translation_executor(translation_pool_config):
+    if not translation_pool_config.enabled:
+        return None
+    return get_shared_executor(max_workers=translation_pool_config.max_workers, timeout_seconds=translation_pool_config.timeout_seconds,
+                               max_queue_depth=translation_pool_config.max_queue_depth, memory_limit_mb=translation_pool_config.memory_limit_mb)
+
+
+def open_persistent_store(persistent_store_config):
+    if not persistent_store_config.enabled:
+        return None
+    try:
+        return get_shared_store(persistent_store_config.path, max_size_bytes=persistent_store_config.max_size_mb * 1024 * 1024,
+                                seed_path=persistent_store_config.seed_path)
+    except (OSError, sqlite3.Error) as e:
+        logger.exception('Failed to open persistent store at {0}, continuing without it: {1}'.format(persistent_store_config.path, str(e)))
+        return None
+
+
 class ToscaParserCapability(Capability):
 
     @interface
@@ -23,6 +80,9 @@ class ToscaParserCapability(Capability):
 
 class ToscaParserService(Service, ToscaParserCapability):
 
+    def __init__(self):
+        install_definitions_loader()
+
     def parse_tosca_str(self, tosca_template_str, inputs=None, template_path=None):
         tosca_template = self.__load_yaml(tosca_template_str)
         if template_path is not None:
@@ -34,7 +94,7 @@ class ToscaParserService(Service, ToscaParserCapability):
             raise ToscaValidationError(str(e)) from e
 
     def __load_yaml(self, template_str):
-        return yaml.safe_load(template_str)
+        return yamlutil.safe_load(template_str)
 
     def __convert_relative_imports(self, tosca_template_tpl, template_path):
         if 'imports' in tosca_template_tpl:
@@ -84,15 +144,67 @@ class ToscaHeatTranslatorService(Service, ToscaHeatTranslatorCapability):
         if 'tosca_parser_service' not in kwargs:
             raise ValueError('No tosca_parser_service instance provided')
         self.tosca_parser_service = kwargs.get('tosca_parser_service')
+        install_heat_dumper()
+        if 'translation_cache_config' in kwargs:
+            self.translation_cache_config = kwargs.get('translation_cache_config')
+        else:
+            self.translation_cache_config = TranslationCacheProperties()
+        if 'persistent_store_config' in kwargs:
+            self.persistent_store_config = kwargs.get('persistent_store_config')
+        else:
+            self.persistent_store_config = PersistentStoreProperties()
+        if 'translation_pool_config' in kwargs:
+            self.translation_pool_config = kwargs.get('translation_pool_config')
+        else:
+            self.translation_pool_config = TranslationPoolProperties()
+        self.translation_executor = open_translation_executor(self.translation_pool_config)
+        if self.translation_cache_config.enabled:
+            self.translation_cache = TranslationCache(max_size=self.translation_cache_config.max_size,
+                                                      directory=self.translation_cache_config.directory,
+                                                      store=open_persistent_store(self.persistent_store_config))
+        else:
+            self.translation_cache = None
 
     def generate_heat_template(self, tosca_template_str, template_path=None):
         if tosca_template_str is None:
             raise ValueError('Must provide tosca_template_str parameter')
-        tosca = self.tosca_parser_service.parse_tosca_str(tosca_template_str, template_path=template_path)
+        if self.translation_cache is None:
+            return self.__run_translation(tosca_template_str, template_path)
+        cache_key = translation_cache_key(tosca_template_str, template_path=template_path)
+        if cache_key is None:
+            return self.__run_translation(tosca_template_str, template_path)
+        heat_result = self.translation_cache.get(cache_key)
+        if heat_result is not None:
+            logger.debug('Using cached translation {0}'.format(cache_key))
+            return heat_result
+        heat_result = self.__run_translation(tosca_template_str, template_path)
+        self.translation_cache.put(cache_key, heat_result)
+        return heat_result
+
+    def __run_translation(self, tosca_template_str, template_path):
+        if self.translation_executor is not None:
+            # Workers do not trace, so the parse and translate phases are not separated in the trace
+            with get_tracer().span('tosca.translation', {'ovd.translation_pool': True}):
+                return self.__run_translation_in_worker(tosca_template_str, template_path)
+        return self.__translate(tosca_template_str, template_path)
+
+    def __run_translation_in_worker(self, tosca_template_str, template_path):
+        timer = active_timer()
+        if timer is None:
+            return self.translation_executor.run(translate_in_worker, tosca_template_str, template_path)
+        heat_result, phases = self.translation_executor.run(translate_in_worker, tosca_template_str, template_path, True)
+        timer.add(phases)
+        return heat_result
+
+    def __translate(self, tosca_template_str, template_path):
+        tracer = get_tracer()
+        with tracer.span('tosca.parse'), timed_phase('parse'):
+            tosca = self.tosca_parser_service.parse_tosca_str(tosca_template_str, template_path=template_path)
         heat_translator = TOSCATranslator(tosca, {})
         # heat translator returns translated heat in a dict
         translation_dict_key = 'main_hot'
-        heat_translations = heat_translator.translate_to_yaml_files_dict(translation_dict_key)
+        with tracer.span('tosca.translate'), timed_phase('translate'):
+            heat_translations = heat_translator.translate_to_yaml_files_dict(translation_dict_key)
         heat_result = heat_translations[translation_dict_key]
         logger.debug('Translated Heat: {0}'.format(heat_result))
         return heat_result
@@ -111,11 +223,51 @@ class ToscaTopologyDiscoveryService(Service, ToscaTopologyDiscoveryCapability):
         if 'tosca_parser_service' not in kwargs:
             raise ValueError('No tosca_parser_service instance provided')
         self.tosca_parser_service = kwargs.get('tosca_parser_service')
+        if 'translation_pool_config' in kwargs:
+            self.translation_pool_config = kwargs.get('translation_pool_config')
+        else:
+            self.translation_pool_config = TranslationPoolProperties()
+        self.translation_executor = open_translation_executor(self.translation_pool_config)
 
     def discover(self, tosca_template_str, openstack_location, inputs=None):
         if tosca_template_str is None:
             raise ValueError('Must provide tosca_template_str parameter')
         if openstack_location is None:
             raise ValueError('Must provide openstack_location parameter')
-        tosca = self.tosca_parser_service.parse_tosca_str(tosca_template_str, inputs)
+        tosca = self.__parse(tosca_template_str, inputs)
         return ToscaTopologySearchEngine(tosca, openstack_location).discover()
+
+    def __parse(self, tosca_template_str, inputs):
+        # Not cached, as the parsed template is bound to the inputs of one instance (and the imported type definitions are cached by the loader)
+        with get_tracer().span('tosca.parse', {'ovd.translation_pool': self.translation_executor is not None}):
+            if self.translation_executor is not None:
+                return self.translation_executor.run(parse_in_worker, tosca_template_str, inputs)
+            return self.tosca_parser_service.parse_tosca_str(tosca_template_str, inputs)
+
+
+# Services used by translation pool workers (created on first use in each worker process)
+_worker_services = {}
+
+
+def _get_worker_parser():
+    if 'parser' not in _worker_services:
+        _worker_services['parser'] = ToscaParserService()
+    return _worker_services['parser']
+
+
+def translate_in_worker(tosca_template_str, template_path=None, time_phases=False):
+    if 'translator' not in _worker_services:
+        translation_cache_config = TranslationCacheProperties()
+        # Translations are cached by the requesting process
+        translation_cache_config.enabled = False
+        _worker_services['translator'] = ToscaHeatTranslatorService(tosca_parser_service=_get_worker_parser(), translation_cache_config=translation_cache_config)
+    if not time_phases:
+        return _worker_services['translator'].generate_heat_template(tosca_template_str, template_path=template_path)
+    # Phases are timed here and returned for the requesting process to record
+    with activate_timer(RequestTimer('translation')) as timer:
+        heat_result = _worker_services['translator'].generate_heat_template(tosca_template_str, template_path=template_path)
+    return heat_result, timer.phases
+
+
+def parse_in_worker(tosca_template_str, inputs=None):
+    return _get_worker_parser().parse_tosca_str(tosca_template_str, inputs)
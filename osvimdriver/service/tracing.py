@@ -0,0 +1,44 @@
+import logging
+from ignition.service.config import ConfigurationPropertiesGroup
+from osvimdriver.tracing import OpenTelemetryTracer, get_tracer, set_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class TracingProperties(ConfigurationPropertiesGroup):
+
+    def __init__(self):
+        super().__init__('tracing')
+        self.enabled = False
+        self.service_name = 'os-vim-driver'
+        self.sample_ratio = 0.1
+        self.exporter = None
+        self.endpoint = None
+
+
+def enable_tracing(tracing_properties):
+    """Starts creating trace spans in this process, with the OpenTelemetry SDK (installed with the "tracing" extra of this package)"""
+    if get_tracer().enabled:
+        return
+    if not 0 <= tracing_properties.sample_ratio <= 1:
+        raise ValueError('tracing.sample_ratio must be between 0 and 1 but was {0}'.format(tracing_properties.sample_ratio))
+    try:
+        tracer = OpenTelemetryTracer(service_name=tracing_properties.service_name, sample_ratio=tracing_properties.sample_ratio,
+                                     exporter=tracing_properties.exporter, endpoint=tracing_properties.endpoint)
+    except ImportError as e:
+        raise ValueError('tracing.enabled is True but the OpenTelemetry SDK is not installed (install os-vim-driver[tracing])') from e
+    set_tracer(tracer)
+
+
+class TracingServiceConfigurator():
+
+    def __init__(self):
+        pass
+
+    def configure(self, configuration, service_register):
+        tracing_properties = configuration.property_groups.get_property_group(TracingProperties)
+        if tracing_properties.enabled is True:
+            logger.debug('Configuring Tracing')
+            enable_tracing(tracing_properties)
+        else:
+            logger.debug('Disabled: Tracing')
@@ -0,0 +1,311 @@
+import os
+import time
+import errno
+import hashlib
+import logging
+import threading
+import concurrent.futures
+from ignition.model.lifecycle import STATUS_COMPLETE, STATUS_FAILED
+from osvimdriver.cache import LRUCache
+from osvimdriver.openstack.pool import fingerprint_deployment_location
+
+logger = logging.getLogger(__name__)
+
+
+class WatchedRequest():
+
+    def __init__(self, request_id, deployment_location, interval, now):
+        self.request_id = request_id
+        self.deployment_location = deployment_location
+        self.location_key = fingerprint_deployment_location(deployment_location)
+        self.interval = interval
+        self.registered = now
+        self.due = now + interval
+        self.polling = False
+
+
+class InProcessWatchState():
+    """Which requests are watched and which have had their result sent, known only to this process (so only suitable for a single driver process)"""
+
+    def __init__(self, max_size=10000, max_age_seconds=7200, clock=time.monotonic):
+        self.clock = clock
+        self.__watched = {}
+        self.__reported = LRUCache(max_size=max_size, max_age_seconds=max_age_seconds, clock=clock)
+        self.__lock = threading.Lock()
+
+    def mark_watched(self, request_id):
+        with self.__lock:
+            self.__watched[request_id] = self.clock()
+
+    def unmark_watched(self, request_id):
+        with self.__lock:
+            self.__watched.pop(request_id, None)
+
+    def is_watched(self, request_id, heartbeat_timeout_seconds):
+        with self.__lock:
+            marked = self.__watched.get(request_id, None)
+        return marked is not None and self.clock() - marked < heartbeat_timeout_seconds
+
+    def claim(self, request_id):
+        with self.__lock:
+            if request_id in self.__reported:
+                return False
+            self.__reported.put(request_id, True)
+            return True
+
+    def release(self, request_id):
+        self.__reported.pop(request_id)
+
+    def is_reported(self, request_id):
+        return request_id in self.__reported
+
+
+class SharedWatchState():
+    """
+    Which requests are watched and which have had their result sent, kept as files in a directory shared by every driver process
+    (e.g. all gunicorn workers in a pod), so a result is sent once whichever process watches the request or is asked for it.
+
+    A request is claimed by creating its file in "reported" exclusively, which only one process can do. A watched request has a file in
+    "watching" which the watching process touches each time it checks the stack, so requests of a process which has stopped are seen as
+    no longer watched once heartbeat_timeout_seconds pass. Files older than max_age_seconds are removed.
+    """
+
+    def __init__(self, directory, max_age_seconds=7200, cleanup_interval_seconds=300, clock=time.time):
+        if directory is None:
+            raise ValueError('directory must be provided')
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self.clock = clock
+        self.__watching_dir = os.path.join(directory, 'watching')
+        self.__reported_dir = os.path.join(directory, 'reported')
+        os.makedirs(self.__watching_dir, mode=0o700, exist_ok=True)
+        os.makedirs(self.__reported_dir, mode=0o700, exist_ok=True)
+        self.__last_cleanup = None
+        self.__lock = threading.Lock()
+
+    def mark_watched(self, request_id):
+        path = self.__path(self.__watching_dir, request_id)
+        try:
+            with open(path, 'a'):
+                os.utime(path, (self.clock(), self.clock()))
+        except OSError as e:
+            logger.warning('Failed to mark request {0} as watched: {1}'.format(request_id, str(e)))
+
+    def unmark_watched(self, request_id):
+        self.__remove(self.__path(self.__watching_dir, request_id))
+
+    def is_watched(self, request_id, heartbeat_timeout_seconds):
+        try:
+            return self.clock() - os.path.getmtime(self.__path(self.__watching_dir, request_id)) < heartbeat_timeout_seconds
+        except OSError:
+            return False
+
+    def claim(self, request_id):
+        self.__cleanup()
+        try:
+            os.close(os.open(self.__path(self.__reported_dir, request_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                return False
+            # Sending the result twice is better than not at all
+            logger.warning('Failed to claim request {0}: {1}'.format(request_id, str(e)))
+        self.unmark_watched(request_id)
+        return True
+
+    def release(self, request_id):
+        self.__remove(self.__path(self.__reported_dir, request_id))
+
+    def is_reported(self, request_id):
+        return os.path.exists(self.__path(self.__reported_dir, request_id))
+
+    def __path(self, directory, request_id):
+        # Request ids include characters not allowed in file names on every platform
+        return os.path.join(directory, hashlib.sha256(request_id.encode('utf-8')).hexdigest())
+
+    def __remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning('Failed to remove {0}: {1}'.format(path, str(e)))
+
+    def __cleanup(self):
+        now = self.clock()
+        with self.__lock:
+            if self.__last_cleanup is not None and now - self.__last_cleanup < self.cleanup_interval_seconds:
+                return
+            self.__last_cleanup = now
+        for directory in [self.__watching_dir, self.__reported_dir]:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if now - entry.stat().st_mtime > self.max_age_seconds:
+                                os.remove(entry.path)
+                        except OSError:
+                            pass
+            except OSError as e:
+                logger.warning('Failed to remove expired entries from {0}: {1}'.format(directory, str(e)))
+
+
+class StackWatcher():
+    """
+    Watches the stacks of requests in the background and sends the result of each request (with send_execution) as soon as it has
+    completed or failed, rather than waiting for the next poll of get_lifecycle_execution.
+
+    Requests due to be checked are grouped by deployment location and each group is checked in one call to
+    poll_requests(deployment_location, request_ids), on a pool of max_workers threads (requests for the same location due within
+    min_interval_seconds are included early). poll_requests returns the LifecycleExecution of each request it could check;
+    requests missing from the result are no longer watched. A request is first checked
+    min_interval_seconds after it was watched, with the interval growing by backoff_multiplier (up to max_interval_seconds)
+    each time it is still in progress. Requests are watched for up to max_watch_seconds, at most max_watched at a time.
+
+    The result of a request is only sent once: the first of the watcher and any other caller to claim() a request wins. Claims are recorded
+    in state, an InProcessWatchState by default or a SharedWatchState to share them (and which requests are watched) between processes.
+    A request counts as watched (see is_watched) until its result is claimed or it is no longer checked, which is noticed after
+    heartbeat_timeout_seconds (by default three times max_interval_seconds) if the watching process stops.
+    """
+
+    def __init__(self, poll_requests, send_execution, max_workers=4, min_interval_seconds=2, max_interval_seconds=30, backoff_multiplier=1.5,
+                 max_watched=1000, max_watch_seconds=7200, state=None, heartbeat_timeout_seconds=None, clock=time.monotonic):
+        if max_workers is None or max_workers < 1:
+            raise ValueError('max_workers must be a positive integer')
+        self.poll_requests = poll_requests
+        self.send_execution = send_execution
+        self.max_workers = max_workers
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.backoff_multiplier = backoff_multiplier
+        self.max_watched = max_watched
+        self.max_watch_seconds = max_watch_seconds
+        self.clock = clock
+        self.__watched = {}
+        self.state = state if state is not None else InProcessWatchState(max_size=max(max_watched, 1) * 10, max_age_seconds=max_watch_seconds)
+        self.heartbeat_timeout_seconds = heartbeat_timeout_seconds if heartbeat_timeout_seconds is not None else max_interval_seconds * 3
+        self.__condition = threading.Condition()
+        self.__executor = None
+        self.__scheduler = None
+        self.__stopped = False
+
+    def watch(self, request_id, deployment_location):
+        with self.__condition:
+            if self.__stopped:
+                return False
+            if len(self.__watched) >= self.max_watched:
+                logger.debug('Not watching request %s as %s requests are already watched', request_id, len(self.__watched))
+                return False
+            self.__watched[request_id] = WatchedRequest(request_id, deployment_location, self.min_interval_seconds, self.clock())
+            self.state.mark_watched(request_id)
+            self.__start()
+            self.__condition.notify()
+        return True
+
+    def claim(self, request_id):
+        """Records that the result of a request is being sent, returns False if it already has been"""
+        with self.__condition:
+            self.__watched.pop(request_id, None)
+        return self.state.claim(request_id)
+
+    def is_reported(self, request_id):
+        return self.state.is_reported(request_id)
+
+    def is_watched(self, request_id):
+        """Returns True if a watcher (of any process sharing the state) is checking the stack of a request, so will send its result"""
+        return self.state.is_watched(request_id, self.heartbeat_timeout_seconds)
+
+    def watched_count(self):
+        with self.__condition:
+            return len(self.__watched)
+
+    def shutdown(self):
+        with self.__condition:
+            self.__stopped = True
+            for request_id in self.__watched:
+                self.state.unmark_watched(request_id)
+            self.__watched.clear()
+            self.__condition.notify()
+            executor = self.__executor
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __start(self):
+        # Threads are only started once there is something to watch, so processes which never create a stack do not run them
+        if self.__scheduler is None:
+            self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='stack-watcher')
+            self.__scheduler = threading.Thread(target=self.__schedule, name='stack-watcher-scheduler', daemon=True)
+            self.__scheduler.start()
+
+    def __schedule(self):
+        while True:
+            with self.__condition:
+                if self.__stopped:
+                    return
+                now = self.clock()
+                waiting = [request for request in self.__watched.values() if not request.polling]
+                due = [request for request in waiting if request.due <= now]
+                if len(due) == 0:
+                    next_due = min([request.due for request in waiting], default=None)
+                    self.__condition.wait(timeout=None if next_due is None else next_due - now)
+                    continue
+                groups = {}
+                for request in due:
+                    groups.setdefault(request.location_key, [])
+                # Requests for the same location due soon are checked early, so they join the batch rather than needing another
+                for request in waiting:
+                    if request.location_key in groups and request.due <= now + self.min_interval_seconds:
+                        request.polling = True
+                        groups[request.location_key].append(request)
+            for requests in groups.values():
+                self.__executor.submit(self.__poll, requests)
+
+    def __poll(self, requests):
+        deployment_location = requests[0].deployment_location
+        request_ids = [request.request_id for request in requests]
+        try:
+            executions = self.poll_requests(deployment_location, request_ids)
+        except Exception as e:
+            logger.warning('Failed to check status of watched requests {0}: {1}'.format(request_ids, str(e)))
+            executions = None
+        for request in requests:
+            execution = executions.get(request.request_id, None) if executions is not None else None
+            if executions is not None and execution is None:
+                self.__forget(request)
+            elif execution is not None and execution.status in [STATUS_COMPLETE, STATUS_FAILED]:
+                self.__report(execution)
+            else:
+                self.__reschedule(request)
+
+    def __report(self, execution):
+        if not self.claim(execution.request_id):
+            return
+        logger.debug('Sending result of watched request %s: %s', execution.request_id, execution.status)
+        try:
+            self.send_execution(execution)
+        except Exception as e:
+            logger.exception('Failed to send result of watched request {0}: {1}'.format(execution.request_id, str(e)))
+            # Leave the result to be sent by the next caller
+            self.state.release(execution.request_id)
+
+    def __reschedule(self, request):
+        with self.__condition:
+            if self.__watched.get(request.request_id, None) is not request:
+                return
+            now = self.clock()
+            if now - request.registered >= self.max_watch_seconds:
+                logger.debug('No longer watching request %s after %s seconds', request.request_id, self.max_watch_seconds)
+                del self.__watched[request.request_id]
+                self.state.unmark_watched(request.request_id)
+                return
+            self.state.mark_watched(request.request_id)
+            request.interval = min(request.interval * self.backoff_multiplier, self.max_interval_seconds)
+            request.due = now + request.interval
+            request.polling = False
+            self.__condition.notify()
+
+    def __forget(self, request):
+        with self.__condition:
+            if self.__watched.get(request.request_id, None) is request:
+                del self.__watched[request.request_id]
+                self.state.unmark_watched(request.request_id)
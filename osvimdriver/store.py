@@ -0,0 +1,169 @@
+import os
+import time
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS seeds (
+    seed TEXT PRIMARY KEY
+);
+'''
+
+
+class PersistentStore():
+    """
+    Size bounded key/value store kept in a sqlite database, so entries are shared by every process using the same file
+    (e.g. all gunicorn workers in a pod) and survive restarts. The database uses write-ahead logging so readers do not block writers.
+
+    Entries are grouped by namespace. Once the total size of the values exceeds max_size_bytes, the least recently read entries are removed.
+    If seed_path refers to another database created by this class (e.g. on a mounted volume), entries from it are copied in
+    (without replacing existing entries) the first time the store is opened with that seed.
+
+    Failures to read or write the database are logged and treated as a missing entry, so the store is never the cause of a failed request.
+    """
+
+    def __init__(self, path, max_size_bytes=268435456, seed_path=None, timeout_seconds=30, touch_interval_seconds=60):
+        if path is None:
+            raise ValueError('path must be provided')
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.seed_path = seed_path
+        self.timeout_seconds = timeout_seconds
+        self.touch_interval_seconds = touch_interval_seconds
+        self.__local = threading.local()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.__connection().executescript(SCHEMA)
+        if self.seed_path is not None:
+            self.__seed()
+
+    def get(self, namespace, key):
+        try:
+            connection = self.__connection()
+            row = connection.execute('SELECT value, accessed FROM entries WHERE namespace = ? AND key = ?', (namespace, key)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            # Only record reads periodically, to avoid a write for every read
+            if now - row[1] > self.touch_interval_seconds:
+                connection.execute('UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?', (now, namespace, key))
+            return row[0]
+        except sqlite3.Error as e:
+            logger.warning('Failed to read {0}/{1} from {2}: {3}'.format(namespace, key, self.path, str(e)))
+            return None
+
+    def put(self, namespace, key, value):
+        if not isinstance(value, bytes):
+            raise ValueError('value must be bytes')
+        try:
+            with self.__transaction() as connection:
+                connection.execute('INSERT OR REPLACE INTO entries (namespace, key, value, size, accessed) VALUES (?, ?, ?, ?, ?)',
+                                   (namespace, key, value, len(value), time.time()))
+                self.__evict(connection)
+        except sqlite3.Error as e:
+            logger.warning('Failed to write {0}/{1} to {2}: {3}'.format(namespace, key, self.path, str(e)))
+
+    def delete(self, namespace, key):
+        try:
+            with self.__transaction() as connection:
+                connection.execute('DELETE FROM entries WHERE namespace = ? AND key = ?', (namespace, key))
+        except sqlite3.Error as e:
+            logger.warning('Failed to delete {0}/{1} from {2}: {3}'.format(namespace, key, self.path, str(e)))
+
+    def size(self):
+        return self.__connection().execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def __evict(self, connection):
+        total_size = connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+        # Remove down to 90% of the limit, so eviction is not required on every write once full
+        target_size = int(self.max_size_bytes * 0.9)
+        evicted = []
+        for namespace, key, size in connection.execute('SELECT namespace, key, size FROM entries ORDER BY accessed').fetchall():
+            if total_size <= target_size:
+                break
+            evicted.append((namespace, key))
+            total_size -= size
+        connection.executemany('DELETE FROM entries WHERE namespace = ? AND key = ?', evicted)
+        logger.debug('Evicted %s entries from %s', len(evicted), self.path)
+
+    def __seed(self):
+        if not os.path.exists(self.seed_path):
+            logger.debug('No seed found at %s', self.seed_path)
+            return
+        seed = '{0}:{1}'.format(os.path.abspath(self.seed_path), os.path.getmtime(self.seed_path))
+        try:
+            connection = self.__connection()
+            connection.execute('ATTACH DATABASE ? AS seed', ('file:{0}?mode=ro'.format(self.seed_path),))
+            try:
+                with self.__transaction() as connection:
+                    if connection.execute('SELECT 1 FROM seeds WHERE seed = ?', (seed,)).fetchone() is not None:
+                        return
+                    logger.info('Seeding %s from %s', self.path, self.seed_path)
+                    connection.execute('INSERT OR IGNORE INTO main.entries (namespace, key, value, size, accessed) SELECT namespace, key, value, size, ? FROM seed.entries',
+                                       (time.time(),))
+                    connection.execute('INSERT INTO seeds (seed) VALUES (?)', (seed,))
+                    self.__evict(connection)
+            finally:
+                connection.execute('DETACH DATABASE seed')
+        except sqlite3.Error as e:
+            logger.warning('Failed to seed {0} from {1}: {2}'.format(self.path, self.seed_path, str(e)))
+
+    def __transaction(self):
+        return Transaction(self.__connection())
+
+    def __connection(self):
+        # sqlite connections must not be shared between threads or inherited by forked processes
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None or self.__local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout_seconds, isolation_level=None, uri=True)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self.__local.connection = connection
+            self.__local.pid = os.getpid()
+        return connection
+
+
+class Transaction():
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        # Take the write lock up front, so concurrent writers wait on the busy timeout rather than failing to upgrade a read lock
+        self.connection.execute('BEGIN IMMEDIATE')
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.connection.execute('COMMIT')
+        else:
+            self.connection.execute('ROLLBACK')
+        return False
+
+
+_shared_stores = {}
+_shared_stores_lock = threading.Lock()
+
+
+def get_shared_store(path, **kwargs):
+    """Returns the PersistentStore for a path, creating it on first use, so all services in a process share one instance per database"""
+    with _shared_stores_lock:
+        store = _shared_stores.get(path, None)
+        if store is None:
+            store = PersistentStore(path, **kwargs)
+            _shared_stores[path] = store
+        return store
@@ -0,0 +1,159 @@
+import time
+import bisect
+import hashlib
+import threading
+import contextlib
+from osvimdriver.cache import LRUCache
+
+# Upper bounds (in seconds) of the histogram buckets, from reading a file to waiting on Heat or a large translation
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class Histogram():
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket, plus one for values above the largest bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        """Returns (upper bound, number of values less than or equal to it) for each bucket, ending with (inf, count)"""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def copy(self):
+        histogram = Histogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.sum = self.sum
+        histogram.count = self.count
+        return histogram
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': [{'le': bound, 'count': count} for bound, count in self.cumulative_counts()]
+        }
+
+
+class PhaseTimings():
+    """
+    Histograms of the time taken by each phase of a request, by request type, deployment location and template hash.
+
+    Histograms for up to max_series combinations are kept, the least recently updated are removed first,
+    so templates which are no longer used do not accumulate. They are served by the timings route of the Openstack Admin API.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, max_series=1000):
+        self.buckets = buckets
+        self.__histograms = LRUCache(max_size=max_series)
+        self.__lock = threading.Lock()
+
+    def observe(self, request_type, phase, seconds, location=None, template_hash=None):
+        key = (request_type, phase, location, template_hash)
+        with self.__lock:
+            histogram = self.__histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(self.buckets)
+                self.__histograms.put(key, histogram)
+            histogram.observe(seconds)
+
+    def collect(self):
+        """Returns (labels, histogram) for every series, where the labels are a dict of request_type, phase, location and template_hash"""
+        with self.__lock:
+            series = []
+            # Read without marking the series as used, so collecting does not change which are removed first
+            for key, histogram in self.__histograms.items():
+                labels = dict(zip(('request_type', 'phase', 'location', 'template_hash'), key))
+                series.append((labels, histogram.copy()))
+            return series
+
+    def clear(self):
+        with self.__lock:
+            self.__histograms.clear()
+
+
+# Timings of all requests handled by this process
+phase_timings = PhaseTimings()
+
+
+def template_hash(template):
+    return hashlib.sha256(template.encode('utf-8')).hexdigest()[:12]
+
+
+class RequestTimer():
+    """
+    Times the phases of one request. Phases are recorded in a PhaseTimings (if given) when the request finishes,
+    once the template used by the request (and so its hash) is known.
+    """
+
+    def __init__(self, request_type, timings=None, location=None, clock=time.perf_counter):
+        self.request_type = request_type
+        self.timings = timings
+        self.location = location
+        self.clock = clock
+        self.template_hash = None
+        self.phases = []
+        self.started = clock()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.phases.append((name, self.clock() - start))
+
+    def add(self, phases):
+        """Adds phases timed elsewhere (e.g. in a translation worker process)"""
+        self.phases.extend(phases)
+
+    def finish(self):
+        total = self.clock() - self.started
+        if self.timings is not None:
+            for name, seconds in self.phases:
+                self.timings.observe(self.request_type, name, seconds, location=self.location, template_hash=self.template_hash)
+            self.timings.observe(self.request_type, 'total', total, location=self.location, template_hash=self.template_hash)
+        return total
+
+    def describe(self):
+        return ', '.join('{0}={1:.1f}ms'.format(name, seconds * 1000) for name, seconds in self.phases)
+
+
+_active = threading.local()
+
+
+def active_timer():
+    return getattr(_active, 'timer', None)
+
+
+@contextlib.contextmanager
+def activate_timer(timer):
+    """Makes timer the one used by timed_phase in this thread, so services called during a request can time their phases"""
+    previous = active_timer()
+    _active.timer = timer
+    try:
+        yield timer
+    finally:
+        _active.timer = previous
+
+
+@contextlib.contextmanager
+def timed_phase(name):
+    timer = active_timer()
+    if timer is None:
+        yield
+        return
+    with timer.phase(name):
+        yield
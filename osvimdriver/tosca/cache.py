@@ -0,0 +1,218 @@
+import os
+import hashlib
+import logging
+import tempfile
+import yaml
+import osvimdriver.yamlutil as yamlutil
+import osvimdriver
+from osvimdriver.cache import LRUCache
+from toscaparser.utils.urlutils import UrlUtils
+
+logger = logging.getLogger(__name__)
+
+TRANSLATIONS_NAMESPACE = 'translations'
+
+
+def get_distribution_version(distribution_name):
+    try:
+        from importlib import metadata
+        return metadata.version(distribution_name)
+    except Exception:
+        return 'unknown'
+
+
+TRANSLATOR_VERSIONS = {
+    'os-vim-driver': osvimdriver.__version__,
+    'tosca-parser': get_distribution_version('tosca-parser'),
+    'heat-translator': get_distribution_version('heat-translator')
+}
+
+
+def translation_cache_key(tosca_template_str, template_path=None):
+    """
+    Builds a key for a translation from the content of the TOSCA template, the content of every file it imports (directly or through the
+    imports of an imported file) and the versions of the driver, tosca-parser and heat-translator (as any of these may change the translated Heat).
+
+    Returns None if the template imports from a URL or repository, as what is imported may change without the key changing, so the
+    translation must not be cached.
+
+    Driver files are extracted to a new directory for every request, so files under the directory of the template are keyed by their path
+    relative to it, allowing the same templates to share a key wherever they are extracted.
+    """
+    try:
+        imported_files = find_imported_files(tosca_template_str, template_path=template_path)
+    except RemoteImportError as e:
+        logger.debug('Translation will not be cached: %s', str(e))
+        return None
+    template_dir = os.path.dirname(os.path.abspath(template_path)) if template_path is not None else None
+    digest = _versioned_digest()
+    digest.update(tosca_template_str.encode('utf-8'))
+    for import_path, content in imported_files:
+        digest.update(b'\0')
+        digest.update(_key_path(import_path, template_dir).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content if content is not None else b'<missing>')
+    return digest.hexdigest()
+
+
+def _key_path(import_path, template_dir):
+    if template_dir is not None and os.path.commonpath([import_path, template_dir]) == template_dir:
+        return os.path.relpath(import_path, template_dir)
+    return import_path
+
+
+def _versioned_digest():
+    digest = hashlib.sha256()
+    for name, version in sorted(TRANSLATOR_VERSIONS.items()):
+        digest.update('{0}={1}\n'.format(name, version).encode('utf-8'))
+    return digest
+
+
+class RemoteImportError(Exception):
+    pass
+
+
+def find_imported_files(tosca_template_str, template_path=None):
+    """
+    Returns (path, content) of every file imported by a template, directly or through the imports of an imported file, resolving each path
+    as toscaparser does (see ToscaParserService.parse_tosca_str). The content is None if the file cannot be read.
+    Raises a RemoteImportError if anything is imported from a URL or repository.
+    """
+    template_dir = os.path.dirname(os.path.abspath(template_path)) if template_path is not None else None
+    imported_files = []
+    visited = set()
+    pending = [_resolve_template_import(import_file, template_dir) for import_file in _get_import_files(_safe_load(tosca_template_str))]
+    while len(pending) > 0:
+        import_path = pending.pop(0)
+        if import_path is None or import_path in visited:
+            continue
+        visited.add(import_path)
+        try:
+            with open(import_path, 'rb') as f:
+                content = f.read()
+        except OSError:
+            imported_files.append((import_path, None))
+            continue
+        imported_files.append((import_path, content))
+        for import_file in _get_import_files(_safe_load(content)):
+            pending.append(_resolve_nested_import(import_file, import_path))
+    return imported_files
+
+
+def _resolve_template_import(import_file, template_dir):
+    # The template itself is passed to toscaparser already parsed, so only absolute paths are resolved, after "./" imports are made absolute
+    # by the parser service. Other names (e.g. etsi_nfv_sol001) are definitions included with the driver, covered by its version
+    if os.path.isabs(import_file):
+        return os.path.normpath(import_file)
+    if import_file.startswith('./') and template_dir is not None:
+        return os.path.abspath(os.path.join(template_dir, import_file[2:]))
+    return None
+
+
+def _resolve_nested_import(import_file, importing_path):
+    # Imports of an imported file are found relative to the working directory first, then to the importing file
+    if os.path.isabs(import_file):
+        return os.path.normpath(import_file)
+    if os.path.isfile(import_file):
+        return os.path.abspath(import_file)
+    return os.path.abspath(os.path.join(os.path.dirname(importing_path), import_file))
+
+
+def _safe_load(content):
+    try:
+        return yamlutil.safe_load(content)
+    except yaml.YAMLError:
+        return None
+
+
+def _get_import_files(tosca_tpl):
+    if not isinstance(tosca_tpl, dict) or not isinstance(tosca_tpl.get('imports', None), list):
+        return []
+    import_files = []
+    for imp in tosca_tpl['imports']:
+        if isinstance(imp, dict) and 'file' not in imp:
+            # Named imports e.g. {'my_types': './my_types.yaml'} or {'my_types': {'file': './my_types.yaml'}}
+            import_defs = list(imp.values())
+        else:
+            import_defs = [imp]
+        for import_def in import_defs:
+            if isinstance(import_def, dict):
+                if import_def.get('repository', None) is not None:
+                    raise RemoteImportError('Imports {0} from repository {1}'.format(import_def.get('file', None), import_def['repository']))
+                import_def = import_def.get('file', None)
+            if not isinstance(import_def, str):
+                continue
+            if UrlUtils.validate_url(import_def):
+                raise RemoteImportError('Imports {0}'.format(import_def))
+            import_files.append(import_def)
+    return import_files
+
+
+class TranslationCache():
+    """
+    Keeps translated Heat templates in memory, keyed by translation_cache_key, evicting the least recently used once max_size is reached.
+
+    If a directory is set, translations are also written to it as files named by their key, so they survive restarts and can be read
+    by other processes. Similarly, if a store (see osvimdriver.store.PersistentStore) is set, translations are kept in it under the
+    "translations" namespace. Translations found in the directory or store are added to the in memory cache on first use.
+    """
+
+    def __init__(self, max_size=100, directory=None, store=None):
+        self.directory = directory
+        self.store = store
+        self.__translations = LRUCache(max_size=max_size)
+        if self.directory is not None:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def get(self, cache_key):
+        heat_template = self.__translations.get(cache_key)
+        if heat_template is None and self.store is not None:
+            stored_template = self.store.get(TRANSLATIONS_NAMESPACE, cache_key)
+            if stored_template is not None:
+                heat_template = stored_template.decode('utf-8')
+        if heat_template is None and self.directory is not None:
+            heat_template = self.__read(cache_key)
+        if heat_template is not None:
+            self.__translations.put(cache_key, heat_template)
+        return heat_template
+
+    def put(self, cache_key, heat_template):
+        self.__translations.put(cache_key, heat_template)
+        if self.store is not None:
+            self.store.put(TRANSLATIONS_NAMESPACE, cache_key, heat_template.encode('utf-8'))
+        if self.directory is not None:
+            try:
+                self.__write(cache_key, heat_template)
+            except OSError as e:
+                logger.warning('Failed to write translation {0} to {1}: {2}'.format(cache_key, self.directory, str(e)))
+
+    def clear(self):
+        self.__translations.clear()
+
+    def __len__(self):
+        return len(self.__translations)
+
+    def __read(self, cache_key):
+        try:
+            with open(self.__path(cache_key), 'r') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning('Failed to read translation {0} from {1}: {2}'.format(cache_key, self.directory, str(e)))
+            return None
+
+    def __write(self, cache_key, heat_template):
+        # Write to a temporary file then rename, so a partially written translation is never read
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(heat_template)
+            os.replace(tmp_path, self.__path(cache_key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def __path(self, cache_key):
+        return os.path.join(self.directory, '{0}.yaml'.format(cache_key))
@@ -93,7 +93,7 @@ class NetworkSearchImpl:
             if single_property_key == NetworkTranslator.TOSCA.PROPS.ID:
                 network = neutron_driver.get_network_by_id(target_search_value)
             else:
-                network = neutron_driver.get_network_by_name(target_search_value)
+                network = neutron_driver.get_network_by_name(target_search_value, fields=list(NetworkTranslator.OS.PROPS.all.values()))
             return network
         except neutronexceptions.NotFound as e:
             raise NotDiscoveredError('Cannot find {0} with search value: {1}'.format(network_node_template.type_definition.type, target_search_value)) from e
@@ -105,11 +105,13 @@ class NetworkSearchImpl:
 
     def __gather_network_outputs(self, network, network_node_template, outputs):
         output_results = {}
+        # One translator for all outputs, so subnets are retrieved from Neutron at most once
+        network_translator = NetworkTranslator(self.openstack_location)
         for output in outputs:
             output_name = output.name
             output_unresolved_value = output.value
             if isinstance(output_unresolved_value, Function):
-                output_value = self.__resolve_functions_on_output(network, network_node_template, output, output_unresolved_value)
+                output_value = self.__resolve_functions_on_output(network, network_node_template, output, output_unresolved_value, network_translator)
             else:
                 if type(output_unresolved_value) is dict:
                     self.__validate_output_value_is_not_unsupported_function(output_unresolved_value)
@@ -138,7 +140,7 @@ class NetworkSearchImpl:
             raise InvalidDiscoveryToscaError(
                 'Resolving output value with function \'Token\' is not supported through discovery')
 
-    def __resolve_functions_on_output(self, node, node_template, output, output_function):
+    def __resolve_functions_on_output(self, node, node_template, output, output_function, network_translator):
         if isinstance(output_function, GetAttribute):
             output_args = output_function.args
             if len(output_args) != 2:
@@ -148,7 +150,7 @@ class NetworkSearchImpl:
             if target_node_name != node_template.name:
                 raise InvalidDiscoveryToscaError('Attributes can only been resolved to the single node_template named \'{0}\' but output \'{1}\' references \'{2}\''.format(
                     node_template.name, output.name, target_node_name))
-            return NetworkTranslator(self.openstack_location).resolve_tosca_attribute(node, target_attr)
+            return network_translator.resolve_tosca_attribute(node, target_attr)
         elif isinstance(output_function, GetProperty):
             raise InvalidDiscoveryToscaError(
                 'Resolving output function of type \'{0}\' is not supported through discovery - you should use get_attribute instead'.format(output_function.__class__.__name__))
@@ -205,6 +207,7 @@ class NetworkTranslator:
                                 self.TOSCA.PROPS.END_IP,
                                 self.TOSCA.PROPS.GATEWAY_IP,
                                 self.TOSCA.PROPS.DHCP_ENABLED]
+        self.__subnets_by_network = {}
 
     def resolve_tosca_attribute(self, network_obj, tosca_attribute_name):
         if tosca_attribute_name == self.TOSCA.PROPS.NAME:
@@ -227,11 +230,23 @@ class NetworkTranslator:
         if len(subnets) == 0:
             return None
         # We currently support retrieval of values from first subnet only
-        first_subnet_id = subnets[0]
-        neutron_driver = self.openstack_location.neutron_driver
-        first_subnet = neutron_driver.get_subnet_by_id(first_subnet_id)
+        first_subnet = self.__get_first_subnet(network_obj[self.OS.PROPS.ID], subnets)
         return NetworkSubnetTranslator().resolve_network_tosca_attribute(first_subnet, tosca_attribute_name)
 
+    def __get_first_subnet(self, network_id, subnet_ids):
+        # Retrieve all subnets of the network in one request, the first time any subnet attribute is resolved
+        if network_id not in self.__subnets_by_network:
+            neutron_driver = self.openstack_location.neutron_driver
+            subnets = neutron_driver.get_subnets_by_ids(subnet_ids)
+            self.__subnets_by_network[network_id] = {subnet[self.OS.PROPS.ID]: subnet for subnet in subnets}
+        first_subnet_id = subnet_ids[0]
+        first_subnet = self.__subnets_by_network[network_id].get(first_subnet_id, None)
+        if first_subnet is None:
+            neutron_driver = self.openstack_location.neutron_driver
+            first_subnet = neutron_driver.get_subnet_by_id(first_subnet_id)
+            self.__subnets_by_network[network_id][first_subnet_id] = first_subnet
+        return first_subnet
+
 
 class NetworkSubnetTranslator:
 
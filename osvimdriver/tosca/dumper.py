@@ -0,0 +1,38 @@
+import yaml
+import translator.hot.syntax.hot_template
+import translator.hot.syntax.hot_resource
+from osvimdriver.yamlutil import Dumper, LIBYAML_AVAILABLE
+
+
+class HeatYaml():
+    """
+    Stands in for the yaml module used by heat-translator to write translated Heat templates, so they are written with the libyaml
+    Dumper (when available) rather than the pure Python one. Representers added by heat-translator are registered on a Dumper of
+    its own, leaving the defaults of the yaml module untouched. Anything else is taken from the yaml module.
+    """
+
+    def __init__(self, dumper=Dumper):
+        self.dumper = type('HeatDumper', (dumper,), {})
+
+    def add_representer(self, data_type, representer):
+        self.dumper.add_representer(data_type, representer)
+
+    def dump(self, data, stream=None, **kwds):
+        return yaml.dump(data, stream, Dumper=self.dumper, **kwds)
+
+    def __getattr__(self, name):
+        return getattr(yaml, name)
+
+
+heat_yaml = HeatYaml()
+
+HEAT_TRANSLATOR_MODULES = [translator.hot.syntax.hot_template, translator.hot.syntax.hot_resource]
+
+
+def install_heat_dumper(heat_yaml=heat_yaml):
+    """Replaces the yaml module used by heat-translator to write Heat templates, if libyaml is available"""
+    if not LIBYAML_AVAILABLE:
+        return
+    for module in HEAT_TRANSLATOR_MODULES:
+        if module.yaml is not heat_yaml:
+            module.yaml = heat_yaml
@@ -0,0 +1,176 @@
+import logging
+import itertools
+import threading
+import multiprocessing
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationBusyError(Exception):
+    pass
+
+
+class TranslationTimeoutError(Exception):
+    pass
+
+
+class TranslationWorkerError(Exception):
+    pass
+
+
+# Queue the worker processes report the id of each job to as they start it (set in each worker by _init_worker)
+_started_jobs = None
+
+
+def _init_worker(memory_limit_bytes, started_jobs=None):
+    global _started_jobs
+    _started_jobs = started_jobs
+    if memory_limit_bytes is not None and memory_limit_bytes > 0:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+
+
+def _run_job(job_id, fn, *args):
+    if _started_jobs is not None:
+        _started_jobs.put(job_id)
+    return fn(*args)
+
+
+class WorkerPool():
+    """A pool of worker processes, which tracks when each job submitted to it is started by a worker (rather than waiting for one)"""
+
+    def __init__(self, max_workers, memory_limit_bytes=None):
+        context = multiprocessing.get_context('spawn')
+        self.started_jobs = context.Queue()
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                                               initializer=_init_worker, initargs=(memory_limit_bytes, self.started_jobs))
+        self.__job_ids = itertools.count()
+        self.__started = {}
+        self.__lock = threading.Lock()
+        self.__reader = threading.Thread(target=self.__read_started_jobs, name='translation-job-starts', daemon=True)
+        self.__reader.start()
+
+    def submit(self, fn, *args):
+        """Returns the future of the job and an Event set once a worker starts it (or the job ends without starting, e.g. as the pool broke)"""
+        job_id = next(self.__job_ids)
+        started = threading.Event()
+        with self.__lock:
+            self.__started[job_id] = started
+        future = self.executor.submit(_run_job, job_id, fn, *args)
+        def on_done(future):
+            with self.__lock:
+                self.__started.pop(job_id, None)
+            started.set()
+        future.add_done_callback(on_done)
+        return future, started
+
+    def __read_started_jobs(self):
+        while True:
+            try:
+                job_id = self.started_jobs.get()
+            except (EOFError, OSError):
+                return
+            if job_id is None:
+                return
+            with self.__lock:
+                started = self.__started.get(job_id, None)
+            if started is not None:
+                started.set()
+
+    def shutdown(self, terminate=False):
+        if terminate:
+            # ProcessPoolExecutor has no public means to stop a running job, so terminate its processes
+            processes = getattr(self.executor, '_processes', None) or {}
+            for process in list(processes.values()):
+                try:
+                    process.terminate()
+                except Exception as e:
+                    logger.debug('Failed to terminate translation worker: %s', str(e))
+        self.executor.shutdown(wait=False)
+        self.started_jobs.put(None)
+
+
+class TranslationExecutor():
+    """
+    Runs CPU bound TOSCA parsing and translation jobs in a pool of worker processes, so a large template does not hold up the thread
+    (and the interpreter lock) of the process handling the request.
+
+    At most max_workers jobs run at once and up to max_queue_depth more may wait for a worker; any further job is rejected with a
+    TranslationBusyError. A job which has not completed within timeout_seconds of a worker starting it (time spent waiting for a worker
+    is not counted) raises a TranslationTimeoutError and, as a running job cannot be cancelled, the pool is replaced (other jobs running
+    at the time fail with a TranslationWorkerError).
+    Each worker process is limited to memory_limit_mb of address space, if set.
+
+    Workers are started with "spawn", so they do not inherit the threads and open connections of the process handling requests.
+    """
+
+    def __init__(self, max_workers=2, timeout_seconds=300, max_queue_depth=10, memory_limit_mb=None):
+        if max_workers is None or max_workers < 1:
+            raise ValueError('max_workers must be a positive integer')
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.max_queue_depth = max_queue_depth if max_queue_depth is not None else 0
+        self.memory_limit_mb = memory_limit_mb
+        self.__slots = threading.BoundedSemaphore(self.max_workers + self.max_queue_depth)
+        self.__pool = None
+        self.__lock = threading.Lock()
+
+    def run(self, fn, *args):
+        if not self.__slots.acquire(blocking=False):
+            raise TranslationBusyError('Translation queue is full ({0} running or waiting), try again later'.format(self.max_workers + self.max_queue_depth))
+        try:
+            pool = self.__get_pool()
+            future, started = pool.submit(fn, *args)
+            try:
+                # Waiting is bounded by the queue depth and the timeout of the jobs ahead of this one
+                started.wait()
+                return future.result(timeout=self.timeout_seconds)
+            except concurrent.futures.TimeoutError as e:
+                logger.warning('Translation did not complete within {0} seconds, restarting translation workers'.format(self.timeout_seconds))
+                self.__replace_pool(pool)
+                raise TranslationTimeoutError('Translation did not complete within {0} seconds'.format(self.timeout_seconds)) from e
+            except BrokenProcessPool as e:
+                self.__replace_pool(pool)
+                raise TranslationWorkerError('Translation worker terminated unexpectedly (this may be caused by the memory limit or a restart of the workers)') from e
+        finally:
+            self.__slots.release()
+
+    def shutdown(self):
+        with self.__lock:
+            pool = self.__pool
+            self.__pool = None
+        if pool is not None:
+            pool.shutdown()
+
+    def __get_pool(self):
+        with self.__lock:
+            if self.__pool is None:
+                memory_limit_bytes = self.memory_limit_mb * 1024 * 1024 if self.memory_limit_mb else None
+                self.__pool = WorkerPool(self.max_workers, memory_limit_bytes=memory_limit_bytes)
+            return self.__pool
+
+    def __replace_pool(self, pool):
+        with self.__lock:
+            if self.__pool is pool:
+                self.__pool = None
+            else:
+                # Already replaced by another job
+                return
+        pool.shutdown(terminate=True)
+
+
+_shared_executors = {}
+_shared_executors_lock = threading.Lock()
+
+
+def get_shared_executor(**kwargs):
+    """Returns the TranslationExecutor for a configuration, creating it on first use, so all services in a process share the same workers"""
+    executor_key = tuple(sorted(kwargs.items()))
+    with _shared_executors_lock:
+        executor = _shared_executors.get(executor_key, None)
+        if executor is None:
+            executor = TranslationExecutor(**kwargs)
+            _shared_executors[executor_key] = executor
+        return executor
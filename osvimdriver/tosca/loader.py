@@ -0,0 +1,53 @@
+import os
+import pickle
+import logging
+import threading
+import toscaparser.imports
+import toscaparser.utils.yamlparser
+import osvimdriver.tosca.definitions as tosca_definitions
+
+logger = logging.getLogger(__name__)
+
+
+class DefinitionsLoader():
+    """
+    YAML loader for toscaparser which parses each of the driver's type definition files once per process.
+
+    toscaparser re-reads every import each time it resolves custom types (several times per template), so the definition files
+    (~2,500 lines) would otherwise be parsed over and over. The parsed content is kept as a pickled snapshot and each load returns
+    a fresh copy from it, as toscaparser may modify what it loads. Any other file or URL is passed through to the original loader.
+    """
+
+    def __init__(self, definition_files, yaml_loader=toscaparser.utils.yamlparser.load_yaml):
+        self.definition_files = set(self.__normalise(path) for path in definition_files)
+        self.yaml_loader = yaml_loader
+        self.__snapshots = {}
+        self.__lock = threading.Lock()
+
+    def load_yaml(self, path, a_file=True):
+        if not a_file:
+            return self.yaml_loader(path, a_file)
+        normalised_path = self.__normalise(path)
+        if normalised_path not in self.definition_files:
+            return self.yaml_loader(path, a_file)
+        snapshot = self.__snapshots.get(normalised_path, None)
+        if snapshot is None:
+            with self.__lock:
+                snapshot = self.__snapshots.get(normalised_path, None)
+                if snapshot is None:
+                    logger.debug('Parsing type definitions in %s', normalised_path)
+                    snapshot = pickle.dumps(self.yaml_loader(path, a_file), protocol=pickle.HIGHEST_PROTOCOL)
+                    self.__snapshots[normalised_path] = snapshot
+        return pickle.loads(snapshot)
+
+    def __normalise(self, path):
+        return os.path.normcase(os.path.realpath(path))
+
+
+definitions_loader = DefinitionsLoader(tosca_definitions.DEFINITION_FILES)
+
+
+def install_definitions_loader(loader=definitions_loader):
+    """Replaces the YAML loader used by toscaparser to resolve imports"""
+    if toscaparser.imports.YAML_LOADER is not loader.load_yaml:
+        toscaparser.imports.YAML_LOADER = loader.load_yaml
@@ -14,17 +14,20 @@ class OSNfvVducp(ToscaNfvVducp):
     def __is_custom_prop(self, prop_name):
         return prop_name in CUSTOM_PROPS
 
+    def __is_node_in_topology(self, node_name):
+        try:
+            return node_name in self.nodetemplate.templates
+        except TypeError:
+            # Unhashable values (e.g. a get_input function) are never node names
+            return False
+
     def handle_properties(self):
         super(OSNfvVducp, self).handle_properties()     
 
         if self.virtual_link and 'network' in self.properties:
             network_node_name = self.virtual_link
             # Check network is in the topology otherwise override the use of "get_resource"
-            match = None
-            for node_name, node_tpl in self.nodetemplate.templates.items():
-                if node_name == network_node_name:
-                    match = node_tpl
-                    break
+            match = self.nodetemplate.templates.get(network_node_name, None)
             if match == None:
                 self.properties['network'] = network_node_name
             else:
@@ -38,12 +41,7 @@ class OSNfvVducp(ToscaNfvVducp):
                 if isinstance(value, list):
                     new_value = []
                     for e in value:
-                        found_match = False
-                        for node_name, _ in self.nodetemplate.templates.items():
-                            if node_name == e:
-                                found_match = True
-                                break
-                        if found_match:
+                        if self.__is_node_in_topology(e):
                             new_value.append({'get_resource': e})
                         else:
                             new_value.append(e)
@@ -0,0 +1,143 @@
+import functools
+import contextlib
+
+TRACER_NAME = 'osvimdriver'
+
+
+class NoSpan():
+    """Stands in for a span whilst tracing is disabled"""
+
+    def set_attribute(self, key, value):
+        pass
+
+
+NO_SPAN = NoSpan()
+
+
+class DriverTracer():
+    """Creates the trace spans of the driver. This implementation creates none and is used whilst tracing is disabled"""
+
+    enabled = False
+
+    @contextlib.contextmanager
+    def span(self, name, attributes=None):
+        yield NO_SPAN
+
+
+def incoming_headers():
+    """Returns the headers of the API request being handled by this thread (with lower case names), or None if there is not one"""
+    try:
+        import flask
+    except ImportError:
+        return None
+    if not flask.has_request_context():
+        return None
+    return {name.lower(): value for name, value in flask.request.headers.items()}
+
+
+class OpenTelemetryTracer(DriverTracer):
+    """
+    Creates spans with the OpenTelemetry SDK. A span started when there is no current span continues the trace of the API request
+    being handled (from its traceparent header, if any), otherwise it starts a new trace.
+
+    Traces are sampled with a probability of sample_ratio, unless continuing a trace, when the decision of the caller is followed.
+    Spans are exported in batches by a background thread to the OTLP (HTTP) endpoint of a collector, or written to stdout with the "console" exporter.
+    """
+
+    enabled = True
+
+    def __init__(self, service_name='os-vim-driver', sample_ratio=1.0, exporter=None, endpoint=None, span_processor=None):
+        from opentelemetry import trace, propagate
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+        self.__trace = trace
+        self.__propagate = propagate
+        self.provider = TracerProvider(resource=Resource.create({'service.name': service_name}), sampler=ParentBased(TraceIdRatioBased(sample_ratio)))
+        if span_processor is None:
+            span_processor = build_span_processor(exporter, endpoint)
+        if span_processor is not None:
+            self.provider.add_span_processor(span_processor)
+        self.tracer = self.provider.get_tracer(TRACER_NAME)
+
+    @contextlib.contextmanager
+    def span(self, name, attributes=None):
+        if attributes is not None:
+            # OpenTelemetry does not accept None values
+            attributes = {key: value for key, value in attributes.items() if value is not None}
+        context = None
+        if not self.__trace.get_current_span().get_span_context().is_valid:
+            headers = incoming_headers()
+            if headers is not None:
+                context = self.__propagate.extract(headers)
+        with self.tracer.start_as_current_span(name, context=context, attributes=attributes) as span:
+            yield span
+
+    def shutdown(self):
+        self.provider.shutdown()
+
+
+def build_span_processor(exporter, endpoint=None):
+    if exporter is None:
+        return None
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    if exporter == 'otlp':
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint) if endpoint is not None else OTLPSpanExporter())
+    elif exporter == 'console':
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return BatchSpanProcessor(ConsoleSpanExporter())
+    raise ValueError('Unsupported trace exporter: {0}'.format(exporter))
+
+
+class TracedDriver():
+    """Wraps a driver (e.g. a HeatDriver) so each call to one of its public methods is made in a span named <service>.<method>"""
+
+    def __init__(self, driver, tracer, service, location):
+        self.driver = driver
+        self.tracer = tracer
+        self.service = service
+        self.location = location
+
+    def __getattr__(self, name):
+        attr = getattr(self.driver, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        @functools.wraps(attr)
+        def traced(*args, **kwargs):
+            with self.tracer.span('{0}.{1}'.format(self.service, name), {'ovd.location': self.location}):
+                return attr(*args, **kwargs)
+        return traced
+
+
+# Tracer of this process, replaced when tracing is enabled (see osvimdriver.service.tracing)
+_tracer = DriverTracer()
+
+
+def get_tracer():
+    return _tracer
+
+
+def set_tracer(tracer):
+    global _tracer
+    _tracer = tracer if tracer is not None else DriverTracer()
+
+
+def trace_driver(driver, service, location):
+    tracer = get_tracer()
+    if not tracer.enabled:
+        return driver
+    return TracedDriver(driver, tracer, service, location)
+
+
+def trace_authentication(auth, location):
+    """Makes each authentication by a keystoneauth plugin (only calls which reach Keystone, not those answered by a cached token) in a span"""
+    tracer = get_tracer()
+    if not tracer.enabled or not hasattr(auth, 'get_auth_ref'):
+        return auth
+    get_auth_ref = auth.get_auth_ref
+    def traced_get_auth_ref(session, **kwargs):
+        with tracer.span('keystone.authenticate', {'ovd.location': location}):
+            return get_auth_ref(session, **kwargs)
+    auth.get_auth_ref = traced_get_auth_ref
+    return auth
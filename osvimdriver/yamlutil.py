@@ -0,0 +1,12 @@
+import yaml
+
+# PyYAML includes libyaml based (C) implementations when built with libyaml. They produce the same results as the pure Python
+# implementations but are many times faster, so are used whenever available.
+LIBYAML_AVAILABLE = getattr(yaml, '__with_libyaml__', False) and hasattr(yaml, 'CSafeLoader') and hasattr(yaml, 'CDumper')
+SafeLoader = yaml.CSafeLoader if LIBYAML_AVAILABLE else yaml.SafeLoader
+Dumper = yaml.CDumper if LIBYAML_AVAILABLE else yaml.Dumper
+
+
+def safe_load(stream):
+    """Equivalent of yaml.safe_load, using the libyaml loader when available"""
+    return yaml.load(stream, Loader=SafeLoader)
@@ -29,6 +29,10 @@ setup(
         'heat-translator @ git+https://github.com/IBM/heat-translator.git@accanto-nfv',
         'gunicorn==20.1.0'
     ],
+    extras_require={
+        'metrics': ['prometheus-client>=0.9.0,<1.0'],
+        'tracing': ['opentelemetry-sdk>=1.12.0,<2.0', 'opentelemetry-exporter-otlp-proto-http>=1.12.0,<2.0']
+    },
     entry_points='''
         [console_scripts]
         ovd-dev=osvimdriver.__main__:main
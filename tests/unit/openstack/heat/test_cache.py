@@ -0,0 +1,82 @@
+import unittest
+import threading
+from unittest.mock import MagicMock
+from osvimdriver.openstack.heat.cache import StackStatusCache, is_terminal_stack_status
+from osvimdriver.openstack.heat.driver import StackNotFoundError
+
+
+class TestIsTerminalStackStatus(unittest.TestCase):
+
+    def test_terminal_status(self):
+        self.assertTrue(is_terminal_stack_status('CREATE_COMPLETE'))
+        self.assertTrue(is_terminal_stack_status('CREATE_FAILED'))
+        self.assertTrue(is_terminal_stack_status('DELETE_COMPLETE'))
+
+    def test_non_terminal_status(self):
+        self.assertFalse(is_terminal_stack_status('CREATE_IN_PROGRESS'))
+        self.assertFalse(is_terminal_stack_status(None))
+
+
+class TestStackStatusCache(unittest.TestCase):
+
+    def test_get_stack_caches_in_progress_stack(self):
+        cache = StackStatusCache(ttl_seconds=60)
+        loader = MagicMock(return_value={'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'})
+        first = cache.get_stack('1', loader)
+        second = cache.get_stack('1', loader)
+        self.assertEqual(first, second)
+        loader.assert_called_once()
+
+    def test_get_stack_does_not_cache_terminal_stack(self):
+        cache = StackStatusCache(ttl_seconds=60)
+        loader = MagicMock(return_value={'id': '1', 'stack_status': 'CREATE_COMPLETE'})
+        cache.get_stack('1', loader)
+        cache.get_stack('1', loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_get_stack_expires_after_ttl(self):
+        cache = StackStatusCache(ttl_seconds=0.0001)
+        loader = MagicMock(return_value={'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'})
+        cache.get_stack('1', loader)
+        threading.Event().wait(0.01)
+        cache.get_stack('1', loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_evict(self):
+        cache = StackStatusCache(ttl_seconds=60)
+        loader = MagicMock(return_value={'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'})
+        cache.get_stack('1', loader)
+        cache.evict('1')
+        cache.get_stack('1', loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_get_stack_error_not_cached(self):
+        cache = StackStatusCache(ttl_seconds=60)
+        loader = MagicMock(side_effect=[StackNotFoundError('Not found'), {'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'}])
+        with self.assertRaises(StackNotFoundError):
+            cache.get_stack('1', loader)
+        self.assertEqual(cache.get_stack('1', loader), {'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'})
+
+    def test_get_stack_concurrent_callers_share_request(self):
+        cache = StackStatusCache(ttl_seconds=60)
+        release = threading.Event()
+        started = threading.Event()
+        calls = []
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {'id': '1', 'stack_status': 'CREATE_COMPLETE'}
+        results = []
+        leader = threading.Thread(target=lambda: results.append(cache.get_stack('1', loader)))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(cache.get_stack('1', loader)))
+        follower.start()
+        # Give the follower time to join the in flight request before it completes
+        threading.Event().wait(0.05)
+        release.set()
+        leader.join()
+        follower.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'id': '1', 'stack_status': 'CREATE_COMPLETE'}] * 2)
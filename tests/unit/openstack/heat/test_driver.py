@@ -93,6 +93,17 @@ class TestHeatDriver(unittest.TestCase):
         mock_heat_client.stacks.get.assert_called_once_with('12345')
         self.assertEqual(stack, expected_stack)
 
+    @patch('osvimdriver.openstack.heat.driver.heatclient.Client')
+    def test_get_stack_without_outputs(self, mock_heat_client_init):
+        mock_heat_client = mock_heat_client_init.return_value
+        mock_stack = MagicMock()
+        mock_stack.to_dict.return_value = {'id': 'mock_id'}
+        mock_heat_client.stacks.get.return_value = mock_stack
+        heat_driver = HeatDriver(MagicMock())
+        stack = heat_driver.get_stack('12345', resolve_outputs=False)
+        mock_heat_client.stacks.get.assert_called_once_with('12345', resolve_outputs=False)
+        self.assertEqual(stack, {'id': 'mock_id'})
+
     @patch('osvimdriver.openstack.heat.driver.heatclient.Client')
     def test_get_stack_without_id_fails(self, mock_heat_client_init):
         mock_session = MagicMock()
@@ -101,6 +112,75 @@ class TestHeatDriver(unittest.TestCase):
             heat_driver.get_stack(None)
         self.assertEqual(str(context.exception), 'stack_id must be provided')
 
+    @patch('osvimdriver.openstack.heat.driver.heatclient.Client')
+    def test_get_stacks_by_ids(self, mock_heat_client_init):
+        mock_heat_client = mock_heat_client_init.return_value
+        mock_stack_a = MagicMock()
+        mock_stack_a.to_dict.return_value = {'id': '1'}
+        mock_stack_b = MagicMock()
+        mock_stack_b.to_dict.return_value = {'id': '2'}
+        mock_heat_client.stacks.list.return_value = iter([mock_stack_a, mock_stack_b])
+        heat_driver = HeatDriver(MagicMock())
+        stacks = heat_driver.get_stacks_by_ids(['1', '2'])
+        mock_heat_client.stacks.list.assert_called_once_with(limit=2, filters={'id': ['1', '2']})
+        self.assertEqual(stacks, [{'id': '1'}, {'id': '2'}])
+
+    @patch('osvimdriver.openstack.heat.driver.heatclient.Client')
+    def test_get_stacks_by_ids_empty(self, mock_heat_client_init):
+        mock_heat_client = mock_heat_client_init.return_value
+        heat_driver = HeatDriver(MagicMock())
+        self.assertEqual(heat_driver.get_stacks_by_ids([]), [])
+        mock_heat_client.stacks.list.assert_not_called()
+
+    @patch('osvimdriver.openstack.heat.driver.heatclient.Client')
+    def test_get_stack_by_name(self, mock_heat_client_init):
+        mock_heat_client = mock_heat_client_init.return_value
+        mock_deleting_stack = MagicMock()
+        mock_deleting_stack.to_dict.return_value = {'id': '1', 'stack_name': 'stackA', 'stack_status': 'DELETE_IN_PROGRESS'}
+        mock_stack = MagicMock()
+        mock_stack.to_dict.return_value = {'id': '2', 'stack_name': 'stackA', 'stack_status': 'CREATE_IN_PROGRESS'}
+        mock_heat_client.stacks.list.return_value = iter([mock_deleting_stack, mock_stack])
+        heat_driver = HeatDriver(MagicMock())
+        stack = heat_driver.get_stack_by_name('stackA')
+        mock_heat_client.stacks.list.assert_called_once_with(filters={'name': 'stackA'})
+        self.assertEqual(stack, {'id': '2', 'stack_name': 'stackA', 'stack_status': 'CREATE_IN_PROGRESS'})
+
+    @patch('osvimdriver.openstack.heat.driver.heatclient.Client')
+    def test_get_stack_by_name_not_found(self, mock_heat_client_init):
+        mock_heat_client = mock_heat_client_init.return_value
+        mock_heat_client.stacks.list.return_value = iter([])
+        heat_driver = HeatDriver(MagicMock())
+        self.assertIsNone(heat_driver.get_stack_by_name('stackA'))
+
+    @patch('osvimdriver.openstack.heat.driver.heatclient.Client')
+    def test_get_stack_events(self, mock_heat_client_init):
+        mock_heat_client = mock_heat_client_init.return_value
+        mock_event = MagicMock()
+        mock_event.to_dict.return_value = {'id': 'event1'}
+        mock_heat_client.events.list.return_value = [mock_event]
+        heat_driver = HeatDriver(MagicMock())
+        events = heat_driver.get_stack_events('1', marker='event0', limit=50)
+        mock_heat_client.events.list.assert_called_once_with('1', marker='event0', limit=50, sort_dir='asc')
+        self.assertEqual(events, [{'id': 'event1'}])
+
+    @patch('osvimdriver.openstack.heat.driver.heatclient.Client')
+    def test_get_stack_events_not_found(self, mock_heat_client_init):
+        mock_heat_client = mock_heat_client_init.return_value
+        mock_heat_client.events.list.side_effect = heatexc.HTTPNotFound('Not found')
+        heat_driver = HeatDriver(MagicMock())
+        with self.assertRaises(StackNotFoundError):
+            heat_driver.get_stack_events('1')
+
+    @patch('osvimdriver.openstack.heat.driver.heatclient.Client')
+    def test_get_stack_resources(self, mock_heat_client_init):
+        mock_heat_client = mock_heat_client_init.return_value
+        mock_resource = MagicMock()
+        mock_resource.to_dict.return_value = {'resource_name': 'server'}
+        mock_heat_client.resources.list.return_value = [mock_resource]
+        heat_driver = HeatDriver(MagicMock())
+        self.assertEqual(heat_driver.get_stack_resources('1'), [{'resource_name': 'server'}])
+        mock_heat_client.resources.list.assert_called_once_with('1')
+
     @patch('osvimdriver.openstack.heat.driver.heatclient.Client')
     def test_get_stack_not_found_fails(self, mock_heat_client_init):
         mock_heat_client = mock_heat_client_init.return_value
@@ -0,0 +1,115 @@
+import unittest
+from unittest.mock import MagicMock, call
+from osvimdriver.openstack.heat.events import StackEventTracker, StackProgress
+from osvimdriver.openstack.heat.driver import StackNotFoundError
+
+
+def stack_event(event_id, status, reason=None):
+    return {'id': event_id, 'resource_name': 'my_stack', 'physical_resource_id': 'stack1', 'resource_status': status, 'resource_status_reason': reason}
+
+
+def resource_event(event_id, resource_name, status):
+    return {'id': event_id, 'resource_name': resource_name, 'physical_resource_id': 'phys_' + resource_name, 'resource_status': status}
+
+
+class TestStackProgress(unittest.TestCase):
+
+    def test_apply_stack_event(self):
+        progress = StackProgress('stack1')
+        progress.apply(stack_event('e1', 'CREATE_FAILED', 'Resource failed'))
+        self.assertEqual(progress.marker, 'e1')
+        self.assertEqual(progress.to_stack(), {'id': 'stack1', 'stack_status': 'CREATE_FAILED', 'stack_status_reason': 'Resource failed'})
+
+    def test_completed_resources_of_current_action(self):
+        progress = StackProgress('stack1')
+        progress.apply(stack_event('e1', 'DELETE_IN_PROGRESS'))
+        progress.apply(resource_event('e2', 'server', 'CREATE_COMPLETE'))
+        progress.apply(resource_event('e3', 'port', 'DELETE_COMPLETE'))
+        self.assertEqual(progress.completed_resources, 1)
+        progress.total_resources = 2
+        self.assertEqual(progress.describe(), '1/2 resources complete')
+
+
+class TestStackEventTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.heat_driver = MagicMock()
+        self.heat_driver.get_stack_resources.return_value = [{'resource_name': 'server'}, {'resource_name': 'port'}]
+
+    def test_get_stack_from_events(self):
+        self.heat_driver.get_stack_events.return_value = [
+            stack_event('e1', 'CREATE_IN_PROGRESS'),
+            resource_event('e2', 'server', 'CREATE_IN_PROGRESS'),
+            resource_event('e3', 'server', 'CREATE_COMPLETE')
+        ]
+        tracker = StackEventTracker()
+        stack = tracker.get_stack('request1', self.heat_driver, 'stack1')
+        self.assertEqual(stack, {'id': 'stack1', 'stack_status': 'CREATE_IN_PROGRESS', 'stack_status_reason': None})
+        self.heat_driver.get_stack_events.assert_called_once_with('stack1', marker=None, limit=100)
+        self.heat_driver.get_stack.assert_not_called()
+        self.assertEqual(tracker.get_progress('request1').describe(), '1/2 resources complete')
+
+    def test_get_stack_retrieves_events_after_marker(self):
+        self.heat_driver.get_stack_events.side_effect = [
+            [stack_event('e1', 'CREATE_IN_PROGRESS')],
+            [resource_event('e2', 'server', 'CREATE_COMPLETE'), resource_event('e3', 'port', 'CREATE_COMPLETE'), stack_event('e4', 'CREATE_COMPLETE')]
+        ]
+        tracker = StackEventTracker()
+        tracker.get_stack('request1', self.heat_driver, 'stack1')
+        stack = tracker.get_stack('request1', self.heat_driver, 'stack1')
+        self.assertEqual(stack['stack_status'], 'CREATE_COMPLETE')
+        self.assertEqual(self.heat_driver.get_stack_events.call_args_list, [
+            call('stack1', marker=None, limit=100),
+            call('stack1', marker='e1', limit=100)
+        ])
+        self.heat_driver.get_stack_resources.assert_called_once_with('stack1')
+
+    def test_get_stack_logs_progress_of_new_events_only(self):
+        self.heat_driver.get_stack_events.side_effect = [
+            [stack_event('e1', 'CREATE_IN_PROGRESS'), resource_event('e2', 'server', 'CREATE_IN_PROGRESS')],
+            [],
+            [resource_event('e3', 'server', 'CREATE_COMPLETE')]
+        ]
+        tracker = StackEventTracker()
+        with self.assertLogs('osvimdriver.openstack.heat.events', level='DEBUG') as logs:
+            tracker.get_stack('request1', self.heat_driver, 'stack1')
+            tracker.get_stack('request1', self.heat_driver, 'stack1')
+            tracker.get_stack('request1', self.heat_driver, 'stack1')
+        self.assertEqual(logs.output, ['DEBUG:osvimdriver.openstack.heat.events:Stack stack1 is CREATE_IN_PROGRESS: 1/2 resources complete'])
+
+    def test_get_stack_follows_pages(self):
+        self.heat_driver.get_stack_events.side_effect = [
+            [stack_event('e1', 'CREATE_IN_PROGRESS'), resource_event('e2', 'server', 'CREATE_IN_PROGRESS')],
+            [resource_event('e3', 'server', 'CREATE_COMPLETE')]
+        ]
+        tracker = StackEventTracker(page_size=2)
+        tracker.get_stack('request1', self.heat_driver, 'stack1')
+        self.assertEqual(self.heat_driver.get_stack_events.call_args_list, [
+            call('stack1', marker=None, limit=2),
+            call('stack1', marker='e2', limit=2)
+        ])
+
+    def test_get_stack_without_stack_events_retrieves_stack(self):
+        self.heat_driver.get_stack_events.return_value = []
+        self.heat_driver.get_stack.return_value = {'id': 'stack1', 'stack_status': 'CREATE_IN_PROGRESS'}
+        tracker = StackEventTracker()
+        stack = tracker.get_stack('request1', self.heat_driver, 'stack1')
+        self.assertEqual(stack, {'id': 'stack1', 'stack_status': 'CREATE_IN_PROGRESS'})
+        self.heat_driver.get_stack.assert_called_once_with('stack1', resolve_outputs=False)
+
+    def test_get_stack_forgets_terminal_request(self):
+        self.heat_driver.get_stack_events.return_value = [stack_event('e1', 'DELETE_COMPLETE')]
+        tracker = StackEventTracker()
+        tracker.get_stack('request1', self.heat_driver, 'stack1')
+        self.assertIsNone(tracker.get_progress('request1'))
+
+    def test_get_stack_not_found(self):
+        self.heat_driver.get_stack_resources.side_effect = StackNotFoundError('Not found')
+        tracker = StackEventTracker()
+        with self.assertRaises(StackNotFoundError):
+            tracker.get_stack('request1', self.heat_driver, 'stack1')
+
+    def test_invalid_page_size(self):
+        with self.assertRaises(ValueError) as context:
+            StackEventTracker(page_size=0)
+        self.assertEqual(str(context.exception), 'page_size must be a positive integer')
@@ -0,0 +1,256 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from osvimdriver.openstack.heat.notifications import (parse_stack_notification, parse_stack_identity, StackNotifications, InProcessNotificationSource, FileNotificationSource,
+                                                      KafkaNotificationSource, create_notification_source)
+
+
+class FakeClock():
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def notification(stack_id, state, event_type='orchestration.stack.create.end', state_reason=None):
+    return {
+        'event_type': event_type,
+        'payload': {
+            'stack_identity': stack_id,
+            'stack_name': 'stack-{0}'.format(stack_id),
+            'state': state,
+            'state_reason': state_reason
+        }
+    }
+
+
+class TestParseStackNotification(unittest.TestCase):
+
+    def test_parse_dict(self):
+        stack = parse_stack_notification(notification('1', 'CREATE_FAILED', state_reason='Quota exceeded'))
+        self.assertEqual(stack, {'id': '1', 'stack_name': 'stack-1', 'stack_status': 'CREATE_FAILED', 'stack_status_reason': 'Quota exceeded'})
+
+    def test_parse_json(self):
+        stack = parse_stack_notification(json.dumps(notification('1', 'CREATE_COMPLETE')).encode('utf-8'))
+        self.assertEqual(stack['stack_status'], 'CREATE_COMPLETE')
+
+    def test_parse_oslo_envelope(self):
+        message = json.dumps({'oslo.version': '2.0', 'oslo.message': json.dumps(notification('1', 'DELETE_COMPLETE', event_type='orchestration.stack.delete.end'))})
+        stack = parse_stack_notification(message)
+        self.assertEqual(stack['id'], '1')
+        self.assertEqual(stack['stack_status'], 'DELETE_COMPLETE')
+
+    def test_parse_ignores_other_event_types(self):
+        self.assertIsNone(parse_stack_notification(notification('1', 'ACTIVE', event_type='compute.instance.create.end')))
+
+    def test_parse_ignores_missing_payload_fields(self):
+        self.assertIsNone(parse_stack_notification({'event_type': 'orchestration.stack.create.end', 'payload': {'state': 'CREATE_COMPLETE'}}))
+        self.assertIsNone(parse_stack_notification({'event_type': 'orchestration.stack.create.end'}))
+
+    def test_parse_ignores_invalid_json(self):
+        self.assertIsNone(parse_stack_notification('not json'))
+
+    def test_parse_heat_notification(self):
+        # As sent by Heat, where stack_identity is the ARN of the stack
+        message = {
+            'oslo.version': '2.0',
+            'oslo.message': json.dumps({
+                'message_id': '5b3e1a6c-4c2a-4e8e-9f39-3c1f1f2d0a11',
+                'publisher_id': 'orchestration.heat-engine-1',
+                'event_type': 'orchestration.stack.create.end',
+                'priority': 'INFO',
+                'payload': {
+                    'stack_identity': 'arn:openstack:heat::6c2a0e4d3a2b4f0e8f1d7c9b5a3e2f10:stacks/my-stack/1f2e3d4c-5b6a-4789-8abc-def012345678',
+                    'stack_name': 'my-stack',
+                    'state': 'CREATE_COMPLETE',
+                    'state_reason': 'Stack CREATE completed successfully',
+                    'tenant_id': '6c2a0e4d3a2b4f0e8f1d7c9b5a3e2f10',
+                    'user_id': 'admin',
+                    'username': 'admin',
+                    'create_at': '2024-01-01T00:00:00Z',
+                    'updated_at': None,
+                    'tags': None
+                },
+                'timestamp': '2024-01-01 00:00:05.000000'
+            })
+        }
+        stack = parse_stack_notification(json.dumps(message))
+        self.assertEqual(stack, {'id': '1f2e3d4c-5b6a-4789-8abc-def012345678', 'stack_name': 'my-stack', 'stack_status': 'CREATE_COMPLETE',
+                                 'stack_status_reason': 'Stack CREATE completed successfully'})
+
+    def test_parse_ignores_unrecognised_stack_identity(self):
+        self.assertIsNone(parse_stack_notification(notification('arn:openstack:heat::tenant:software_configs/1', 'CREATE_COMPLETE')))
+
+
+class TestParseStackIdentity(unittest.TestCase):
+
+    def test_parse_arn(self):
+        self.assertEqual(parse_stack_identity('arn:openstack:heat::tenant:stacks/my-stack/1f2e3d4c'), '1f2e3d4c')
+
+    def test_parse_arn_of_stack_resource(self):
+        self.assertEqual(parse_stack_identity('arn:openstack:heat::tenant:stacks/my-stack/1f2e3d4c/resources/server'), '1f2e3d4c')
+
+    def test_parse_bare_id(self):
+        self.assertEqual(parse_stack_identity('1f2e3d4c'), '1f2e3d4c')
+
+    def test_parse_invalid_arn(self):
+        self.assertIsNone(parse_stack_identity('arn:openstack:heat::tenant:stacks/my-stack'))
+        self.assertIsNone(parse_stack_identity('arn:openstack:heat'))
+
+
+class TestStackNotifications(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.source = InProcessNotificationSource()
+        self.notifications = StackNotifications(self.source, max_size=10, ttl_seconds=3600, in_progress_ttl_seconds=60, clock=self.clock)
+        self.notifications.start()
+
+    def test_get_stack_unknown(self):
+        self.assertIsNone(self.notifications.get_stack('1'))
+
+    def test_get_stack_terminal_status(self):
+        self.source.publish(notification('1', 'CREATE_COMPLETE'))
+        self.clock.now = 3599
+        self.assertEqual(self.notifications.get_stack('1')['stack_status'], 'CREATE_COMPLETE')
+        self.clock.now = 3600
+        self.assertIsNone(self.notifications.get_stack('1'))
+
+    def test_get_stack_in_progress_status(self):
+        self.source.publish(notification('1', 'CREATE_IN_PROGRESS', event_type='orchestration.stack.create.start'))
+        self.clock.now = 59
+        self.assertEqual(self.notifications.get_stack('1')['stack_status'], 'CREATE_IN_PROGRESS')
+        self.clock.now = 60
+        self.assertIsNone(self.notifications.get_stack('1'))
+
+    def test_get_stack_latest_notification(self):
+        self.source.publish(notification('1', 'CREATE_IN_PROGRESS', event_type='orchestration.stack.create.start'))
+        self.source.publish(notification('1', 'CREATE_COMPLETE'))
+        self.assertEqual(self.notifications.get_stack('1')['stack_status'], 'CREATE_COMPLETE')
+
+    def test_get_stack_with_status_prefixes(self):
+        self.source.publish(notification('1', 'CREATE_COMPLETE'))
+        self.assertIsNone(self.notifications.get_stack('1', status_prefixes=['DELETE_']))
+        self.assertEqual(self.notifications.get_stack('1', status_prefixes=['CREATE_', 'ADOPT_'])['stack_status'], 'CREATE_COMPLETE')
+
+    def test_get_stack_returns_copy(self):
+        self.source.publish(notification('1', 'CREATE_COMPLETE'))
+        self.notifications.get_stack('1')['stack_status'] = 'changed'
+        self.assertEqual(self.notifications.get_stack('1')['stack_status'], 'CREATE_COMPLETE')
+
+    def test_max_size(self):
+        for i in range(15):
+            self.source.publish(notification(str(i), 'CREATE_COMPLETE'))
+        self.assertIsNone(self.notifications.get_stack('0'))
+        self.assertIsNotNone(self.notifications.get_stack('14'))
+
+    def test_stop(self):
+        self.notifications.stop()
+        self.source.publish(notification('1', 'CREATE_COMPLETE'))
+        self.assertIsNone(self.notifications.get_stack('1'))
+
+
+class TestFileNotificationSource(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'notifications.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __wait_for(self, condition, timeout=5):
+        end = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > end:
+                self.fail('Condition not met within {0} seconds'.format(timeout))
+            time.sleep(0.005)
+
+    def test_init_without_path(self):
+        with self.assertRaises(ValueError) as context:
+            FileNotificationSource(None)
+        self.assertEqual(str(context.exception), 'path must be provided')
+
+    def test_follows_new_lines(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps(notification('0', 'CREATE_COMPLETE')) + '\n')
+        source = FileNotificationSource(self.path, poll_interval_seconds=0.01)
+        notifications = StackNotifications(source)
+        notifications.start()
+        try:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(notification('1', 'CREATE_COMPLETE')) + '\n')
+            self.__wait_for(lambda: notifications.get_stack('1') is not None)
+        finally:
+            notifications.stop()
+        # Notifications written before the source started are skipped
+        self.assertIsNone(notifications.get_stack('0'))
+
+
+class TestKafkaNotificationSource(unittest.TestCase):
+
+    def __wait_for(self, condition, timeout=5):
+        end = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > end:
+                self.fail('Condition not met within {0} seconds'.format(timeout))
+            time.sleep(0.005)
+
+    def test_init_without_topics(self):
+        with self.assertRaises(ValueError) as context:
+            KafkaNotificationSource('kafka:9092', topics=[])
+        self.assertEqual(str(context.exception), 'topics must be provided')
+
+    @patch('kafka.KafkaConsumer')
+    def test_receives_failures_from_error_topic(self, mock_consumer_class):
+        failed = notification('1', 'CREATE_FAILED', event_type='orchestration.stack.create.error', state_reason='Quota exceeded')
+        mock_consumer = mock_consumer_class.return_value
+        records = [{'notifications.error-0': [MagicMock(value=json.dumps(failed))]}]
+        mock_consumer.poll.side_effect = lambda timeout_ms: records.pop() if records else time.sleep(timeout_ms / 1000) or {}
+        source = KafkaNotificationSource('kafka:9092', poll_timeout_ms=1)
+        notifications = StackNotifications(source)
+        notifications.start()
+        try:
+            self.__wait_for(lambda: notifications.get_stack('1') is not None)
+        finally:
+            notifications.stop()
+        self.assertEqual(mock_consumer_class.call_args[0], ('notifications.info', 'notifications.error'))
+        stack = notifications.get_stack('1', status_prefixes=['CREATE_'])
+        self.assertEqual(stack['stack_status'], 'CREATE_FAILED')
+        self.assertEqual(stack['stack_status_reason'], 'Quota exceeded')
+
+
+class TestCreateNotificationSource(unittest.TestCase):
+
+    def test_kafka(self):
+        source = create_notification_source('kafka', connection_address='kafka:9092')
+        self.assertIsInstance(source, KafkaNotificationSource)
+        self.assertEqual(source.connection_address, 'kafka:9092')
+        self.assertEqual(source.topics, ['notifications.info', 'notifications.error'])
+
+    def test_kafka_single_topic(self):
+        source = create_notification_source('kafka', connection_address='kafka:9092', topics='notifications.info')
+        self.assertEqual(source.topics, ['notifications.info'])
+
+    def test_kafka_without_connection_address(self):
+        with self.assertRaises(ValueError) as context:
+            create_notification_source('kafka', topics=['notifications.info'])
+        self.assertEqual(str(context.exception), 'connection_address must be provided')
+
+    def test_file(self):
+        source = create_notification_source('file', path='/var/log/notifications.log')
+        self.assertIsInstance(source, FileNotificationSource)
+
+    def test_in_process(self):
+        self.assertIsInstance(create_notification_source('in_process'), InProcessNotificationSource)
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError) as context:
+            create_notification_source('amqp')
+        self.assertEqual(str(context.exception), 'Unsupported notification source: amqp')
@@ -0,0 +1,69 @@
+import time
+import unittest
+import threading
+from unittest.mock import MagicMock
+from osvimdriver.openstack.heat.poller import BatchedStackPoller
+from osvimdriver.openstack.heat.driver import StackNotFoundError
+
+
+class TestBatchedStackPoller(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_heat_driver = MagicMock()
+        self.mock_heat_driver.get_stacks_by_ids.side_effect = lambda stack_ids: [{'id': stack_id, 'stack_status': 'CREATE_IN_PROGRESS'} for stack_id in stack_ids]
+
+    def test_init_invalid_max_batch_size(self):
+        with self.assertRaises(ValueError) as context:
+            BatchedStackPoller(max_batch_size=0)
+        self.assertEqual(str(context.exception), 'max_batch_size must be a positive integer')
+
+    def test_get_stack_without_id(self):
+        poller = BatchedStackPoller()
+        with self.assertRaises(ValueError) as context:
+            poller.get_stack('dl', self.mock_heat_driver, None)
+        self.assertEqual(str(context.exception), 'stack_id must be provided')
+
+    def test_get_stack_single(self):
+        poller = BatchedStackPoller(window_seconds=0)
+        stack = poller.get_stack('dl', self.mock_heat_driver, '1')
+        self.assertEqual(stack, {'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'})
+        self.mock_heat_driver.get_stacks_by_ids.assert_called_once_with(['1'])
+
+    def test_get_stack_concurrent_callers_share_batch(self):
+        poller = BatchedStackPoller(window_seconds=5, max_batch_size=3)
+        results = {}
+        def poll(stack_id):
+            results[stack_id] = poller.get_stack('dl', self.mock_heat_driver, stack_id)
+        threads = [threading.Thread(target=poll, args=(stack_id,)) for stack_id in ['1', '2', '3']]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # The batch is executed as soon as it is full, without waiting for the full window
+        self.assertLess(time.monotonic() - start, 5)
+        self.mock_heat_driver.get_stacks_by_ids.assert_called_once()
+        self.assertEqual(sorted(self.mock_heat_driver.get_stacks_by_ids.call_args[0][0]), ['1', '2', '3'])
+        self.assertEqual(results['2'], {'id': '2', 'stack_status': 'CREATE_IN_PROGRESS'})
+
+    def test_get_stack_separate_batches_per_key(self):
+        poller = BatchedStackPoller(window_seconds=0)
+        poller.get_stack('dlA', self.mock_heat_driver, '1')
+        poller.get_stack('dlB', self.mock_heat_driver, '2')
+        self.assertEqual(self.mock_heat_driver.get_stacks_by_ids.call_count, 2)
+
+    def test_get_stack_missing_from_batch_falls_back_to_get_stack(self):
+        self.mock_heat_driver.get_stacks_by_ids.side_effect = None
+        self.mock_heat_driver.get_stacks_by_ids.return_value = []
+        self.mock_heat_driver.get_stack.side_effect = StackNotFoundError('Not found')
+        poller = BatchedStackPoller(window_seconds=0)
+        with self.assertRaises(StackNotFoundError):
+            poller.get_stack('dl', self.mock_heat_driver, '1')
+        self.mock_heat_driver.get_stack.assert_called_once_with('1', resolve_outputs=False)
+
+    def test_get_stack_batch_error_raised(self):
+        self.mock_heat_driver.get_stacks_by_ids.side_effect = ValueError('Heat unavailable')
+        poller = BatchedStackPoller(window_seconds=0)
+        with self.assertRaises(ValueError) as context:
+            poller.get_stack('dl', self.mock_heat_driver, '1')
+        self.assertEqual(str(context.exception), 'Heat unavailable')
@@ -1,9 +1,24 @@
 import unittest
-from osvimdriver.openstack.heat.template import HeatInputUtil
+import json
+from unittest.mock import MagicMock, patch
+from osvimdriver.openstack.heat.template import HeatInputUtil, HeatParameters, parameters_cache
+from osvimdriver.cache import LRUCache
 from ignition.utils.propvaluemap import PropValueMap
 
+
+class TestHeatParameters(unittest.TestCase):
+
+    def test_key_parts(self):
+        parameters = HeatParameters(['propA', 'keyA_public', 'keyA_private'])
+        self.assertEqual(parameters.names, ['propA', 'keyA_public', 'keyA_private'])
+        self.assertEqual(parameters.key_parts, {'keyA_public': ('keyA', 'publicKey'), 'keyA_private': ('keyA', 'privateKey')})
+
+
 class TestHeatInputUtil(unittest.TestCase):
 
+    def setUp(self):
+        parameters_cache.clear()
+
     def test_filter_used_properties(self):
         util = HeatInputUtil()
         heat_yml = '''
@@ -146,3 +161,79 @@ class TestHeatInputUtil(unittest.TestCase):
         # (and ultimately throw an error if it is)
         new_props = util.filter_used_properties(heat_yml, orig_props)
         self.assertEqual(new_props, {})
+
+    def test_filter_used_properties_stores_parameters(self):
+        mock_store = MagicMock()
+        mock_store.get.return_value = None
+        util = HeatInputUtil(store=mock_store)
+        heat_yml = '''
+        parameters:
+          propA:
+            type: string
+        '''
+        new_props = util.filter_used_properties(heat_yml, {'propA': 'testA', 'propB': 'testB'})
+        self.assertEqual(new_props, {'propA': 'testA'})
+        mock_store.put.assert_called_once()
+        namespace, cache_key, value = mock_store.put.call_args[0]
+        self.assertEqual(namespace, 'heat_parameters')
+        self.assertEqual(json.loads(value.decode('utf-8')), {'propA': None})
+
+    def test_filter_used_properties_uses_stored_parameters(self):
+        mock_store = MagicMock()
+        mock_store.get.return_value = json.dumps({'propB': None}).encode('utf-8')
+        util = HeatInputUtil(store=mock_store)
+        heat_yml = '''
+        parameters:
+          propA:
+            type: string
+        '''
+        new_props = util.filter_used_properties(heat_yml, {'propA': 'testA', 'propB': 'testB'})
+        self.assertEqual(new_props, {'propB': 'testB'})
+        mock_store.put.assert_not_called()
+
+    @patch('osvimdriver.openstack.heat.template.yamlutil.safe_load')
+    def test_filter_used_properties_caches_parameters(self, mock_safe_load):
+        mock_safe_load.return_value = {'parameters': {'propA': {'type': 'string'}}}
+        util = HeatInputUtil()
+        self.assertEqual(util.filter_used_properties('heat', {'propA': 'testA', 'propB': 'testB'}), {'propA': 'testA'})
+        self.assertEqual(HeatInputUtil().filter_used_properties('heat', {'propA': 'otherA'}), {'propA': 'otherA'})
+        mock_safe_load.assert_called_once()
+        HeatInputUtil().filter_used_properties('other heat', {'propA': 'testA'})
+        self.assertEqual(mock_safe_load.call_count, 2)
+
+    def test_filter_used_properties_cached_parameters_before_store(self):
+        mock_store = MagicMock()
+        mock_store.get.return_value = None
+        heat_yml = '''
+        parameters:
+          propA:
+            type: string
+        '''
+        HeatInputUtil(store=mock_store).filter_used_properties(heat_yml, {'propA': 'testA'})
+        HeatInputUtil(store=mock_store).filter_used_properties(heat_yml, {'propA': 'testA'})
+        mock_store.get.assert_called_once()
+        mock_store.put.assert_called_once()
+
+    @patch('osvimdriver.openstack.heat.template.yamlutil.safe_load')
+    def test_filter_used_properties_without_parameters_cache(self, mock_safe_load):
+        mock_safe_load.return_value = {'parameters': {'propA': {'type': 'string'}}}
+        util = HeatInputUtil(parameters_cache=None)
+        util.filter_used_properties('heat', {'propA': 'testA'})
+        util.filter_used_properties('heat', {'propA': 'testA'})
+        self.assertEqual(mock_safe_load.call_count, 2)
+
+    def test_filter_used_properties_cached_key_parts(self):
+        util = HeatInputUtil(parameters_cache=LRUCache(max_size=10))
+        heat_yml = '''
+        parameters:
+          keyA_public:
+            type: string
+          keyA_private:
+            type: string
+        '''
+        prop_value_map = PropValueMap({
+            'keyA': {'type': 'key', 'keyName': 'keyA', 'publicKey': 'pub', 'privateKey': 'priv'}
+        })
+        util.filter_used_properties(heat_yml, prop_value_map)
+        new_props = util.filter_used_properties(heat_yml, prop_value_map)
+        self.assertEqual(new_props, {'keyA_public': 'pub', 'keyA_private': 'priv'})
@@ -0,0 +1,157 @@
+import unittest
+from unittest.mock import MagicMock
+from neutronclient.common import exceptions as neutronexceptions
+from osvimdriver.openstack.neutron.cache import NeutronCache, CachingNeutronDriver
+
+
+class FakeClock():
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestNeutronCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = NeutronCache(ttl_seconds=300, negative_ttl_seconds=30, max_size=10, clock=self.clock)
+
+    def test_get_caches_result(self):
+        loader = MagicMock(return_value={'id': '1'})
+        self.assertEqual(self.cache.get(('loc', 'network', '1'), loader), {'id': '1'})
+        self.assertEqual(self.cache.get(('loc', 'network', '1'), loader), {'id': '1'})
+        loader.assert_called_once()
+
+    def test_get_returns_copies(self):
+        loader = MagicMock(return_value={'id': '1', 'subnets': ['a']})
+        first = self.cache.get(('loc', 'network', '1'), loader)
+        first['subnets'].append('b')
+        second = self.cache.get(('loc', 'network', '1'), loader)
+        self.assertEqual(second, {'id': '1', 'subnets': ['a']})
+
+    def test_get_expires_after_ttl(self):
+        loader = MagicMock(return_value={'id': '1'})
+        self.cache.get(('loc', 'network', '1'), loader)
+        self.clock.now = 300
+        self.cache.get(('loc', 'network', '1'), loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_get_caches_not_found(self):
+        loader = MagicMock(side_effect=neutronexceptions.NotFound('Not found'))
+        with self.assertRaises(neutronexceptions.NotFound):
+            self.cache.get(('loc', 'network', '1'), loader)
+        with self.assertRaises(neutronexceptions.NotFound):
+            self.cache.get(('loc', 'network', '1'), loader)
+        loader.assert_called_once()
+
+    def test_get_not_found_expires_after_negative_ttl(self):
+        loader = MagicMock(side_effect=[neutronexceptions.NotFound('Not found'), {'id': '1'}])
+        with self.assertRaises(neutronexceptions.NotFound):
+            self.cache.get(('loc', 'network', '1'), loader)
+        self.clock.now = 30
+        self.assertEqual(self.cache.get(('loc', 'network', '1'), loader), {'id': '1'})
+        self.assertEqual(loader.call_count, 2)
+
+    def test_get_not_found_not_cached_when_negative_ttl_zero(self):
+        cache = NeutronCache(negative_ttl_seconds=0, clock=self.clock)
+        loader = MagicMock(side_effect=[neutronexceptions.NotFound('Not found'), {'id': '1'}])
+        with self.assertRaises(neutronexceptions.NotFound):
+            cache.get(('loc', 'network', '1'), loader)
+        self.assertEqual(cache.get(('loc', 'network', '1'), loader), {'id': '1'})
+
+    def test_get_other_errors_not_cached(self):
+        loader = MagicMock(side_effect=[neutronexceptions.NeutronClientException('Error'), {'id': '1'}])
+        with self.assertRaises(neutronexceptions.NeutronClientException):
+            self.cache.get(('loc', 'network', '1'), loader)
+        self.assertEqual(self.cache.get(('loc', 'network', '1'), loader), {'id': '1'})
+
+    def test_max_size(self):
+        for i in range(15):
+            self.cache.get(('loc', 'network', str(i)), MagicMock(return_value={'id': str(i)}))
+        self.assertEqual(len(self.cache), 10)
+
+    def test_invalidate_location(self):
+        self.cache.put(('locA', 'network', '1'), {'id': '1'})
+        self.cache.put(('locB', 'network', '1'), {'id': '1'})
+        self.cache.invalidate('locA')
+        self.assertEqual(self.cache.lookup(('locA', 'network', '1')), (False, None))
+        self.assertEqual(self.cache.lookup(('locB', 'network', '1')), (True, {'id': '1'}))
+
+    def test_invalidate_all(self):
+        self.cache.put(('locA', 'network', '1'), {'id': '1'})
+        self.cache.put(('locB', 'network', '1'), {'id': '1'})
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestCachingNeutronDriver(unittest.TestCase):
+
+    def setUp(self):
+        self.neutron_driver = MagicMock()
+        self.cache = NeutronCache()
+        self.driver = CachingNeutronDriver(self.neutron_driver, self.cache, 'loc')
+
+    def test_get_network_by_id(self):
+        self.neutron_driver.get_network_by_id.return_value = {'id': '1'}
+        self.assertEqual(self.driver.get_network_by_id('1'), {'id': '1'})
+        self.assertEqual(self.driver.get_network_by_id('1'), {'id': '1'})
+        self.neutron_driver.get_network_by_id.assert_called_once_with('1')
+
+    def test_get_network_by_id_none(self):
+        with self.assertRaises(ValueError) as context:
+            self.driver.get_network_by_id(None)
+        self.assertEqual(str(context.exception), 'network_id must be provided')
+
+    def test_get_network_by_name_keyed_by_fields(self):
+        self.neutron_driver.get_network_by_name.return_value = {'id': '1', 'name': 'net'}
+        self.driver.get_network_by_name('net', fields=['id', 'name'])
+        self.driver.get_network_by_name('net', fields=['id', 'name'])
+        self.driver.get_network_by_name('net')
+        self.assertEqual(self.neutron_driver.get_network_by_name.call_count, 2)
+        self.neutron_driver.get_network_by_name.assert_any_call('net', fields=['id', 'name'])
+        self.neutron_driver.get_network_by_name.assert_any_call('net', fields=None)
+
+    def test_get_network_by_name_not_found_cached(self):
+        self.neutron_driver.get_network_by_name.side_effect = neutronexceptions.NotFound('Unable to find network with name net')
+        with self.assertRaises(neutronexceptions.NotFound):
+            self.driver.get_network_by_name('net')
+        with self.assertRaises(neutronexceptions.NotFound):
+            self.driver.get_network_by_name('net')
+        self.neutron_driver.get_network_by_name.assert_called_once()
+
+    def test_get_subnet_by_id(self):
+        self.neutron_driver.get_subnet_by_id.return_value = {'id': 'a'}
+        self.driver.get_subnet_by_id('a')
+        self.assertEqual(self.driver.get_subnet_by_id('a'), {'id': 'a'})
+        self.neutron_driver.get_subnet_by_id.assert_called_once_with('a')
+
+    def test_get_subnets_by_ids_retrieves_missing_only(self):
+        self.neutron_driver.get_subnet_by_id.return_value = {'id': 'a'}
+        self.driver.get_subnet_by_id('a')
+        self.neutron_driver.get_subnets_by_ids.return_value = [{'id': 'b'}]
+        subnets = self.driver.get_subnets_by_ids(['a', 'b'])
+        self.assertEqual(subnets, [{'id': 'a'}, {'id': 'b'}])
+        self.neutron_driver.get_subnets_by_ids.assert_called_once_with(['b'])
+        self.assertEqual(self.driver.get_subnet_by_id('b'), {'id': 'b'})
+        self.neutron_driver.get_subnet_by_id.assert_called_once()
+
+    def test_get_subnets_by_ids_all_cached(self):
+        self.neutron_driver.get_subnets_by_ids.return_value = [{'id': 'a'}]
+        self.driver.get_subnets_by_ids(['a'])
+        self.assertEqual(self.driver.get_subnets_by_ids(['a']), [{'id': 'a'}])
+        self.neutron_driver.get_subnets_by_ids.assert_called_once()
+
+    def test_get_subnets_by_ids_none(self):
+        with self.assertRaises(ValueError) as context:
+            self.driver.get_subnets_by_ids(None)
+        self.assertEqual(str(context.exception), 'subnet_ids must be provided')
+
+    def test_invalidate(self):
+        self.neutron_driver.get_network_by_id.return_value = {'id': '1'}
+        self.driver.get_network_by_id('1')
+        self.driver.invalidate()
+        self.driver.get_network_by_id('1')
+        self.assertEqual(self.neutron_driver.get_network_by_id.call_count, 2)
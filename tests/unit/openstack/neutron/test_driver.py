@@ -27,11 +27,39 @@ class TestNeutronDriver(unittest.TestCase):
     @patch('osvimdriver.openstack.neutron.driver.neutronclient.Client')
     def test_get_network_by_name(self, mock_neutron_client_init):
         mock_neutron_client = mock_neutron_client_init.return_value
-        mock_neutron_client.list_networks.return_value = {'networks': [{'name': 'networkA'}, {'name': 'networkB'}]}
+        mock_neutron_client.list_networks.return_value = iter([{'networks': [{'name': 'networkB'}]}])
+        mock_session = MagicMock()
+        neutron_driver = NeutronDriver(mock_session)
+        network = neutron_driver.get_network_by_name('networkB')
+        mock_neutron_client.list_networks.assert_called_once_with(retrieve_all=False, name='networkB')
+        self.assertEqual(network, {'name': 'networkB'})
+
+    @patch('osvimdriver.openstack.neutron.driver.neutronclient.Client')
+    def test_get_network_by_name_with_fields(self, mock_neutron_client_init):
+        mock_neutron_client = mock_neutron_client_init.return_value
+        mock_neutron_client.list_networks.return_value = iter([{'networks': [{'id': '123', 'name': 'networkB'}]}])
+        mock_session = MagicMock()
+        neutron_driver = NeutronDriver(mock_session)
+        network = neutron_driver.get_network_by_name('networkB', fields=('id', 'name'))
+        mock_neutron_client.list_networks.assert_called_once_with(retrieve_all=False, name='networkB', fields=['id', 'name'])
+        self.assertEqual(network, {'id': '123', 'name': 'networkB'})
+
+    @patch('osvimdriver.openstack.neutron.driver.neutronclient.Client')
+    def test_get_network_by_name_reads_all_pages(self, mock_neutron_client_init):
+        mock_neutron_client = mock_neutron_client_init.return_value
+        mock_neutron_client.list_networks.return_value = iter([{'networks': []}, {'networks': [{'name': 'networkB'}]}])
+        mock_session = MagicMock()
+        neutron_driver = NeutronDriver(mock_session)
+        network = neutron_driver.get_network_by_name('networkB')
+        self.assertEqual(network, {'name': 'networkB'})
+
+    @patch('osvimdriver.openstack.neutron.driver.neutronclient.Client')
+    def test_get_network_by_name_ignores_other_names(self, mock_neutron_client_init):
+        mock_neutron_client = mock_neutron_client_init.return_value
+        mock_neutron_client.list_networks.return_value = iter([{'networks': [{'name': 'networkA'}, {'name': 'networkB'}]}])
         mock_session = MagicMock()
         neutron_driver = NeutronDriver(mock_session)
         network = neutron_driver.get_network_by_name('networkB')
-        mock_neutron_client.list_networks.assert_called_once()
         self.assertEqual(network, {'name': 'networkB'})
 
     @patch('osvimdriver.openstack.neutron.driver.neutronclient.Client')
@@ -45,7 +73,7 @@ class TestNeutronDriver(unittest.TestCase):
     @patch('osvimdriver.openstack.neutron.driver.neutronclient.Client')
     def test_get_network_by_name_not_unique_result_fails(self, mock_neutron_client_init):
         mock_neutron_client = mock_neutron_client_init.return_value
-        mock_neutron_client.list_networks.return_value = {'networks': [{'name': 'networkA'}, {'name': 'networkA'}]}
+        mock_neutron_client.list_networks.return_value = iter([{'networks': [{'name': 'networkA'}]}, {'networks': [{'name': 'networkA'}]}])
         mock_session = MagicMock()
         neutron_driver = NeutronDriver(mock_session)
         with self.assertRaises(neutronexceptions.NeutronClientNoUniqueMatch) as context:
@@ -55,7 +83,7 @@ class TestNeutronDriver(unittest.TestCase):
     @patch('osvimdriver.openstack.neutron.driver.neutronclient.Client')
     def test_get_network_by_name_not_found_fails(self, mock_neutron_client_init):
         mock_neutron_client = mock_neutron_client_init.return_value
-        mock_neutron_client.list_networks.return_value = {'networks': [{'name': 'networkA'}]}
+        mock_neutron_client.list_networks.return_value = iter([{'networks': []}])
         mock_session = MagicMock()
         neutron_driver = NeutronDriver(mock_session)
         with self.assertRaises(neutronexceptions.NotFound) as context:
@@ -79,3 +107,29 @@ class TestNeutronDriver(unittest.TestCase):
         with self.assertRaises(ValueError) as context:
             neutron_driver.get_subnet_by_id(None)
         self.assertEqual(str(context.exception), 'subnet_id must be provided')
+
+    @patch('osvimdriver.openstack.neutron.driver.neutronclient.Client')
+    def test_get_subnets_by_ids(self, mock_neutron_client_init):
+        mock_neutron_client = mock_neutron_client_init.return_value
+        mock_neutron_client.list_subnets.return_value = {'subnets': [{'id': 'subnetA'}, {'id': 'subnetB'}]}
+        mock_session = MagicMock()
+        neutron_driver = NeutronDriver(mock_session)
+        subnets = neutron_driver.get_subnets_by_ids(('subnetA', 'subnetB'))
+        mock_neutron_client.list_subnets.assert_called_once_with(id=['subnetA', 'subnetB'])
+        self.assertEqual(subnets, [{'id': 'subnetA'}, {'id': 'subnetB'}])
+
+    @patch('osvimdriver.openstack.neutron.driver.neutronclient.Client')
+    def test_get_subnets_by_ids_with_no_ids(self, mock_neutron_client_init):
+        mock_neutron_client = mock_neutron_client_init.return_value
+        mock_session = MagicMock()
+        neutron_driver = NeutronDriver(mock_session)
+        self.assertEqual(neutron_driver.get_subnets_by_ids([]), [])
+        mock_neutron_client.list_subnets.assert_not_called()
+
+    @patch('osvimdriver.openstack.neutron.driver.neutronclient.Client')
+    def test_get_subnets_by_ids_without_ids_fails(self, mock_neutron_client_init):
+        mock_session = MagicMock()
+        neutron_driver = NeutronDriver(mock_session)
+        with self.assertRaises(ValueError) as context:
+            neutron_driver.get_subnets_by_ids(None)
+        self.assertEqual(str(context.exception), 'subnet_ids must be provided')
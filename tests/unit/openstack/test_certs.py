@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from osvimdriver.openstack.certs import CertificateStore
+
+
+class TestCertificateStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_get_path_without_content(self):
+        store = CertificateStore(self.tmp_dir)
+        with self.assertRaises(ValueError) as context:
+            store.get_path(None)
+        self.assertEqual(str(context.exception), 'content must be provided')
+
+    def test_get_path_writes_content(self):
+        store = CertificateStore(self.tmp_dir)
+        path = store.get_path('certA')
+        self.assertEqual(os.path.dirname(path), self.tmp_dir)
+        with open(path, 'r') as f:
+            self.assertEqual(f.read(), 'certA')
+        self.assertEqual(os.stat(path).st_mode & 0o077, 0)
+
+    def test_get_path_writes_content_once(self):
+        store = CertificateStore(self.tmp_dir)
+        first_path = store.get_path('certA')
+        with patch('osvimdriver.openstack.certs.tempfile.mkstemp') as mock_mkstemp:
+            second_path = store.get_path('certA')
+            mock_mkstemp.assert_not_called()
+        self.assertEqual(first_path, second_path)
+
+    def test_get_path_different_content(self):
+        store = CertificateStore(self.tmp_dir)
+        self.assertNotEqual(store.get_path('certA'), store.get_path('certB'))
+
+    def test_get_path_creates_directory(self):
+        store = CertificateStore()
+        path = store.get_path('certA')
+        self.assertTrue(os.path.exists(path))
+        self.assertTrue(os.path.basename(os.path.dirname(path)).startswith('ovd_certs_'))
+        shutil.rmtree(os.path.dirname(path))
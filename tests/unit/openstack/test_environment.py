@@ -1,8 +1,11 @@
 import os
+import time
+import threading
 import unittest
 import yaml
 import tests.unit.openstack.certs as certs
 from osvimdriver.openstack.environment import OpenstackDeploymentLocationTranslator, OpenstackDeploymentLocation, OpenstackPasswordAuth, OS_URL_PROP, AUTH_ENABLED_PROP, AUTH_API_PROP
+from osvimdriver.openstack.neutron.cache import NeutronCache, CachingNeutronDriver
 from unittest.mock import patch, MagicMock
 
 
@@ -21,6 +24,14 @@ class TestOpenstackPasswordAuth(unittest.TestCase):
         self.assertEqual(os_auth, mock_password)
         mock_keystone_password_init.assert_called_with(auth_url='http://testip/identity/v3', username='test', password='secret')
 
+    @patch('osvimdriver.openstack.environment.SharedTokenPassword')
+    def test_build_os_auth_with_token_cache(self, mock_shared_token_password_init):
+        mock_token_cache = MagicMock()
+        auth = OpenstackPasswordAuth('identity/v3', auth_properties={'username': 'test', 'password': 'secret'}, token_cache=mock_token_cache)
+        os_auth = auth.build_os_auth('http://testip')
+        self.assertEqual(os_auth, mock_shared_token_password_init.return_value)
+        mock_shared_token_password_init.assert_called_with(mock_token_cache, auth_url='http://testip/identity/v3', username='test', password='secret')
+
 
 class TestOpenstackDeploymentLocation(unittest.TestCase):
 
@@ -48,6 +59,29 @@ class TestOpenstackDeploymentLocation(unittest.TestCase):
         mock_keystone_session_init.assert_called_once_with(auth=mock_os_auth)
         self.assertEqual(session, mock_keystone_session)
 
+    @patch('osvimdriver.openstack.environment.HeatDriver')
+    @patch('osvimdriver.openstack.environment.keystonesession.Session')
+    def test_get_session_from_concurrent_threads_creates_one_session(self, mock_keystone_session_init, mock_heat_driver_init):
+        def slow_session(**kwargs):
+            time.sleep(0.05)
+            return MagicMock()
+        mock_keystone_session_init.side_effect = slow_session
+        location = OpenstackDeploymentLocation('testdl', 'http://testip', MagicMock())
+        sessions = []
+        heat_drivers = []
+        def use_location():
+            sessions.append(location.get_session())
+            heat_drivers.append(location.heat_driver)
+        threads = [threading.Thread(target=use_location) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        mock_keystone_session_init.assert_called_once()
+        mock_heat_driver_init.assert_called_once()
+        self.assertEqual(len(set(id(session) for session in sessions)), 1)
+        self.assertEqual(len(set(id(heat_driver) for heat_driver in heat_drivers)), 1)
+
     @patch('osvimdriver.openstack.environment.keystonesession.Session')
     def test_get_session_existing(self, mock_keystone_session_init):
         mock_os_auth = MagicMock()
@@ -113,6 +147,28 @@ class TestOpenstackDeploymentLocation(unittest.TestCase):
         second_neutron_driver = location.neutron_driver
         self.assertEqual(second_neutron_driver, first_neutron_driver)
 
+    @patch('osvimdriver.openstack.environment.keystonesession.Session')
+    @patch('osvimdriver.openstack.environment.NeutronDriver')
+    def test_get_neutron_driver_with_cache(self, mock_neutron_driver_init, mock_keystone_session_init):
+        mock_neutron_driver = mock_neutron_driver_init.return_value
+        mock_neutron_driver.get_network_by_id.return_value = {'id': '1'}
+        neutron_cache = NeutronCache()
+        location = OpenstackDeploymentLocation('testdl', 'http://testip', None, neutron_cache=neutron_cache, neutron_cache_key='abc')
+        neutron_driver = location.neutron_driver
+        self.assertIsInstance(neutron_driver, CachingNeutronDriver)
+        self.assertEqual(neutron_driver.neutron_driver, mock_neutron_driver)
+        self.assertEqual(neutron_driver.location_key, 'abc')
+        neutron_driver.get_network_by_id('1')
+        neutron_driver.get_network_by_id('1')
+        mock_neutron_driver.get_network_by_id.assert_called_once_with('1')
+        location.invalidate_neutron_cache()
+        neutron_driver.get_network_by_id('1')
+        self.assertEqual(mock_neutron_driver.get_network_by_id.call_count, 2)
+
+    def test_invalidate_neutron_cache_without_cache(self):
+        location = OpenstackDeploymentLocation('testdl', 'http://testip', None)
+        location.invalidate_neutron_cache()
+
     @patch('osvimdriver.openstack.environment.keystonesession.Session')
     def test_get_session_with_certs(self, mock_keystone_session_init):
         mock_os_auth = MagicMock()
@@ -140,24 +196,44 @@ class TestOpenstackDeploymentLocation(unittest.TestCase):
             location.close()
 
     @patch('osvimdriver.openstack.environment.keystonesession.Session')
-    def test_close_session_with_certs_removes_files(self, mock_keystone_session_init):
+    def test_close_session_with_certs_keeps_files(self, mock_keystone_session_init):
         mock_os_auth = MagicMock()
         mock_auth = MagicMock()
         mock_auth.build_os_auth.return_value = mock_os_auth
         mock_keystone_session = mock_keystone_session_init.return_value
         location = OpenstackDeploymentLocation('testdl', 'http://testip', mock_auth, ca_cert='cacert', client_cert='clientcert', client_key='clientkey')
-        try:
-            created_session = location.create_session()
-            mock_keystone_session_init.assert_called_once_with(auth=mock_os_auth, verify=location._OpenstackDeploymentLocation__ca_cert_path, cert=(location._OpenstackDeploymentLocation__client_cert_path, location._OpenstackDeploymentLocation__client_key_path))
-            self.assertTrue(os.path.exists(location._OpenstackDeploymentLocation__ca_cert_path))
-            self.assertTrue(os.path.exists(location._OpenstackDeploymentLocation__client_cert_path))
-            self.assertTrue(os.path.exists(location._OpenstackDeploymentLocation__client_key_path))
-            location.close()
-            self.assertFalse(os.path.exists(location._OpenstackDeploymentLocation__ca_cert_path))
-            self.assertFalse(os.path.exists(location._OpenstackDeploymentLocation__client_cert_path))
-            self.assertFalse(os.path.exists(location._OpenstackDeploymentLocation__client_key_path))
-        finally:
-            location.close()
+        created_session = location.create_session()
+        mock_keystone_session_init.assert_called_once_with(auth=mock_os_auth, verify=location._OpenstackDeploymentLocation__ca_cert_path, cert=(location._OpenstackDeploymentLocation__client_cert_path, location._OpenstackDeploymentLocation__client_key_path))
+        location.close()
+        mock_keystone_session.session.close.assert_called_once()
+        # Certificate files are shared with other locations using the same content, so are not removed
+        self.assertTrue(os.path.exists(location._OpenstackDeploymentLocation__ca_cert_path))
+        self.assertTrue(os.path.exists(location._OpenstackDeploymentLocation__client_cert_path))
+        self.assertTrue(os.path.exists(location._OpenstackDeploymentLocation__client_key_path))
+
+    @patch('osvimdriver.openstack.environment.keystonesession.Session')
+    def test_create_session_reuses_cert_files_for_same_content(self, mock_keystone_session_init):
+        mock_auth = MagicMock()
+        mock_auth.build_os_auth.return_value = MagicMock()
+        first_location = OpenstackDeploymentLocation('testdl', 'http://testip', mock_auth, ca_cert='cacert')
+        second_location = OpenstackDeploymentLocation('testdl', 'http://testip', mock_auth, ca_cert='cacert')
+        first_location.create_session()
+        second_location.create_session()
+        self.assertEqual(first_location._OpenstackDeploymentLocation__ca_cert_path, second_location._OpenstackDeploymentLocation__ca_cert_path)
+
+    @patch('osvimdriver.openstack.environment.keystonesession.Session')
+    def test_close_pooled_location(self, mock_keystone_session_init):
+        mock_keystone_session = mock_keystone_session_init.return_value
+        mock_auth = MagicMock()
+        mock_auth.build_os_auth.return_value = MagicMock()
+        location = OpenstackDeploymentLocation('testdl', 'http://testip', mock_auth)
+        location.pool = MagicMock()
+        location.create_session()
+        location.close()
+        location.pool.release.assert_called_once_with(location)
+        mock_keystone_session.session.close.assert_not_called()
+        location.dispose()
+        mock_keystone_session.session.close.assert_called_once()
 
 class TestOpenstackDeploymentLocationTranslator(unittest.TestCase):
 
@@ -227,6 +303,42 @@ class TestOpenstackDeploymentLocationTranslator(unittest.TestCase):
         self.assertEqual(openstack_auth.auth_properties['domain_id'], 'testdomain')
         self.assertEqual(len(openstack_auth.auth_properties), 3)
 
+    def test_from_deployment_location_passes_token_cache(self):
+        mock_token_cache = MagicMock()
+        translator = OpenstackDeploymentLocationTranslator(token_cache=mock_token_cache)
+        openstack_location = translator.from_deployment_location({'name': 'testdl', 'properties': {
+            OS_URL_PROP: 'testip',
+            AUTH_API_PROP: 'identity/v3',
+            'os_auth_username': 'test'
+        }})
+        self.assertEqual(openstack_location._OpenstackDeploymentLocation__auth.token_cache, mock_token_cache)
+
+    def test_from_deployment_location_passes_persistent_store(self):
+        mock_persistent_store = MagicMock()
+        translator = OpenstackDeploymentLocationTranslator(persistent_store=mock_persistent_store)
+        openstack_location = translator.from_deployment_location({'name': 'testdl', 'properties': {
+            OS_URL_PROP: 'testip',
+            AUTH_ENABLED_PROP: False
+        }})
+        self.assertEqual(openstack_location.persistent_store, mock_persistent_store)
+        self.assertEqual(openstack_location.get_heat_input_util().store, mock_persistent_store)
+
+    def test_from_deployment_location_passes_neutron_cache(self):
+        neutron_cache = NeutronCache()
+        translator = OpenstackDeploymentLocationTranslator(neutron_cache=neutron_cache)
+        deployment_location = {'name': 'testdl', 'properties': {
+            OS_URL_PROP: 'testip',
+            AUTH_ENABLED_PROP: False
+        }}
+        openstack_location = translator.from_deployment_location(deployment_location)
+        self.assertEqual(openstack_location.neutron_cache, neutron_cache)
+        changed_location = translator.from_deployment_location({'name': 'testdl', 'properties': {
+            OS_URL_PROP: 'otherip',
+            AUTH_ENABLED_PROP: False
+        }})
+        self.assertNotEqual(openstack_location.neutron_cache_key, changed_location.neutron_cache_key)
+        self.assertEqual(openstack_location.neutron_cache_key, translator.from_deployment_location(deployment_location).neutron_cache_key)
+
     def test_from_deployment_location_with_certs(self):
         translator = OpenstackDeploymentLocationTranslator()
         certs_dir = os.path.dirname(os.path.abspath(certs.__file__))
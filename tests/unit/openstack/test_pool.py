@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import MagicMock
+from osvimdriver.openstack.pool import OpenstackLocationPool, fingerprint_deployment_location
+
+
+class TestFingerprintDeploymentLocation(unittest.TestCase):
+
+    def test_fingerprint_ignores_property_order(self):
+        first = fingerprint_deployment_location({'name': 'testdl', 'properties': {'os_api_url': 'testip', 'os_auth_username': 'test'}})
+        second = fingerprint_deployment_location({'name': 'testdl', 'properties': {'os_auth_username': 'test', 'os_api_url': 'testip'}})
+        self.assertEqual(first, second)
+
+    def test_fingerprint_changes_with_properties(self):
+        first = fingerprint_deployment_location({'name': 'testdl', 'properties': {'os_auth_password': 'secret'}})
+        second = fingerprint_deployment_location({'name': 'testdl', 'properties': {'os_auth_password': 'new-secret'}})
+        self.assertNotEqual(first, second)
+
+
+class TestOpenstackLocationPool(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_location_translator = MagicMock()
+        self.mock_location_translator.from_deployment_location.side_effect = lambda dl: MagicMock(name=dl['name'])
+
+    def test_init_without_translator(self):
+        with self.assertRaises(ValueError) as context:
+            OpenstackLocationPool(None)
+        self.assertEqual(str(context.exception), 'location_translator must be provided')
+
+    def test_from_deployment_location_reuses_location(self):
+        pool = OpenstackLocationPool(self.mock_location_translator)
+        deployment_location = {'name': 'testdl', 'properties': {'os_api_url': 'testip'}}
+        first = pool.from_deployment_location(deployment_location)
+        second = pool.from_deployment_location({'name': 'testdl', 'properties': {'os_api_url': 'testip'}})
+        self.assertIs(first, second)
+        self.assertIs(first.pool, pool)
+        self.assertEqual(pool.leases(first), 2)
+        self.mock_location_translator.from_deployment_location.assert_called_once_with(deployment_location)
+
+    def test_from_deployment_location_different_properties(self):
+        pool = OpenstackLocationPool(self.mock_location_translator)
+        first = pool.from_deployment_location({'name': 'testdl', 'properties': {'os_api_url': 'testip'}})
+        second = pool.from_deployment_location({'name': 'testdl', 'properties': {'os_api_url': 'otherip'}})
+        self.assertIsNot(first, second)
+        self.assertEqual(len(pool), 2)
+
+    def test_disposes_least_recently_used_location(self):
+        pool = OpenstackLocationPool(self.mock_location_translator, max_size=1)
+        first = pool.from_deployment_location({'name': 'dlA'})
+        pool.release(first)
+        second = pool.from_deployment_location({'name': 'dlB'})
+        first.dispose.assert_called_once()
+        second.dispose.assert_not_called()
+        self.assertEqual(len(pool), 1)
+
+    def test_clear_disposes_locations(self):
+        pool = OpenstackLocationPool(self.mock_location_translator)
+        location = pool.from_deployment_location({'name': 'dlA'})
+        pool.release(location)
+        pool.clear()
+        location.dispose.assert_called_once()
+        self.assertEqual(len(pool), 0)
+
+    def test_release_does_not_dispose_pooled_location(self):
+        pool = OpenstackLocationPool(self.mock_location_translator)
+        location = pool.from_deployment_location({'name': 'dlA'})
+        pool.release(location)
+        location.dispose.assert_not_called()
+        self.assertEqual(pool.leases(location), 0)
+        self.assertIs(pool.from_deployment_location({'name': 'dlA'}), location)
+
+    def test_defers_dispose_of_removed_location_until_released(self):
+        pool = OpenstackLocationPool(self.mock_location_translator, max_size=1)
+        first = pool.from_deployment_location({'name': 'dlA'})
+        pool.from_deployment_location({'name': 'dlA'})
+        pool.from_deployment_location({'name': 'dlB'})
+        self.assertEqual(len(pool), 1)
+        first.dispose.assert_not_called()
+        pool.release(first)
+        first.dispose.assert_not_called()
+        pool.release(first)
+        first.dispose.assert_called_once()
+
+    def test_clear_defers_dispose_of_leased_location(self):
+        pool = OpenstackLocationPool(self.mock_location_translator)
+        location = pool.from_deployment_location({'name': 'dlA'})
+        pool.clear()
+        location.dispose.assert_not_called()
+        pool.release(location)
+        location.dispose.assert_called_once()
@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+import datetime
+from unittest.mock import patch, MagicMock
+from keystoneauth1 import access
+from osvimdriver.openstack.tokens import FileTokenCache, SharedTokenPassword
+
+
+def build_access_info(auth_token, expires_in_seconds):
+    expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=expires_in_seconds)
+    body = {'token': {'expires_at': expires_at.strftime('%Y-%m-%dT%H:%M:%S.000000Z'), 'methods': ['password']}}
+    return access.create(body=body, auth_token=auth_token)
+
+
+class TestFileTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'tokens')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_init_without_directory(self):
+        with self.assertRaises(ValueError) as context:
+            FileTokenCache(None)
+        self.assertEqual(str(context.exception), 'directory must be provided')
+
+    def test_init_creates_directory(self):
+        FileTokenCache(self.cache_dir)
+        self.assertTrue(os.path.isdir(self.cache_dir))
+
+    def test_save_and_load(self):
+        cache = FileTokenCache(self.cache_dir)
+        self.assertIsNone(cache.load('keyA'))
+        cache.save('keyA', 'stateA')
+        self.assertEqual(cache.load('keyA'), 'stateA')
+        self.assertEqual(FileTokenCache(self.cache_dir).load('keyA'), 'stateA')
+
+    def test_saved_files_only_readable_by_owner(self):
+        cache = FileTokenCache(self.cache_dir)
+        cache.save('keyA', 'stateA')
+        json_files = [f for f in os.listdir(self.cache_dir) if f.endswith('.json')]
+        self.assertEqual(len(json_files), 1)
+        mode = os.stat(os.path.join(self.cache_dir, json_files[0])).st_mode
+        self.assertEqual(mode & 0o077, 0)
+
+    def test_remove(self):
+        cache = FileTokenCache(self.cache_dir)
+        cache.save('keyA', 'stateA')
+        cache.remove('keyA')
+        self.assertIsNone(cache.load('keyA'))
+
+    def test_remove_with_expected_auth_state_keeps_replaced_state(self):
+        cache = FileTokenCache(self.cache_dir)
+        cache.save('keyA', 'newState')
+        cache.remove('keyA', expected_auth_state='oldState')
+        self.assertEqual(cache.load('keyA'), 'newState')
+        cache.remove('keyA', expected_auth_state='newState')
+        self.assertIsNone(cache.load('keyA'))
+
+
+class TestSharedTokenPassword(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = FileTokenCache(self.tmp_dir, refresh_margin_seconds=300)
+        self.auth_props = {'auth_url': 'http://testip/identity/v3', 'username': 'test', 'password': 'secret', 'user_domain_name': 'default'}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_get_access_authenticates_and_caches_token(self):
+        auth = SharedTokenPassword(self.cache, **self.auth_props)
+        with patch.object(SharedTokenPassword, 'get_auth_ref', return_value=build_access_info('tokenA', 3600)) as mock_get_auth_ref:
+            access_info = auth.get_access(MagicMock())
+        self.assertEqual(access_info.auth_token, 'tokenA')
+        mock_get_auth_ref.assert_called_once()
+        self.assertIsNotNone(self.cache.load(auth.get_cache_id()))
+
+    def test_get_access_uses_token_cached_by_another_process(self):
+        first_auth = SharedTokenPassword(self.cache, **self.auth_props)
+        second_auth = SharedTokenPassword(self.cache, **self.auth_props)
+        with patch.object(SharedTokenPassword, 'get_auth_ref', return_value=build_access_info('tokenA', 3600)) as mock_get_auth_ref:
+            first_auth.get_access(MagicMock())
+            access_info = second_auth.get_access(MagicMock())
+        self.assertEqual(access_info.auth_token, 'tokenA')
+        mock_get_auth_ref.assert_called_once()
+
+    def test_get_access_refreshes_token_expiring_within_margin(self):
+        first_auth = SharedTokenPassword(self.cache, **self.auth_props)
+        second_auth = SharedTokenPassword(self.cache, **self.auth_props)
+        with patch.object(SharedTokenPassword, 'get_auth_ref', side_effect=[build_access_info('tokenA', 200), build_access_info('tokenB', 3600)]) as mock_get_auth_ref:
+            first_auth.get_access(MagicMock())
+            access_info = second_auth.get_access(MagicMock())
+        self.assertEqual(access_info.auth_token, 'tokenB')
+        self.assertEqual(mock_get_auth_ref.call_count, 2)
+
+    def test_get_access_ignores_invalid_cached_token(self):
+        auth = SharedTokenPassword(self.cache, **self.auth_props)
+        self.cache.save(auth.get_cache_id(), 'not-json')
+        with patch.object(SharedTokenPassword, 'get_auth_ref', return_value=build_access_info('tokenA', 3600)):
+            access_info = auth.get_access(MagicMock())
+        self.assertEqual(access_info.auth_token, 'tokenA')
+
+    def test_invalidate_removes_cached_token(self):
+        auth = SharedTokenPassword(self.cache, **self.auth_props)
+        with patch.object(SharedTokenPassword, 'get_auth_ref', return_value=build_access_info('tokenA', 3600)):
+            auth.get_access(MagicMock())
+        self.assertTrue(auth.invalidate())
+        self.assertIsNone(self.cache.load(auth.get_cache_id()))
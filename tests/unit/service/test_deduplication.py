@@ -0,0 +1,86 @@
+import time
+import threading
+import unittest
+from unittest.mock import MagicMock
+from osvimdriver.service.deduplication import CreateDeduplicator
+
+
+class TestCreateDeduplicator(unittest.TestCase):
+
+    def setUp(self):
+        self.deduplicator = CreateDeduplicator()
+        self.heat_driver = MagicMock()
+        self.heat_driver.get_stack_by_name.return_value = None
+
+    def test_create_new_stack(self):
+        create_stack = MagicMock(return_value='1')
+        self.assertEqual(self.deduplicator.create(('loc', 'stackA'), self.heat_driver, 'stackA', create_stack), '1')
+        self.heat_driver.get_stack_by_name.assert_called_once_with('stackA')
+        create_stack.assert_called_once()
+        self.assertEqual(self.deduplicator.in_flight_count(), 0)
+
+    def test_create_returns_existing_stack(self):
+        self.heat_driver.get_stack_by_name.return_value = {'id': '1', 'stack_name': 'stackA'}
+        create_stack = MagicMock()
+        self.assertEqual(self.deduplicator.create(('loc', 'stackA'), self.heat_driver, 'stackA', create_stack), '1')
+        create_stack.assert_not_called()
+
+    def test_create_raises_error(self):
+        create_stack = MagicMock(side_effect=ValueError('Invalid template'))
+        with self.assertRaises(ValueError):
+            self.deduplicator.create(('loc', 'stackA'), self.heat_driver, 'stackA', create_stack)
+        self.assertEqual(self.deduplicator.in_flight_count(), 0)
+
+    def test_concurrent_creates_coalesced(self):
+        started = threading.Event()
+        release = threading.Event()
+        def create_stack():
+            started.set()
+            release.wait(5)
+            return '1'
+        results = []
+        first = threading.Thread(target=lambda: results.append(self.deduplicator.create(('loc', 'stackA'), self.heat_driver, 'stackA', create_stack)))
+        first.start()
+        started.wait(5)
+        duplicate_create_stack = MagicMock()
+        second = threading.Thread(target=lambda: results.append(self.deduplicator.create(('loc', 'stackA'), self.heat_driver, 'stackA', duplicate_create_stack)))
+        second.start()
+        # Give the duplicate time to join the in-flight create
+        time.sleep(0.1)
+        release.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual(results, ['1', '1'])
+        duplicate_create_stack.assert_not_called()
+        self.heat_driver.get_stack_by_name.assert_called_once()
+
+    def test_concurrent_creates_share_error(self):
+        started = threading.Event()
+        release = threading.Event()
+        def create_stack():
+            started.set()
+            release.wait(5)
+            raise ValueError('Invalid template')
+        errors = []
+        def create(func):
+            try:
+                self.deduplicator.create(('loc', 'stackA'), self.heat_driver, 'stackA', func)
+            except ValueError as e:
+                errors.append(e)
+        first = threading.Thread(target=create, args=(create_stack,))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=create, args=(MagicMock(),))
+        second.start()
+        # Give the duplicate time to join the in-flight create
+        time.sleep(0.1)
+        release.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual(len(errors), 2)
+
+    def test_different_keys_not_coalesced(self):
+        self.deduplicator.create(('locA', 'stackA'), self.heat_driver, 'stackA', MagicMock(return_value='1'))
+        create_stack = MagicMock(return_value='2')
+        self.assertEqual(self.deduplicator.create(('locB', 'stackA'), self.heat_driver, 'stackA', create_stack), '2')
+        create_stack.assert_called_once()
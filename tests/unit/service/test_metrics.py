@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from osvimdriver.metrics import DriverMetrics, get_metrics, set_metrics
+from osvimdriver.service.metrics import MetricsProperties, MetricsApiService, MetricsServiceConfigurator, enable_metrics
+
+
+class TestMetricsServiceConfigurator(unittest.TestCase):
+
+    def tearDown(self):
+        set_metrics(None)
+
+    def __configuration(self, metrics_properties):
+        configuration = MagicMock()
+        configuration.property_groups.get_property_group.return_value = metrics_properties
+        return configuration
+
+    def test_disabled(self):
+        service_register = MagicMock()
+        MetricsServiceConfigurator().configure(self.__configuration(MetricsProperties()), service_register)
+        service_register.add_service.assert_not_called()
+        self.assertFalse(get_metrics().enabled)
+
+    @patch('osvimdriver.service.metrics.PrometheusMetrics')
+    def test_enabled(self, mock_prometheus_metrics):
+        mock_prometheus_metrics.return_value.enabled = True
+        metrics_properties = MetricsProperties()
+        metrics_properties.enabled = True
+        service_register = MagicMock()
+        MetricsServiceConfigurator().configure(self.__configuration(metrics_properties), service_register)
+        service_register.add_service.assert_called_once()
+        self.assertIs(get_metrics(), mock_prometheus_metrics.return_value)
+
+    @patch('osvimdriver.service.metrics.PrometheusMetrics')
+    def test_enable_without_prometheus_client(self, mock_prometheus_metrics):
+        mock_prometheus_metrics.side_effect = ImportError('No module named prometheus_client')
+        with self.assertRaises(ValueError) as context:
+            enable_metrics(MetricsProperties())
+        self.assertIn('os-vim-driver[metrics]', str(context.exception))
+
+
+class TestMetricsApiService(unittest.TestCase):
+
+    def tearDown(self):
+        set_metrics(None)
+
+    def test_metrics(self):
+        metrics = DriverMetrics()
+        metrics.generate_latest = MagicMock(return_value=('text/plain; version=0.0.4', b'ovd_lifecycle_requests_total 1.0\n'))
+        set_metrics(metrics)
+        body, status, headers = MetricsApiService().metrics()
+        self.assertEqual(status, 200)
+        self.assertEqual(body, 'ovd_lifecycle_requests_total 1.0\n')
+        self.assertEqual(headers, {'Content-Type': 'text/plain; version=0.0.4'})
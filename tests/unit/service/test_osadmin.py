@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import MagicMock
+from osvimdriver.service.osadmin import OpenstackAdminApiService, OpenstackAdminService
+from osvimdriver.timing import PhaseTimings
+
+
+class TestOpenstackAdminService(unittest.TestCase):
+
+    def setUp(self):
+        self.timings = PhaseTimings(buckets=(1,))
+        self.timings.observe('Create', 'parse', 0.5, location='locA', template_hash='abc')
+        self.timings.observe('Create', 'parse', 2, location='locA', template_hash='def')
+        self.timings.observe('Delete', 'total', 0.5, location='locA')
+        self.service = OpenstackAdminService(MagicMock(), timings=self.timings)
+
+    def test_timings(self):
+        series = self.service.timings()
+        self.assertEqual(len(series), 3)
+
+    def test_timings_filtered_by_request_type(self):
+        series = self.service.timings(request_type='Create')
+        self.assertEqual(sorted(labels['template_hash'] for labels, _ in series), ['abc', 'def'])
+
+    def test_timings_filtered_by_template_hash(self):
+        series = self.service.timings(template_hash='def')
+        self.assertEqual(len(series), 1)
+        labels, histogram = series[0]
+        self.assertEqual(labels, {'request_type': 'Create', 'phase': 'parse', 'location': 'locA', 'template_hash': 'def'})
+        self.assertEqual(histogram.count, 1)
+
+
+class TestOpenstackAdminApiService(unittest.TestCase):
+
+    def test_timings(self):
+        service = OpenstackAdminService(MagicMock(), timings=PhaseTimings(buckets=(1,)))
+        service.timings_source.observe('Create', 'parse', 2, location='locA', template_hash='abc')
+        api_service = OpenstackAdminApiService(service=service)
+        response, code = api_service.timings(templateHash='abc')
+        self.assertEqual(code, 200)
+        self.assertEqual(response, {'timings': [{
+            'requestType': 'Create',
+            'phase': 'parse',
+            'location': 'locA',
+            'templateHash': 'abc',
+            'count': 1,
+            'sum': 2,
+            'buckets': [{'le': 1, 'count': 0}, {'le': '+Inf', 'count': 1}]
+        }]})
@@ -3,16 +3,22 @@ import uuid
 import tempfile
 import shutil
 import os
-from unittest.mock import patch, MagicMock, ANY
-from ignition.service.resourcedriver import InfrastructureNotFoundError, InvalidDriverFilesError, InvalidRequestError, ResourceDriverError
+import time
+from unittest.mock import patch, MagicMock, ANY, call
+from ignition.service.resourcedriver import LifecycleMessagingCapability, InfrastructureNotFoundError, InvalidDriverFilesError, InvalidRequestError, ResourceDriverError, TemporaryResourceDriverError, RequestNotFoundError
 from ignition.model.references import FindReferenceResponse, FindReferenceResult
 from ignition.model.associated_topology import AssociatedTopology
 from ignition.model.lifecycle import LifecycleExecution, LifecycleExecuteResponse
 from ignition.utils.file import DirectoryTree
-from osvimdriver.service.resourcedriver import ResourceDriverHandler, StackNameCreator, PropertiesMerger, AdditionalResourceDriverProperties, AdoptProperties
-from osvimdriver.service.tosca import ToscaValidationError
+from osvimdriver.timing import phase_timings
+from osvimdriver.metrics import set_metrics
+from osvimdriver.tracing import set_tracer
+from tests.unit.test_tracing import RecordingTracer
+from osvimdriver.service.resourcedriver import ResourceDriverHandler, ResourceDriverServiceConfigurator, build_location_translator, StackNameCreator, PropertiesMerger, AdditionalResourceDriverProperties, AdoptProperties, LocationPoolProperties, TokenCacheProperties, StackPollingProperties, NeutronCacheProperties, StackWatcherProperties, HeatNotificationsProperties, CreateDeduplicationProperties
+from osvimdriver.service.tosca import ToscaValidationError, PersistentStoreProperties, TranslationBusyError, TranslationTimeoutError
 from osvimdriver.tosca.discover import DiscoveryResult, NotDiscoveredError
 from osvimdriver.openstack.heat.driver import StackNotFoundError
+from osvimdriver.openstack.environment import OpenstackDeploymentLocationTranslator
 from tests.unit.testutils.constants import TOSCA_TEMPLATES_PATH, TOSCA_HELLO_WORLD_FILE
 from ignition.utils.propvaluemap import PropValueMap
 
@@ -212,7 +218,7 @@ class TestResourceDriverHandler(unittest.TestCase):
         self.mock_heat_translator.generate_heat_template.assert_not_called()
         self.mock_heat_driver.create_stack.assert_not_called()
         self.mock_location_translator.from_deployment_location.assert_called_once_with(self.deployment_location)
-        self.mock_heat_driver.get_stack.assert_called_once_with('MY_STACK_ID')
+        self.mock_heat_driver.get_stack.assert_called_once_with('MY_STACK_ID', resolve_outputs=False)
 
     def test_create_infrastructure_with_not_found_stack_id(self):
         self.mock_heat_driver.get_stack.side_effect = StackNotFoundError('Existing stack not found')
@@ -256,6 +262,154 @@ class TestResourceDriverHandler(unittest.TestCase):
         self.mock_location_translator.from_deployment_location.assert_called_once_with(self.deployment_location)
         self.mock_heat_driver.create_stack.assert_called_once_with(ANY, self.heat_template, {'propA': 'valueA'})
 
+    def __stack_watcher_config(self, state_directory=None):
+        stack_watcher_config = StackWatcherProperties()
+        stack_watcher_config.enabled = True
+        stack_watcher_config.min_interval_seconds = 0.01
+        if state_directory is None:
+            state_directory = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree, state_directory)
+        stack_watcher_config.state_directory = state_directory
+        return stack_watcher_config
+
+    def __wait_for(self, condition, timeout=5):
+        end = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > end:
+                self.fail('Condition not met within {0} seconds'.format(timeout))
+            time.sleep(0.005)
+
+    def test_init_with_stack_watcher_requires_messaging_service(self):
+        with self.assertRaises(ValueError) as context:
+            ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, stack_watcher_config=self.__stack_watcher_config())
+        self.assertEqual(str(context.exception), 'lifecycle_messaging_service argument not provided (required when stack_watcher.enabled is True)')
+
+    def test_create_infrastructure_with_stack_watcher_sends_result(self):
+        self.mock_heat_driver.create_stack.return_value = '1'
+        self.mock_heat_driver.get_stacks_by_ids.return_value = [{'id': '1', 'stack_status': 'CREATE_COMPLETE'}]
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'CREATE_COMPLETE', 'outputs': [{'output_key': 'outputA', 'output_value': 'valueA'}]}
+        mock_messaging_service = MagicMock()
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service,
+                                       stack_watcher_config=self.__stack_watcher_config(), lifecycle_messaging_service=mock_messaging_service)
+        try:
+            result = driver.execute_lifecycle('Create', self.heat_driver_files, self.system_properties, self.resource_properties, {}, AssociatedTopology(), self.deployment_location)
+            self.__wait_for(lambda: mock_messaging_service.send_lifecycle_execution.called)
+        finally:
+            driver.stack_watcher.shutdown()
+        execution = mock_messaging_service.send_lifecycle_execution.call_args[0][0]
+        self.assertEqual(execution.request_id, result.request_id)
+        self.assertEqual(execution.status, 'COMPLETE')
+        self.assertEqual(execution.outputs, {'outputA': 'valueA'})
+        self.mock_heat_driver.get_stacks_by_ids.assert_called_once_with(['1'])
+        with self.assertRaises(RequestNotFoundError):
+            driver.get_lifecycle_execution(result.request_id, self.deployment_location)
+
+    def test_get_lifecycle_execution_with_stack_watcher_claims_result(self):
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'DELETE_COMPLETE'}
+        mock_messaging_service = MagicMock()
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service,
+                                       stack_watcher_config=self.__stack_watcher_config(), lifecycle_messaging_service=mock_messaging_service)
+        execution = driver.get_lifecycle_execution('Delete::1::request123', self.deployment_location)
+        self.assertEqual(execution.status, 'COMPLETE')
+        self.assertFalse(driver.stack_watcher.claim('Delete::1::request123'))
+
+    def test_stack_watcher_shares_state_between_processes(self):
+        state_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, state_directory)
+        self.mock_heat_driver.create_stack.return_value = '1'
+        self.mock_heat_driver.get_stacks_by_ids.return_value = [{'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'}]
+        mock_messaging_service = MagicMock()
+        # Handlers of two driver processes
+        watching_driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service,
+                                                stack_watcher_config=self.__stack_watcher_config(state_directory), lifecycle_messaging_service=mock_messaging_service)
+        polled_driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service,
+                                              stack_watcher_config=self.__stack_watcher_config(state_directory), lifecycle_messaging_service=mock_messaging_service)
+        try:
+            result = watching_driver.execute_lifecycle('Create', self.heat_driver_files, self.system_properties, self.resource_properties, {}, AssociatedTopology(), self.deployment_location)
+            # Whilst watched, status checks in the other process are answered without Heat
+            execution = polled_driver.get_lifecycle_execution(result.request_id, self.deployment_location)
+            self.assertEqual(execution.status, 'IN_PROGRESS')
+            self.mock_heat_driver.get_stack.assert_not_called()
+            self.mock_heat_driver.get_stacks_by_ids.return_value = [{'id': '1', 'stack_status': 'CREATE_COMPLETE'}]
+            self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'CREATE_COMPLETE', 'outputs': []}
+            self.__wait_for(lambda: mock_messaging_service.send_lifecycle_execution.called)
+        finally:
+            watching_driver.stack_watcher.shutdown()
+        with self.assertRaises(RequestNotFoundError):
+            polled_driver.get_lifecycle_execution(result.request_id, self.deployment_location)
+        mock_messaging_service.send_lifecycle_execution.assert_called_once()
+
+    def __create_deduplication_config(self):
+        create_deduplication_config = CreateDeduplicationProperties()
+        create_deduplication_config.enabled = True
+        return create_deduplication_config
+
+    def test_create_infrastructure_with_deduplication_creates_new_stack(self):
+        self.mock_heat_driver.get_stack_by_name.return_value = None
+        self.mock_heat_driver.create_stack.return_value = '1'
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, create_deduplication_config=self.__create_deduplication_config())
+        result = driver.execute_lifecycle('Create', self.heat_driver_files, self.system_properties, self.resource_properties, {}, AssociatedTopology(), self.deployment_location)
+        self.assert_request_id(result.request_id, 'Create', '1')
+        self.mock_heat_driver.get_stack_by_name.assert_called_once_with('TestResource.123')
+        self.mock_heat_driver.create_stack.assert_called_once_with('TestResource.123', self.heat_template, {'propA': 'valueA'})
+
+    def test_create_infrastructure_with_deduplication_returns_existing_stack(self):
+        self.mock_heat_driver.get_stack_by_name.return_value = {'id': '1', 'stack_name': 'TestResource.123', 'stack_status': 'CREATE_IN_PROGRESS'}
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, create_deduplication_config=self.__create_deduplication_config())
+        result = driver.execute_lifecycle('Create', self.heat_driver_files, self.system_properties, self.resource_properties, {}, AssociatedTopology(), self.deployment_location)
+        self.assert_request_id(result.request_id, 'Create', '1')
+        self.assert_internal_resource(result.associated_topology, '1')
+        self.mock_heat_driver.create_stack.assert_not_called()
+        self.mock_heat_input_utils.filter_used_properties.assert_not_called()
+
+    def test_create_infrastructure_with_deduplication_ignores_generated_stack_names(self):
+        self.mock_heat_driver.create_stack.return_value = '1'
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, create_deduplication_config=self.__create_deduplication_config())
+        driver.execute_lifecycle('Create', self.heat_driver_files, PropValueMap({}), self.resource_properties, {}, AssociatedTopology(), self.deployment_location)
+        self.mock_heat_driver.get_stack_by_name.assert_not_called()
+        self.mock_heat_driver.create_stack.assert_called_once()
+
+    def test_create_infrastructure_records_phase_timings(self):
+        phase_timings.clear()
+        self.mock_heat_driver.create_stack.return_value = '1'
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        driver.execute_lifecycle('Create', self.heat_driver_files, self.system_properties, self.resource_properties, {}, AssociatedTopology(), self.deployment_location)
+        series = {labels['phase']: labels for labels, _ in phase_timings.collect()}
+        self.assertEqual(sorted(series.keys()), ['create_stack', 'filter_properties', 'gather_files', 'read_files', 'total'])
+        self.assertEqual(series['create_stack']['request_type'], 'Create')
+        self.assertEqual(series['create_stack']['location'], self.deployment_location['name'])
+        self.assertIsNotNone(series['create_stack']['template_hash'])
+
+    def test_execute_lifecycle_records_metrics(self):
+        metrics = MagicMock(enabled=True)
+        set_metrics(metrics)
+        try:
+            self.mock_heat_driver.create_stack.return_value = '1'
+            driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+            driver.execute_lifecycle('create', self.heat_driver_files, self.system_properties, self.resource_properties, {}, AssociatedTopology(), self.deployment_location)
+            with self.assertRaises(InvalidRequestError):
+                driver.execute_lifecycle('Upgrade', self.heat_driver_files, self.system_properties, self.resource_properties, {}, AssociatedTopology(), self.deployment_location)
+        finally:
+            set_metrics(None)
+        metrics.time_lifecycle.assert_has_calls([call('Create'), call('unsupported')], any_order=True)
+        phases = [args[0] for args, _ in metrics.observe_create_phase.call_args_list]
+        self.assertEqual(sorted(phases), ['create_stack', 'filter_properties', 'gather_files', 'read_files', 'total'])
+        metrics.observe_create_phase.assert_any_call('total', self.deployment_location['name'], ANY)
+        self.assertEqual(metrics.observe_driver_files_cleanup.call_count, 2)
+
+    def test_execute_lifecycle_creates_span(self):
+        tracer = RecordingTracer()
+        set_tracer(tracer)
+        try:
+            self.mock_heat_driver.create_stack.return_value = '1'
+            driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+            execute_response = driver.execute_lifecycle('Create', self.heat_driver_files, self.system_properties, self.resource_properties, {}, AssociatedTopology(), self.deployment_location)
+        finally:
+            set_tracer(None)
+        span, = tracer.spans
+        self.assertEqual(span.name, 'execute_lifecycle')
+        self.assertEqual(span.attributes, {'ovd.lifecycle': 'Create', 'ovd.location': self.deployment_location['name'], 'ovd.request_id': execute_response.request_id})
+
     def test_create_infrastructure_includes_heat_files(self):
         files_path = os.path.join(self.heat_driver_files.root_path, 'files')
         os.makedirs(files_path)
@@ -304,6 +458,13 @@ class TestResourceDriverHandler(unittest.TestCase):
             driver.execute_lifecycle('Create', self.tosca_driver_files, self.system_properties, self.resource_properties, {'template-type': 'TOSCA'}, AssociatedTopology(), self.deployment_location)
         self.assertEqual(str(context.exception), 'Validation error')
 
+    def test_create_infrastructure_with_busy_translation_pool_throws_temporary_error(self):
+        self.mock_heat_translator.generate_heat_template.side_effect = TranslationBusyError('Translation queue is full')
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        with self.assertRaises(TemporaryResourceDriverError) as context:
+            driver.execute_lifecycle('Create', self.tosca_driver_files, self.system_properties, self.resource_properties, {'template-type': 'TOSCA'}, AssociatedTopology(), self.deployment_location)
+        self.assertEqual(str(context.exception), 'Translation queue is full')
+
     def test_create_infrastructure_with_invalid_template_type_throws_error(self):
         request_properties = {'template-type': 'YAML'}
         driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
@@ -382,8 +543,174 @@ class TestResourceDriverHandler(unittest.TestCase):
         driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
         execution = driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
         self.mock_location_translator.from_deployment_location.assert_called_once_with(self.deployment_location)
+        self.mock_heat_driver.get_stack.assert_called_once_with('1', resolve_outputs=False)
+
+    def test_get_lifecycle_execution_reuses_pooled_location(self):
+        self.mock_heat_driver.get_stack.return_value = {
+            'id': '1',
+            'stack_status': 'CREATE_IN_PROGRESS'
+        }
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        driver.get_lifecycle_execution('Create::1::request456', self.deployment_location)
+        self.mock_location_translator.from_deployment_location.assert_called_once_with(self.deployment_location)
+        self.assertEqual(self.mock_heat_driver.get_stack.call_count, 2)
+
+    def test_get_lifecycle_execution_with_location_pool_disabled(self):
+        self.mock_heat_driver.get_stack.return_value = {
+            'id': '1',
+            'stack_status': 'CREATE_IN_PROGRESS'
+        }
+        location_pool_config = LocationPoolProperties()
+        location_pool_config.enabled = False
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, location_pool_config=location_pool_config)
+        driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        driver.get_lifecycle_execution('Create::1::request456', self.deployment_location)
+        self.assertEqual(self.mock_location_translator.from_deployment_location.call_count, 2)
+
+    def test_init_does_not_modify_location_translator(self):
+        location_translator = OpenstackDeploymentLocationTranslator()
+        ResourceDriverHandler(location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        self.assertIsNone(location_translator.token_cache)
+        self.assertIsNone(location_translator.persistent_store)
+        self.assertIsNone(location_translator.neutron_cache)
+
+    def test_get_lifecycle_execution_create_complete_invalidates_neutron_cache(self):
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'CREATE_COMPLETE'}
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.mock_os_location.invalidate_neutron_cache.assert_called_once()
+
+    def test_get_lifecycle_execution_delete_in_progress_does_not_invalidate_neutron_cache(self):
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'DELETE_IN_PROGRESS'}
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        driver.get_lifecycle_execution('Delete::1::request123', self.deployment_location)
+        self.mock_os_location.invalidate_neutron_cache.assert_not_called()
+
+    def __batched_stack_polling_config(self):
+        stack_polling_config = StackPollingProperties()
+        stack_polling_config.batch_enabled = True
+        stack_polling_config.batch_window_seconds = 0
+        return stack_polling_config
+
+    def test_get_lifecycle_execution_with_batched_polling_in_progress(self):
+        self.mock_heat_driver.get_stacks_by_ids.return_value = [{'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'}]
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, stack_polling_config=self.__batched_stack_polling_config())
+        execution = driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.assertEqual(execution.status, 'IN_PROGRESS')
+        self.mock_heat_driver.get_stacks_by_ids.assert_called_once_with(['1'])
+        self.mock_heat_driver.get_stack.assert_not_called()
+
+    def test_get_lifecycle_execution_with_batched_polling_retrieves_outputs_on_complete(self):
+        self.mock_heat_driver.get_stacks_by_ids.return_value = [{'id': '1', 'stack_status': 'CREATE_COMPLETE'}]
+        self.mock_heat_driver.get_stack.return_value = {
+            'id': '1',
+            'stack_status': 'CREATE_COMPLETE',
+            'outputs': [{'output_key': 'outputA', 'output_value': 'valueA'}]
+        }
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, stack_polling_config=self.__batched_stack_polling_config())
+        execution = driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.assertEqual(execution.status, 'COMPLETE')
+        self.assertEqual(execution.outputs, {'outputA': 'valueA'})
         self.mock_heat_driver.get_stack.assert_called_once_with('1')
 
+    def test_get_lifecycle_execution_with_status_cache(self):
+        self.mock_heat_driver.get_stack.return_value = {
+            'id': '1',
+            'stack_status': 'CREATE_IN_PROGRESS'
+        }
+        stack_polling_config = StackPollingProperties()
+        stack_polling_config.status_cache_ttl_seconds = 60
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, stack_polling_config=stack_polling_config)
+        first_execution = driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        second_execution = driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.assertEqual(first_execution.status, 'IN_PROGRESS')
+        self.assertEqual(second_execution.status, 'IN_PROGRESS')
+        self.mock_heat_driver.get_stack.assert_called_once_with('1', resolve_outputs=False)
+
+    def test_get_lifecycle_execution_with_events(self):
+        self.mock_heat_driver.get_stack_resources.return_value = [{'resource_name': 'server'}]
+        self.mock_heat_driver.get_stack_events.side_effect = [
+            [{'id': 'e1', 'physical_resource_id': '1', 'resource_status': 'CREATE_IN_PROGRESS'}],
+            [{'id': 'e2', 'physical_resource_id': '1', 'resource_status': 'CREATE_COMPLETE'}]
+        ]
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'CREATE_COMPLETE', 'outputs': [{'output_key': 'outputA', 'output_value': 'valueA'}]}
+        stack_polling_config = StackPollingProperties()
+        stack_polling_config.events_enabled = True
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, stack_polling_config=stack_polling_config)
+        first_execution = driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.assertEqual(first_execution.status, 'IN_PROGRESS')
+        self.mock_heat_driver.get_stack.assert_not_called()
+        second_execution = driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.assertEqual(second_execution.status, 'COMPLETE')
+        self.assertEqual(second_execution.outputs, {'outputA': 'valueA'})
+        self.mock_heat_driver.get_stack.assert_called_once_with('1')
+        self.assertEqual(self.mock_heat_driver.get_stack_events.call_args_list, [call('1', marker=None, limit=100), call('1', marker='e1', limit=100)])
+
+    def test_get_lifecycle_execution_reuses_terminal_result(self):
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'CREATE_COMPLETE', 'outputs': []}
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        first_execution = driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.mock_location_translator.from_deployment_location.reset_mock()
+        self.mock_heat_driver.get_stack.reset_mock()
+        second_execution = driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.assertEqual(second_execution, first_execution)
+        self.mock_location_translator.from_deployment_location.assert_not_called()
+        self.mock_heat_driver.get_stack.assert_not_called()
+
+    def test_get_lifecycle_execution_reuses_terminal_result_per_location(self):
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'CREATE_FAILED', 'stack_status_reason': 'Failed'}
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        driver.get_lifecycle_execution('Create::1::request123', {'name': 'other_location'})
+        self.assertEqual(self.mock_heat_driver.get_stack.call_count, 2)
+
+    def __heat_notifications_config(self):
+        heat_notifications_config = HeatNotificationsProperties()
+        heat_notifications_config.enabled = True
+        heat_notifications_config.source = 'in_process'
+        return heat_notifications_config
+
+    def test_get_lifecycle_execution_uses_notified_stack_status(self):
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, heat_notifications_config=self.__heat_notifications_config())
+        driver.stack_notifications.source.publish({'event_type': 'orchestration.stack.delete.end', 'payload': {'stack_identity': 'arn:openstack:heat::tenant:stacks/stackA/1', 'state': 'DELETE_COMPLETE'}})
+        execution = driver.get_lifecycle_execution('Delete::1::request123', self.deployment_location)
+        self.assertEqual(execution.status, 'COMPLETE')
+        self.mock_heat_driver.get_stack.assert_not_called()
+
+    def test_get_lifecycle_execution_ignores_notification_of_other_action(self):
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'DELETE_IN_PROGRESS'}
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, heat_notifications_config=self.__heat_notifications_config())
+        driver.stack_notifications.source.publish({'event_type': 'orchestration.stack.create.end', 'payload': {'stack_identity': '1', 'state': 'CREATE_COMPLETE'}})
+        execution = driver.get_lifecycle_execution('Delete::1::request123', self.deployment_location)
+        self.assertEqual(execution.status, 'IN_PROGRESS')
+        self.mock_heat_driver.get_stack.assert_called_once_with('1', resolve_outputs=False)
+
+    def test_get_lifecycle_execution_does_not_reuse_in_progress_result(self):
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'}
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.assertEqual(self.mock_heat_driver.get_stack.call_count, 2)
+
+    def test_get_lifecycle_execution_reuses_delete_of_missing_stack(self):
+        self.mock_heat_driver.get_stack.side_effect = StackNotFoundError('Not found')
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        driver.get_lifecycle_execution('Delete::1::request123', self.deployment_location)
+        execution = driver.get_lifecycle_execution('Delete::1::request123', self.deployment_location)
+        self.assertEqual(execution.status, 'COMPLETE')
+        self.mock_heat_driver.get_stack.assert_called_once()
+
+    def test_get_lifecycle_execution_with_terminal_cache_disabled(self):
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'DELETE_COMPLETE'}
+        stack_polling_config = StackPollingProperties()
+        stack_polling_config.terminal_cache_ttl_seconds = 0
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service, stack_polling_config=stack_polling_config)
+        driver.get_lifecycle_execution('Delete::1::request123', self.deployment_location)
+        driver.get_lifecycle_execution('Delete::1::request123', self.deployment_location)
+        self.assertEqual(self.mock_heat_driver.get_stack.call_count, 2)
+
     def test_get_lifecycle_execution_create_in_progress(self):
         self.mock_heat_driver.get_stack.return_value = {
             'id': '1',
@@ -416,6 +743,33 @@ class TestResourceDriverHandler(unittest.TestCase):
         self.assertEqual(execution.outputs, {'outputA': 'valueA', 'outputB': 123})
         self.assertEqual(execution.associated_topology, None)
 
+    def test_get_lifecycle_execution_create_complete_retrieves_outputs_once_complete(self):
+        self.mock_heat_driver.get_stack.side_effect = [
+            {'id': '1', 'stack_status': 'CREATE_COMPLETE'},
+            {'id': '1', 'stack_status': 'CREATE_COMPLETE', 'outputs': [{'output_key': 'outputA', 'output_value': 'valueA'}]}
+        ]
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        execution = driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.assertEqual(execution.status, 'COMPLETE')
+        self.assertEqual(execution.outputs, {'outputA': 'valueA'})
+        self.assertEqual(self.mock_heat_driver.get_stack.call_args_list, [call('1', resolve_outputs=False), call('1')])
+
+    def test_get_lifecycle_execution_error_when_not_found_retrieving_outputs(self):
+        self.mock_heat_driver.get_stack.side_effect = [
+            {'id': '1', 'stack_status': 'CREATE_COMPLETE'},
+            StackNotFoundError('Not found')
+        ]
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        with self.assertRaises(InfrastructureNotFoundError) as context:
+            driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.assertEqual(str(context.exception), 'Not found')
+
+    def test_get_lifecycle_execution_create_in_progress_does_not_retrieve_outputs(self):
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'}
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.mock_heat_driver.get_stack.assert_called_once_with('1', resolve_outputs=False)
+
     def test_get_lifecycle_execution_adopt_complete(self):
         self.mock_heat_driver.get_stack.return_value = {
             'id': '1',
@@ -644,6 +998,12 @@ class TestResourceDriverHandler(unittest.TestCase):
         self.assertEqual(execution.outputs, None)
         self.assertEqual(execution.associated_topology, None)
 
+    def test_get_lifecycle_execution_closes_location(self):
+        self.mock_heat_driver.get_stack.return_value = {'id': '1', 'stack_status': 'CREATE_IN_PROGRESS'}
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        driver.get_lifecycle_execution('Create::1::request123', self.deployment_location)
+        self.mock_os_location.close.assert_called_once()
+
     def test_get_lifecycle_execution_error_when_not_found(self):
         self.mock_heat_driver.get_stack.side_effect = StackNotFoundError('Not found')
         driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
@@ -677,6 +1037,13 @@ class TestResourceDriverHandler(unittest.TestCase):
             driver.find_reference('test', self.tosca_driver_files, self.deployment_location)
         self.assertEqual(str(context.exception), 'Validation error')
 
+    def test_find_reference_with_translation_timeout_throws_temporary_error(self):
+        self.mock_tosca_discover_service.discover.side_effect = TranslationTimeoutError('Translation did not complete within 300 seconds')
+        driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
+        with self.assertRaises(TemporaryResourceDriverError) as context:
+            driver.find_reference('test', self.tosca_driver_files, self.deployment_location)
+        self.assertEqual(str(context.exception), 'Translation did not complete within 300 seconds')
+
     def test_execute_lifecycle_removes_files(self):
         self.mock_heat_driver.create_stack.return_value = '1'
         driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
@@ -688,4 +1055,79 @@ class TestResourceDriverHandler(unittest.TestCase):
         self.resource_driver_config.keep_files = True
         driver = ResourceDriverHandler(self.mock_location_translator, resource_driver_config=self.resource_driver_config, heat_translator_service=self.mock_heat_translator, tosca_discovery_service=self.mock_tosca_discover_service)
         result = driver.execute_lifecycle('Create', self.heat_driver_files, self.system_properties, self.resource_properties, {}, AssociatedTopology(), self.deployment_location)
-        self.assertTrue(os.path.exists(self.heat_driver_files.root_path))
\ No newline at end of file
+        self.assertTrue(os.path.exists(self.heat_driver_files.root_path))
+
+class TestBuildLocationTranslator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_build_with_defaults(self):
+        location_translator = build_location_translator(TokenCacheProperties(), PersistentStoreProperties(), NeutronCacheProperties())
+        self.assertIsNone(location_translator.token_cache)
+        self.assertIsNone(location_translator.persistent_store)
+        self.assertIsNone(location_translator.neutron_cache)
+
+    def test_build_with_token_cache_enabled(self):
+        token_cache_config = TokenCacheProperties()
+        token_cache_config.enabled = True
+        token_cache_config.directory = os.path.join(self.tmp_dir, 'tokens')
+        token_cache_config.refresh_margin_seconds = 60
+        location_translator = build_location_translator(token_cache_config=token_cache_config)
+        self.assertEqual(location_translator.token_cache.directory, token_cache_config.directory)
+        self.assertEqual(location_translator.token_cache.refresh_margin_seconds, 60)
+
+    def test_build_with_persistent_store_enabled(self):
+        persistent_store_config = PersistentStoreProperties()
+        persistent_store_config.enabled = True
+        persistent_store_config.path = os.path.join(self.tmp_dir, 'store', 'ovd_cache.db')
+        location_translator = build_location_translator(persistent_store_config=persistent_store_config)
+        self.assertEqual(location_translator.persistent_store.path, persistent_store_config.path)
+
+    def test_build_with_neutron_cache_enabled(self):
+        neutron_cache_config = NeutronCacheProperties()
+        neutron_cache_config.enabled = True
+        neutron_cache_config.ttl_seconds = 60
+        neutron_cache_config.negative_ttl_seconds = 5
+        location_translator = build_location_translator(neutron_cache_config=neutron_cache_config)
+        self.assertEqual(location_translator.neutron_cache.ttl_seconds, 60)
+        self.assertEqual(location_translator.neutron_cache.negative_ttl_seconds, 5)
+
+
+class TestResourceDriverServiceConfigurator(unittest.TestCase):
+
+    def __configure(self, **property_groups):
+        groups = {TokenCacheProperties: TokenCacheProperties(), PersistentStoreProperties: PersistentStoreProperties(),
+                  NeutronCacheProperties: NeutronCacheProperties(), StackWatcherProperties: StackWatcherProperties()}
+        groups.update({type(group): group for group in property_groups.values()})
+        configuration = MagicMock()
+        configuration.property_groups.get_property_group.side_effect = lambda group: groups[group]
+        service_register = MagicMock()
+        ResourceDriverServiceConfigurator().configure(configuration, service_register)
+        service_register.add_service.assert_called_once()
+        return service_register.add_service.call_args[0][0]
+
+    def test_configure_registers_handler_with_built_translator(self):
+        neutron_cache_config = NeutronCacheProperties()
+        neutron_cache_config.enabled = True
+        registration = self.__configure(neutron_cache_config=neutron_cache_config)
+        self.assertEqual(registration.service_class, ResourceDriverHandler)
+        location_translator = registration.args[0]
+        self.assertIsInstance(location_translator, OpenstackDeploymentLocationTranslator)
+        self.assertIsNone(location_translator.token_cache)
+        self.assertIsNotNone(location_translator.neutron_cache)
+        self.assertNotIn('token_cache_config', registration.required_capabilities)
+        self.assertEqual(registration.required_capabilities['location_pool_config'], LocationPoolProperties)
+
+    def test_configure_does_not_require_lifecycle_messaging_when_watcher_disabled(self):
+        registration = self.__configure()
+        self.assertNotIn('lifecycle_messaging_service', registration.required_capabilities)
+
+    def test_configure_requires_lifecycle_messaging_when_watcher_enabled(self):
+        stack_watcher_config = StackWatcherProperties()
+        stack_watcher_config.enabled = True
+        registration = self.__configure(stack_watcher_config=stack_watcher_config)
+        self.assertEqual(registration.required_capabilities['lifecycle_messaging_service'], LifecycleMessagingCapability)
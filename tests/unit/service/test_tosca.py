@@ -2,9 +2,14 @@ import unittest
 from unittest.mock import MagicMock, patch
 import os
 import yaml
-from osvimdriver.service.tosca import ToscaHeatTranslatorService, ToscaParserService, ToscaTopologyDiscoveryService, ToscaValidationError
+import shutil
+import tempfile
+from osvimdriver.service.tosca import ToscaHeatTranslatorService, ToscaParserService, ToscaTopologyDiscoveryService, ToscaValidationError, TranslationCacheProperties, PersistentStoreProperties, TranslationPoolProperties, translate_in_worker, parse_in_worker
 from tests.unit.testutils.constants import TOSCA_TEMPLATES_PATH, TOSCA_HELLO_WORLD_FILE, HEAT_TEMPLATES_PATH, HEAT_HELLO_WORLD_FILE, TOSCA_DISCOVER_NETWORK_WITH_INPUTS_AND_OUTPUTS_FILE, TOSCA_MISSING_INPUT_FILE
 from toscaparser.tosca_template import ToscaTemplate
+import toscaparser.imports
+from osvimdriver.tosca.loader import definitions_loader
+from osvimdriver.timing import RequestTimer, activate_timer
 
 tosca_templates_dir = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, TOSCA_TEMPLATES_PATH)
 hello_world_tosca_file = os.path.join(tosca_templates_dir, TOSCA_HELLO_WORLD_FILE)
@@ -39,6 +44,127 @@ class TestToscaHeatTranslatorService(unittest.TestCase):
         self.assertEqual(str(context.exception), 'Must provide tosca_template_str parameter')
 
 
+    def test_generate_heat_template_uses_cached_translation(self):
+        with open(hello_world_tosca_file, 'r') as tosca_reader:
+            tosca_template = tosca_reader.read()
+        mock_tosca_parser_service = MagicMock()
+        mock_tosca_parser_service.parse_tosca_str.return_value = ToscaTemplate(None, None, False, yaml.safe_load(tosca_template))
+        translator = ToscaHeatTranslatorService(tosca_parser_service=mock_tosca_parser_service)
+        first_heat = translator.generate_heat_template(tosca_template)
+        second_heat = translator.generate_heat_template(tosca_template)
+        self.assertEqual(first_heat, second_heat)
+        mock_tosca_parser_service.parse_tosca_str.assert_called_once()
+
+    def test_generate_heat_template_does_not_cache_failed_translation(self):
+        mock_tosca_parser_service = MagicMock()
+        mock_tosca_parser_service.parse_tosca_str.side_effect = ToscaValidationError('invalid')
+        translator = ToscaHeatTranslatorService(tosca_parser_service=mock_tosca_parser_service)
+        for i in range(2):
+            with self.assertRaises(ToscaValidationError):
+                translator.generate_heat_template('tosca_definitions_version: tosca_simple_yaml_1_2')
+        self.assertEqual(mock_tosca_parser_service.parse_tosca_str.call_count, 2)
+
+    @patch('osvimdriver.service.tosca.translation_cache_key')
+    def test_generate_heat_template_does_not_cache_uncacheable_template(self, mock_translation_cache_key):
+        # e.g. imports from a URL
+        mock_translation_cache_key.return_value = None
+        with open(hello_world_tosca_file, 'r') as tosca_reader:
+            tosca_template = tosca_reader.read()
+        mock_tosca_parser_service = MagicMock()
+        mock_tosca_parser_service.parse_tosca_str.return_value = ToscaTemplate(None, None, False, yaml.safe_load(tosca_template))
+        translator = ToscaHeatTranslatorService(tosca_parser_service=mock_tosca_parser_service)
+        translator.generate_heat_template(tosca_template)
+        translator.generate_heat_template(tosca_template)
+        self.assertEqual(mock_tosca_parser_service.parse_tosca_str.call_count, 2)
+        self.assertEqual(len(translator.translation_cache), 0)
+
+    def test_generate_heat_template_with_cache_disabled(self):
+        with open(hello_world_tosca_file, 'r') as tosca_reader:
+            tosca_template = tosca_reader.read()
+        mock_tosca_parser_service = MagicMock()
+        mock_tosca_parser_service.parse_tosca_str.return_value = ToscaTemplate(None, None, False, yaml.safe_load(tosca_template))
+        translation_cache_config = TranslationCacheProperties()
+        translation_cache_config.enabled = False
+        translator = ToscaHeatTranslatorService(tosca_parser_service=mock_tosca_parser_service, translation_cache_config=translation_cache_config)
+        translator.generate_heat_template(tosca_template)
+        translator.generate_heat_template(tosca_template)
+        self.assertEqual(mock_tosca_parser_service.parse_tosca_str.call_count, 2)
+        self.assertIsNone(translator.translation_cache)
+
+
+    def test_generate_heat_template_with_persistent_store(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            with open(hello_world_tosca_file, 'r') as tosca_reader:
+                tosca_template = tosca_reader.read()
+            mock_tosca_parser_service = MagicMock()
+            mock_tosca_parser_service.parse_tosca_str.return_value = ToscaTemplate(None, None, False, yaml.safe_load(tosca_template))
+            persistent_store_config = PersistentStoreProperties()
+            persistent_store_config.enabled = True
+            persistent_store_config.path = os.path.join(tmp_dir, 'ovd_cache.db')
+            heat = ToscaHeatTranslatorService(tosca_parser_service=mock_tosca_parser_service, persistent_store_config=persistent_store_config).generate_heat_template(tosca_template)
+            # A new service (as in another worker process) has an empty in memory cache but shares the persistent store
+            other_translator = ToscaHeatTranslatorService(tosca_parser_service=mock_tosca_parser_service, persistent_store_config=persistent_store_config)
+            self.assertEqual(other_translator.generate_heat_template(tosca_template), heat)
+            mock_tosca_parser_service.parse_tosca_str.assert_called_once()
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+    @patch('osvimdriver.service.tosca.get_shared_executor')
+    def test_generate_heat_template_with_translation_pool(self, mock_get_shared_executor):
+        mock_executor = mock_get_shared_executor.return_value
+        mock_executor.run.return_value = 'heat_template_version: 2013-05-23'
+        translation_pool_config = TranslationPoolProperties()
+        translation_pool_config.enabled = True
+        translation_pool_config.max_workers = 4
+        mock_tosca_parser_service = MagicMock()
+        translator = ToscaHeatTranslatorService(tosca_parser_service=mock_tosca_parser_service, translation_pool_config=translation_pool_config)
+        heat = translator.generate_heat_template('tosca_definitions_version: tosca_simple_yaml_1_2', template_path='/tmp/tosca.yaml')
+        self.assertEqual(heat, 'heat_template_version: 2013-05-23')
+        mock_get_shared_executor.assert_called_once_with(max_workers=4, timeout_seconds=300, max_queue_depth=10, memory_limit_mb=0)
+        mock_executor.run.assert_called_once_with(translate_in_worker, 'tosca_definitions_version: tosca_simple_yaml_1_2', '/tmp/tosca.yaml')
+        mock_tosca_parser_service.parse_tosca_str.assert_not_called()
+
+    @patch('osvimdriver.service.tosca.get_shared_executor')
+    def test_generate_heat_template_with_translation_pool_adds_worker_phases(self, mock_get_shared_executor):
+        mock_executor = mock_get_shared_executor.return_value
+        mock_executor.run.return_value = ('heat_template_version: 2013-05-23', [('parse', 0.1), ('translate', 0.2)])
+        translation_pool_config = TranslationPoolProperties()
+        translation_pool_config.enabled = True
+        translator = ToscaHeatTranslatorService(tosca_parser_service=MagicMock(), translation_pool_config=translation_pool_config)
+        with activate_timer(RequestTimer('Create')) as timer:
+            heat = translator.generate_heat_template('tosca_definitions_version: tosca_simple_yaml_1_2', template_path='/tmp/tosca.yaml')
+        self.assertEqual(heat, 'heat_template_version: 2013-05-23')
+        mock_executor.run.assert_called_once_with(translate_in_worker, 'tosca_definitions_version: tosca_simple_yaml_1_2', '/tmp/tosca.yaml', True)
+        self.assertEqual(timer.phases, [('parse', 0.1), ('translate', 0.2)])
+
+    def test_generate_heat_template_times_phases(self):
+        with open(hello_world_tosca_file, 'r') as tosca_reader:
+            tosca_template = tosca_reader.read()
+        mock_tosca_parser_service = MagicMock()
+        mock_tosca_parser_service.parse_tosca_str.return_value = ToscaTemplate(None, None, False, yaml.safe_load(tosca_template))
+        translator = ToscaHeatTranslatorService(tosca_parser_service=mock_tosca_parser_service)
+        with activate_timer(RequestTimer('Create')) as timer:
+            translator.generate_heat_template(tosca_template)
+        self.assertEqual([name for name, _ in timer.phases], ['parse', 'translate'])
+
+    def test_translate_in_worker_with_time_phases(self):
+        with open(hello_world_tosca_file, 'r') as tosca_reader:
+            tosca_template = tosca_reader.read()
+        heat, phases = translate_in_worker(tosca_template, time_phases=True)
+        self.assertIn('resources', yaml.safe_load(heat))
+        self.assertEqual([name for name, _ in phases], ['parse', 'translate'])
+
+    def test_translate_in_worker(self):
+        with open(hello_world_tosca_file, 'r') as tosca_reader:
+            tosca_template = tosca_reader.read()
+        with open(hello_world_heat_file, 'r') as heat_reader:
+            expected_heat = heat_reader.read()
+        heat = translate_in_worker(tosca_template)
+        self.assertDictEqual(yaml.safe_load(heat), yaml.safe_load(expected_heat))
+
+
 class TestToscaParserService(unittest.TestCase):
 
     @patch('osvimdriver.service.tosca.ToscaTemplate')
@@ -52,6 +178,10 @@ class TestToscaParserService(unittest.TestCase):
         mock_tosca_template_init.assert_called_once_with(None, None, False, expected_tosca)
         self.assertEqual(parse_result, mock_tosca_template_init.return_value)
 
+    def test_init_installs_definitions_loader(self):
+        ToscaParserService()
+        self.assertEqual(toscaparser.imports.YAML_LOADER, definitions_loader.load_yaml)
+
     def test_parser_tosca_str_throws_validation_error(self):
         with open(missing_input_tosca_file, 'r') as tosca_reader:
             tosca_template = tosca_reader.read()
@@ -106,3 +236,23 @@ class TestToscaTopologyDiscoveryService(unittest.TestCase):
         mock_tosca_parser.parse_tosca_str.assert_called_once_with(tosca_template, {'network_name': 'abc'})
         mock_search_engine_init.assert_called_once_with(mock_tosca_parser.parse_tosca_str.return_value, mock_openstack_location)
         mock_search_engine_init.return_value.discover.assert_called_once()
+
+    @patch('osvimdriver.service.tosca.ToscaTopologySearchEngine')
+    @patch('osvimdriver.service.tosca.get_shared_executor')
+    def test_discover_with_translation_pool(self, mock_get_shared_executor, mock_search_engine_init):
+        mock_executor = mock_get_shared_executor.return_value
+        translation_pool_config = TranslationPoolProperties()
+        translation_pool_config.enabled = True
+        mock_tosca_parser = MagicMock()
+        mock_openstack_location = MagicMock()
+        discovery_service = ToscaTopologyDiscoveryService(tosca_parser_service=mock_tosca_parser, translation_pool_config=translation_pool_config)
+        discovery_service.discover('tosca_definitions_version: tosca_simple_yaml_1_2', mock_openstack_location, {'network_name': 'abc'})
+        mock_executor.run.assert_called_once_with(parse_in_worker, 'tosca_definitions_version: tosca_simple_yaml_1_2', {'network_name': 'abc'})
+        mock_search_engine_init.assert_called_once_with(mock_executor.run.return_value, mock_openstack_location)
+        mock_tosca_parser.parse_tosca_str.assert_not_called()
+
+    def test_parse_in_worker(self):
+        with open(discover_network_with_inputs_and_outputs_tosca_file, 'r') as tosca_reader:
+            tosca_template = tosca_reader.read()
+        tosca = parse_in_worker(tosca_template, {'network_name': 'abc'})
+        self.assertEqual(tosca.parsed_params, {'network_name': 'abc'})
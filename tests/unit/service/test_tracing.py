@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from osvimdriver.tracing import get_tracer, set_tracer
+from osvimdriver.service.tracing import TracingProperties, TracingServiceConfigurator, enable_tracing
+
+
+class TestTracingServiceConfigurator(unittest.TestCase):
+
+    def tearDown(self):
+        set_tracer(None)
+
+    def __configuration(self, tracing_properties):
+        configuration = MagicMock()
+        configuration.property_groups.get_property_group.return_value = tracing_properties
+        return configuration
+
+    def test_disabled(self):
+        TracingServiceConfigurator().configure(self.__configuration(TracingProperties()), MagicMock())
+        self.assertFalse(get_tracer().enabled)
+
+    @patch('osvimdriver.service.tracing.OpenTelemetryTracer')
+    def test_enabled(self, mock_tracer):
+        mock_tracer.return_value.enabled = True
+        tracing_properties = TracingProperties()
+        tracing_properties.enabled = True
+        tracing_properties.exporter = 'otlp'
+        tracing_properties.endpoint = 'http://collector:4318/v1/traces'
+        TracingServiceConfigurator().configure(self.__configuration(tracing_properties), MagicMock())
+        mock_tracer.assert_called_once_with(service_name='os-vim-driver', sample_ratio=0.1, exporter='otlp', endpoint='http://collector:4318/v1/traces')
+        self.assertIs(get_tracer(), mock_tracer.return_value)
+
+    @patch('osvimdriver.service.tracing.OpenTelemetryTracer')
+    def test_enable_without_opentelemetry(self, mock_tracer):
+        mock_tracer.side_effect = ImportError('No module named opentelemetry')
+        with self.assertRaises(ValueError) as context:
+            enable_tracing(TracingProperties())
+        self.assertIn('os-vim-driver[tracing]', str(context.exception))
+
+    def test_enable_with_invalid_sample_ratio(self):
+        tracing_properties = TracingProperties()
+        tracing_properties.sample_ratio = 2
+        with self.assertRaises(ValueError):
+            enable_tracing(tracing_properties)
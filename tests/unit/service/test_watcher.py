@@ -0,0 +1,170 @@
+import unittest
+import os
+import time
+import shutil
+import tempfile
+import threading
+from unittest.mock import MagicMock
+from ignition.model.lifecycle import LifecycleExecution
+from osvimdriver.service.watcher import StackWatcher, SharedWatchState
+
+
+def wait_for(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise AssertionError('Condition not met within {0} seconds'.format(timeout))
+        time.sleep(0.005)
+
+
+class TestStackWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.poll_requests = MagicMock()
+        self.send_execution = MagicMock()
+        self.watcher = StackWatcher(self.poll_requests, self.send_execution, min_interval_seconds=0.01, max_interval_seconds=0.05)
+
+    def tearDown(self):
+        self.watcher.shutdown()
+
+    def test_sends_terminal_execution(self):
+        execution = LifecycleExecution('Create::1::a', 'COMPLETE')
+        self.poll_requests.return_value = {'Create::1::a': execution}
+        self.assertTrue(self.watcher.watch('Create::1::a', {'name': 'dl'}))
+        wait_for(lambda: self.send_execution.called)
+        self.send_execution.assert_called_once_with(execution)
+        self.poll_requests.assert_called_once_with({'name': 'dl'}, ['Create::1::a'])
+        self.assertEqual(self.watcher.watched_count(), 0)
+        self.assertTrue(self.watcher.is_reported('Create::1::a'))
+
+    def test_polls_again_while_in_progress(self):
+        self.poll_requests.side_effect = [
+            {'Create::1::a': LifecycleExecution('Create::1::a', 'IN_PROGRESS')},
+            {'Create::1::a': LifecycleExecution('Create::1::a', 'FAILED')}
+        ]
+        self.watcher.watch('Create::1::a', {'name': 'dl'})
+        wait_for(lambda: self.send_execution.called)
+        self.assertEqual(self.poll_requests.call_count, 2)
+        self.assertEqual(self.send_execution.call_args[0][0].status, 'FAILED')
+
+    def test_polls_requests_for_same_location_together(self):
+        polled = threading.Event()
+
+        def poll_requests(deployment_location, request_ids):
+            polled.set()
+            return {request_id: LifecycleExecution(request_id, 'COMPLETE') for request_id in request_ids}
+        watcher = StackWatcher(MagicMock(side_effect=poll_requests), self.send_execution, min_interval_seconds=0.2)
+        try:
+            watcher.watch('Create::1::a', {'name': 'dl'})
+            watcher.watch('Create::2::b', {'name': 'dl'})
+            wait_for(lambda: self.send_execution.call_count == 2)
+            watcher.poll_requests.assert_called_once_with({'name': 'dl'}, ['Create::1::a', 'Create::2::b'])
+        finally:
+            watcher.shutdown()
+
+    def test_does_not_send_claimed_request(self):
+        self.poll_requests.return_value = {'Create::1::a': LifecycleExecution('Create::1::a', 'COMPLETE')}
+        self.assertTrue(self.watcher.claim('Create::1::a'))
+        self.watcher.watch('Create::1::a', {'name': 'dl'})
+        wait_for(lambda: self.watcher.watched_count() == 0)
+        self.assertFalse(self.watcher.claim('Create::1::a'))
+        self.send_execution.assert_not_called()
+
+    def test_forgets_request_missing_from_result(self):
+        self.poll_requests.return_value = {}
+        self.watcher.watch('Create::1::a', {'name': 'dl'})
+        wait_for(lambda: self.watcher.watched_count() == 0)
+        self.send_execution.assert_not_called()
+        self.assertFalse(self.watcher.is_reported('Create::1::a'))
+
+    def test_retries_after_poll_error(self):
+        self.poll_requests.side_effect = [Exception('Heat unavailable'), {'Create::1::a': LifecycleExecution('Create::1::a', 'COMPLETE')}]
+        self.watcher.watch('Create::1::a', {'name': 'dl'})
+        wait_for(lambda: self.send_execution.called)
+        self.assertEqual(self.poll_requests.call_count, 2)
+
+    def test_send_failure_leaves_request_unreported(self):
+        self.poll_requests.return_value = {'Create::1::a': LifecycleExecution('Create::1::a', 'COMPLETE')}
+        self.send_execution.side_effect = Exception('Kafka unavailable')
+        self.watcher.watch('Create::1::a', {'name': 'dl'})
+        wait_for(lambda: self.send_execution.called)
+        wait_for(lambda: not self.watcher.is_reported('Create::1::a'))
+
+    def test_stops_watching_after_max_watch_seconds(self):
+        self.poll_requests.return_value = {'Create::1::a': LifecycleExecution('Create::1::a', 'IN_PROGRESS')}
+        watcher = StackWatcher(self.poll_requests, self.send_execution, min_interval_seconds=0.01, max_watch_seconds=0.05)
+        try:
+            watcher.watch('Create::1::a', {'name': 'dl'})
+            wait_for(lambda: watcher.watched_count() == 0)
+        finally:
+            watcher.shutdown()
+        self.send_execution.assert_not_called()
+
+    def test_watch_limited_to_max_watched(self):
+        watcher = StackWatcher(self.poll_requests, self.send_execution, min_interval_seconds=60, max_watched=1)
+        try:
+            self.assertTrue(watcher.watch('Create::1::a', {'name': 'dl'}))
+            self.assertFalse(watcher.watch('Create::2::b', {'name': 'dl'}))
+        finally:
+            watcher.shutdown()
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError) as context:
+            StackWatcher(self.poll_requests, self.send_execution, max_workers=0)
+        self.assertEqual(str(context.exception), 'max_workers must be a positive integer')
+
+
+class TestSharedWatchState(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.now = 1000
+        # Instances of two processes
+        self.state = SharedWatchState(self.tmp_dir, max_age_seconds=60, clock=lambda: self.now)
+        self.other_state = SharedWatchState(self.tmp_dir, max_age_seconds=60, clock=lambda: self.now)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_claim_once(self):
+        self.assertTrue(self.state.claim('Create::1::a'))
+        self.assertFalse(self.other_state.claim('Create::1::a'))
+        self.assertTrue(self.other_state.is_reported('Create::1::a'))
+
+    def test_release(self):
+        self.state.claim('Create::1::a')
+        self.state.release('Create::1::a')
+        self.assertFalse(self.other_state.is_reported('Create::1::a'))
+        self.assertTrue(self.other_state.claim('Create::1::a'))
+
+    def test_watched_until_heartbeat_timeout(self):
+        self.state.mark_watched('Create::1::a')
+        self.assertTrue(self.other_state.is_watched('Create::1::a', 10))
+        self.now += 10
+        self.assertFalse(self.other_state.is_watched('Create::1::a', 10))
+        self.state.mark_watched('Create::1::a')
+        self.assertTrue(self.other_state.is_watched('Create::1::a', 10))
+
+    def test_claim_ends_watch(self):
+        self.state.mark_watched('Create::1::a')
+        self.other_state.claim('Create::1::a')
+        self.assertFalse(self.state.is_watched('Create::1::a', 10))
+
+    def test_claim_removes_expired_entries(self):
+        self.state.claim('Create::1::a')
+        os.utime(os.path.join(self.tmp_dir, 'reported', os.listdir(os.path.join(self.tmp_dir, 'reported'))[0]), (self.now, self.now))
+        self.now += 61
+        self.other_state.claim('Create::2::a')
+        self.assertFalse(self.state.is_reported('Create::1::a'))
+        self.assertTrue(self.state.is_reported('Create::2::a'))
+
+    def test_watcher_with_shared_state(self):
+        poll_requests = MagicMock(return_value={'Create::1::a': LifecycleExecution('Create::1::a', 'IN_PROGRESS')})
+        watcher = StackWatcher(poll_requests, MagicMock(), min_interval_seconds=0.01, max_interval_seconds=0.05, state=self.state)
+        other_watcher = StackWatcher(MagicMock(), MagicMock(), state=self.other_state)
+        try:
+            watcher.watch('Create::1::a', {'name': 'dl'})
+            self.assertTrue(other_watcher.is_watched('Create::1::a'))
+        finally:
+            watcher.shutdown()
+        self.assertFalse(other_watcher.is_watched('Create::1::a'))
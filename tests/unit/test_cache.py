@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import MagicMock
+from osvimdriver.cache import LRUCache
+
+
+class FakeClock():
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_init_invalid_max_size(self):
+        with self.assertRaises(ValueError) as context:
+            LRUCache(max_size=0)
+        self.assertEqual(str(context.exception), 'max_size must be a positive integer')
+
+    def test_put_and_get(self):
+        cache = LRUCache(max_size=2)
+        cache.put('A', 1)
+        self.assertEqual(cache.get('A'), 1)
+        self.assertIn('A', cache)
+        self.assertIsNone(cache.get('B'))
+        self.assertEqual(cache.get('B', 'default'), 'default')
+
+    def test_evicts_least_recently_used(self):
+        on_evict = MagicMock()
+        cache = LRUCache(max_size=2, on_evict=on_evict)
+        cache.put('A', 1)
+        cache.put('B', 2)
+        cache.get('A')
+        cache.put('C', 3)
+        self.assertEqual(cache.keys(), ['A', 'C'])
+        on_evict.assert_called_once_with('B', 2)
+
+    def test_items_does_not_mark_entries_used(self):
+        clock = FakeClock()
+        cache = LRUCache(max_size=2, max_idle_seconds=10, clock=clock)
+        cache.put('A', 1)
+        cache.put('B', 2)
+        clock.now = 5
+        self.assertEqual(cache.items(), [('A', 1), ('B', 2)])
+        clock.now = 10
+        self.assertEqual(cache.items(), [])
+
+    def test_items_excludes_expired_entries(self):
+        clock = FakeClock()
+        cache = LRUCache(max_size=2, max_age_seconds=10, clock=clock)
+        cache.put('A', 1)
+        clock.now = 5
+        cache.put('B', 2)
+        clock.now = 10
+        self.assertEqual(cache.items(), [('B', 2)])
+
+    def test_max_age(self):
+        clock = FakeClock()
+        cache = LRUCache(max_size=2, max_age_seconds=10, clock=clock)
+        cache.put('A', 1)
+        clock.now = 5
+        self.assertEqual(cache.get('A'), 1)
+        clock.now = 10
+        self.assertIsNone(cache.get('A'))
+        self.assertEqual(len(cache), 0)
+
+    def test_max_idle(self):
+        on_evict = MagicMock()
+        clock = FakeClock()
+        cache = LRUCache(max_size=2, max_idle_seconds=10, on_evict=on_evict, clock=clock)
+        cache.put('A', 1)
+        clock.now = 8
+        self.assertEqual(cache.get('A'), 1)
+        clock.now = 16
+        self.assertEqual(cache.get('A'), 1)
+        clock.now = 26
+        cache.expire()
+        self.assertEqual(len(cache), 0)
+        on_evict.assert_called_once_with('A', 1)
+
+    def test_pop_does_not_call_on_evict(self):
+        on_evict = MagicMock()
+        cache = LRUCache(max_size=2, on_evict=on_evict)
+        cache.put('A', 1)
+        self.assertEqual(cache.pop('A'), 1)
+        self.assertIsNone(cache.pop('A'))
+        on_evict.assert_not_called()
+
+    def test_clear_calls_on_evict(self):
+        on_evict = MagicMock()
+        cache = LRUCache(max_size=2, on_evict=on_evict)
+        cache.put('A', 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        on_evict.assert_called_once_with('A', 1)
@@ -0,0 +1,127 @@
+import unittest
+from unittest.mock import MagicMock
+from ignition.service.resourcedriver import RequestNotFoundError
+from osvimdriver.openstack.heat.driver import StackNotFoundError
+from osvimdriver.metrics import DriverMetrics, InstrumentedDriver, get_metrics, set_metrics, instrument_driver, instrument_authentication, outcome_of
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+
+class RecordingMetrics(DriverMetrics):
+
+    enabled = True
+
+    def __init__(self):
+        self.lifecycles = []
+        self.openstack_calls = []
+        self.authentications = []
+
+    def observe_lifecycle(self, lifecycle, seconds, outcome):
+        self.lifecycles.append((lifecycle, outcome))
+
+    def observe_openstack_call(self, service, operation, location, seconds, outcome):
+        self.openstack_calls.append((service, operation, location, outcome))
+
+    def observe_authentication(self, location, outcome):
+        self.authentications.append((location, outcome))
+
+
+class TestOutcome(unittest.TestCase):
+
+    def test_outcome_of(self):
+        self.assertEqual(outcome_of(None), 'success')
+        self.assertEqual(outcome_of(StackNotFoundError('missing')), 'not_found')
+        self.assertEqual(outcome_of(RequestNotFoundError('missing')), 'not_found')
+        self.assertEqual(outcome_of(ValueError('bad')), 'error')
+
+
+class TestDriverMetrics(unittest.TestCase):
+
+    def test_time_lifecycle(self):
+        metrics = RecordingMetrics()
+        with metrics.time_lifecycle('Create'):
+            pass
+        with self.assertRaises(ValueError):
+            with metrics.time_lifecycle('Delete'):
+                raise ValueError('failed')
+        self.assertEqual(metrics.lifecycles, [('Create', 'success'), ('Delete', 'error')])
+
+    def test_disabled_generate_latest(self):
+        content_type, content = DriverMetrics().generate_latest()
+        self.assertTrue(content_type.startswith('text/plain'))
+        self.assertEqual(content, b'')
+
+
+class TestInstrumentedDriver(unittest.TestCase):
+
+    def test_records_calls(self):
+        metrics = RecordingMetrics()
+        driver = MagicMock()
+        driver.create_stack.return_value = '1'
+        driver.get_stack.side_effect = StackNotFoundError('missing')
+        instrumented = InstrumentedDriver(driver, metrics, 'heat', 'test')
+        self.assertEqual(instrumented.create_stack('name', 'template'), '1')
+        driver.create_stack.assert_called_once_with('name', 'template')
+        with self.assertRaises(StackNotFoundError):
+            instrumented.get_stack('1')
+        self.assertEqual(metrics.openstack_calls, [('heat', 'create_stack', 'test', 'success'), ('heat', 'get_stack', 'test', 'not_found')])
+
+    def test_does_not_record_attributes(self):
+        metrics = RecordingMetrics()
+        driver = MagicMock(max_stacks=5)
+        instrumented = InstrumentedDriver(driver, metrics, 'heat', 'test')
+        self.assertEqual(instrumented.max_stacks, 5)
+        self.assertEqual(metrics.openstack_calls, [])
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def tearDown(self):
+        set_metrics(None)
+
+    def test_disabled_by_default(self):
+        self.assertFalse(get_metrics().enabled)
+        driver = MagicMock()
+        self.assertIs(instrument_driver(driver, 'heat', 'test'), driver)
+
+    def test_instrument_driver(self):
+        metrics = RecordingMetrics()
+        set_metrics(metrics)
+        instrumented = instrument_driver(MagicMock(), 'neutron', 'test')
+        instrumented.get_network_by_name('net')
+        self.assertEqual(metrics.openstack_calls, [('neutron', 'get_network_by_name', 'test', 'success')])
+
+    def test_instrument_authentication(self):
+        metrics = RecordingMetrics()
+        set_metrics(metrics)
+        auth = MagicMock()
+        auth.get_auth_ref.side_effect = [MagicMock(), ValueError('unauthorized')]
+        instrumented = instrument_authentication(auth, 'test')
+        instrumented.get_auth_ref(MagicMock())
+        with self.assertRaises(ValueError):
+            instrumented.get_auth_ref(MagicMock())
+        self.assertEqual(metrics.authentications, [('test', 'success'), ('test', 'error')])
+
+    def test_set_metrics_none_restores_default(self):
+        set_metrics(RecordingMetrics())
+        set_metrics(None)
+        self.assertFalse(get_metrics().enabled)
+
+
+@unittest.skipUnless(prometheus_client is not None, 'prometheus_client is not installed')
+class TestPrometheusMetrics(unittest.TestCase):
+
+    def test_generate_latest(self):
+        from osvimdriver.metrics import PrometheusMetrics
+        metrics = PrometheusMetrics(registry=prometheus_client.CollectorRegistry())
+        metrics.observe_lifecycle('Create', 0.5, 'success')
+        metrics.observe_openstack_call('heat', 'create_stack', 'test', 0.1, 'success')
+        metrics.observe_create_phase('create_stack', 'test', 0.1)
+        _, content = metrics.generate_latest()
+        content = content.decode('utf-8')
+        self.assertIn('ovd_lifecycle_requests_total{lifecycle="Create",outcome="success"} 1.0', content)
+        self.assertIn('ovd_openstack_request_duration_seconds_count{location="test",operation="create_stack",service="heat"} 1.0', content)
+        self.assertIn('ovd_create_phase_duration_seconds_count{location="test",phase="create_stack"} 1.0', content)
@@ -0,0 +1,128 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from unittest.mock import patch
+from osvimdriver.store import PersistentStore, get_shared_store
+
+
+class TestPersistentStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'cache', 'ovd_cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_init_without_path_fails(self):
+        with self.assertRaises(ValueError) as context:
+            PersistentStore(None)
+        self.assertEqual(str(context.exception), 'path must be provided')
+
+    def test_get_and_put(self):
+        store = PersistentStore(self.path)
+        self.assertIsNone(store.get('translations', 'A'))
+        store.put('translations', 'A', b'a')
+        self.assertEqual(store.get('translations', 'A'), b'a')
+        self.assertIsNone(store.get('heat_parameters', 'A'))
+
+    def test_put_replaces_value(self):
+        store = PersistentStore(self.path)
+        store.put('translations', 'A', b'a')
+        store.put('translations', 'A', b'aa')
+        self.assertEqual(store.get('translations', 'A'), b'aa')
+        self.assertEqual(store.size(), 2)
+
+    def test_put_requires_bytes(self):
+        store = PersistentStore(self.path)
+        with self.assertRaises(ValueError) as context:
+            store.put('translations', 'A', 'a')
+        self.assertEqual(str(context.exception), 'value must be bytes')
+
+    def test_delete(self):
+        store = PersistentStore(self.path)
+        store.put('translations', 'A', b'a')
+        store.delete('translations', 'A')
+        self.assertIsNone(store.get('translations', 'A'))
+
+    def test_entries_shared_between_instances(self):
+        PersistentStore(self.path).put('translations', 'A', b'a')
+        self.assertEqual(PersistentStore(self.path).get('translations', 'A'), b'a')
+
+    def test_uses_wal_journal(self):
+        PersistentStore(self.path)
+        connection = sqlite3.connect(self.path)
+        try:
+            self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        finally:
+            connection.close()
+
+    def test_evicts_least_recently_read_when_full(self):
+        store = PersistentStore(self.path, max_size_bytes=30, touch_interval_seconds=0)
+        with patch('osvimdriver.store.time.time', side_effect=[1, 2, 3, 4, 5]):
+            store.put('translations', 'A', b'a' * 10)
+            store.put('translations', 'B', b'b' * 10)
+            store.put('translations', 'C', b'c' * 10)
+            store.get('translations', 'A')
+            store.put('translations', 'D', b'd' * 10)
+        self.assertIsNone(store.get('translations', 'B'))
+        self.assertEqual(store.get('translations', 'A'), b'a' * 10)
+        self.assertEqual(store.get('translations', 'D'), b'd' * 10)
+        self.assertLessEqual(store.size(), 30)
+
+    def test_concurrent_writers(self):
+        store = PersistentStore(self.path)
+        def write(thread_idx):
+            for i in range(20):
+                store.put('translations', '{0}-{1}'.format(thread_idx, i), b'x')
+        threads = [threading.Thread(target=write, args=(idx,)) for idx in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(store.size(), 80)
+
+    def test_seed(self):
+        seed_path = os.path.join(self.tmp_dir, 'seed', 'ovd_cache.db')
+        PersistentStore(seed_path).put('translations', 'A', b'seeded')
+        store = PersistentStore(self.path)
+        store.put('translations', 'B', b'existing')
+        store = PersistentStore(self.path, seed_path=seed_path)
+        self.assertEqual(store.get('translations', 'A'), b'seeded')
+        self.assertEqual(store.get('translations', 'B'), b'existing')
+
+    def test_seed_does_not_replace_existing_entries(self):
+        seed_path = os.path.join(self.tmp_dir, 'seed', 'ovd_cache.db')
+        PersistentStore(seed_path).put('translations', 'A', b'seeded')
+        PersistentStore(self.path).put('translations', 'A', b'existing')
+        store = PersistentStore(self.path, seed_path=seed_path)
+        self.assertEqual(store.get('translations', 'A'), b'existing')
+
+    def test_seed_applied_once(self):
+        seed_path = os.path.join(self.tmp_dir, 'seed', 'ovd_cache.db')
+        PersistentStore(seed_path).put('translations', 'A', b'seeded')
+        store = PersistentStore(self.path, seed_path=seed_path)
+        store.delete('translations', 'A')
+        store = PersistentStore(self.path, seed_path=seed_path)
+        self.assertIsNone(store.get('translations', 'A'))
+
+    def test_missing_seed_ignored(self):
+        store = PersistentStore(self.path, seed_path=os.path.join(self.tmp_dir, 'missing.db'))
+        self.assertEqual(store.size(), 0)
+
+    def test_get_returns_none_on_error(self):
+        store = PersistentStore(self.path)
+        os.remove(self.path)
+        os.makedirs(self.path)
+        fresh_store_thread_result = []
+        thread = threading.Thread(target=lambda: fresh_store_thread_result.append(store.get('translations', 'A')))
+        thread.start()
+        thread.join()
+        self.assertEqual(fresh_store_thread_result, [None])
+
+    def test_get_shared_store(self):
+        store = get_shared_store(self.path)
+        self.assertIs(get_shared_store(self.path), store)
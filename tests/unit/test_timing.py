@@ -0,0 +1,128 @@
+import unittest
+from osvimdriver.timing import Histogram, PhaseTimings, RequestTimer, activate_timer, active_timer, timed_phase, template_hash
+
+
+class FakeClock():
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_observe(self):
+        histogram = Histogram(buckets=(1, 5))
+        histogram.observe(0.5)
+        histogram.observe(1)
+        histogram.observe(3)
+        histogram.observe(10)
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.sum, 14.5)
+        self.assertEqual(histogram.cumulative_counts(), [(1, 2), (5, 3), (float('inf'), 4)])
+
+    def test_copy(self):
+        histogram = Histogram(buckets=(1,))
+        histogram.observe(0.5)
+        copy = histogram.copy()
+        histogram.observe(0.5)
+        self.assertEqual(copy.count, 1)
+        self.assertEqual(copy.cumulative_counts(), [(1, 1), (float('inf'), 1)])
+
+    def test_to_dict(self):
+        histogram = Histogram(buckets=(1,))
+        histogram.observe(2)
+        self.assertEqual(histogram.to_dict(), {'count': 1, 'sum': 2, 'buckets': [{'le': 1, 'count': 0}, {'le': float('inf'), 'count': 1}]})
+
+
+class TestPhaseTimings(unittest.TestCase):
+
+    def test_observe_by_labels(self):
+        timings = PhaseTimings(buckets=(1,))
+        timings.observe('Create', 'parse', 0.5, location='locA', template_hash='abc')
+        timings.observe('Create', 'parse', 0.7, location='locA', template_hash='abc')
+        timings.observe('Create', 'parse', 0.5, location='locB', template_hash='abc')
+        series = {tuple(sorted(labels.items())): histogram for labels, histogram in timings.collect()}
+        self.assertEqual(len(series), 2)
+        histogram = series[(('location', 'locA'), ('phase', 'parse'), ('request_type', 'Create'), ('template_hash', 'abc'))]
+        self.assertEqual(histogram.count, 2)
+
+    def test_max_series(self):
+        timings = PhaseTimings(max_series=2)
+        timings.observe('Create', 'parse', 0.5, template_hash='a')
+        timings.observe('Create', 'parse', 0.5, template_hash='b')
+        timings.observe('Create', 'parse', 0.5, template_hash='c')
+        self.assertEqual(sorted(labels['template_hash'] for labels, _ in timings.collect()), ['b', 'c'])
+
+    def test_clear(self):
+        timings = PhaseTimings()
+        timings.observe('Create', 'parse', 0.5)
+        timings.clear()
+        self.assertEqual(timings.collect(), [])
+
+
+class TestRequestTimer(unittest.TestCase):
+
+    def test_phases(self):
+        clock = FakeClock()
+        timer = RequestTimer('Create', clock=clock)
+        with timer.phase('parse'):
+            clock.now = 0.25
+        with timer.phase('translate'):
+            clock.now = 1
+        self.assertEqual(timer.phases, [('parse', 0.25), ('translate', 0.75)])
+        self.assertEqual(timer.describe(), 'parse=250.0ms, translate=750.0ms')
+
+    def test_phase_timed_on_error(self):
+        timer = RequestTimer('Create')
+        with self.assertRaises(ValueError):
+            with timer.phase('parse'):
+                raise ValueError('Invalid')
+        self.assertEqual([name for name, _ in timer.phases], ['parse'])
+
+    def test_finish_records_phases(self):
+        clock = FakeClock()
+        timings = PhaseTimings()
+        timer = RequestTimer('Create', timings=timings, location='locA', clock=clock)
+        timer.add([('parse', 0.5)])
+        timer.template_hash = 'abc'
+        clock.now = 2
+        self.assertEqual(timer.finish(), 2)
+        series = {labels['phase']: (labels, histogram) for labels, histogram in timings.collect()}
+        self.assertEqual(series['parse'][0], {'request_type': 'Create', 'phase': 'parse', 'location': 'locA', 'template_hash': 'abc'})
+        self.assertEqual(series['parse'][1].sum, 0.5)
+        self.assertEqual(series['total'][1].sum, 2)
+
+
+class TestTimedPhase(unittest.TestCase):
+
+    def test_timed_phase_without_active_timer(self):
+        with timed_phase('parse'):
+            pass
+        self.assertIsNone(active_timer())
+
+    def test_timed_phase_with_active_timer(self):
+        timer = RequestTimer('Create')
+        with activate_timer(timer):
+            with timed_phase('parse'):
+                pass
+        self.assertEqual([name for name, _ in timer.phases], ['parse'])
+        self.assertIsNone(active_timer())
+
+    def test_activate_timer_restores_previous(self):
+        outer = RequestTimer('Create')
+        inner = RequestTimer('translation')
+        with activate_timer(outer):
+            with activate_timer(inner):
+                self.assertIs(active_timer(), inner)
+            self.assertIs(active_timer(), outer)
+
+
+class TestTemplateHash(unittest.TestCase):
+
+    def test_template_hash(self):
+        self.assertEqual(template_hash('a'), template_hash('a'))
+        self.assertNotEqual(template_hash('a'), template_hash('b'))
+        self.assertEqual(len(template_hash('a')), 12)
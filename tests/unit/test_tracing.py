@@ -0,0 +1,151 @@
+import unittest
+import contextlib
+from unittest.mock import MagicMock
+import flask
+from osvimdriver.tracing import DriverTracer, TracedDriver, NO_SPAN, get_tracer, set_tracer, trace_driver, trace_authentication, incoming_headers
+
+try:
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+    InMemorySpanExporter = None
+
+
+class RecordingSpan():
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class RecordingTracer(DriverTracer):
+
+    enabled = True
+
+    def __init__(self):
+        self.spans = []
+
+    @contextlib.contextmanager
+    def span(self, name, attributes=None):
+        span = RecordingSpan(name, attributes)
+        self.spans.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.error = e
+            raise
+
+
+class TestDriverTracer(unittest.TestCase):
+
+    def test_span_does_nothing(self):
+        with DriverTracer().span('test', {'ovd.location': 'test'}) as span:
+            span.set_attribute('ovd.request_id', '1')
+        self.assertIs(span, NO_SPAN)
+
+
+class TestIncomingHeaders(unittest.TestCase):
+
+    def test_outside_request(self):
+        self.assertIsNone(incoming_headers())
+
+    def test_inside_request(self):
+        app = flask.Flask(__name__)
+        with app.test_request_context(headers={'Traceparent': '00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01'}):
+            headers = incoming_headers()
+        self.assertEqual(headers['traceparent'], '00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01')
+
+
+class TestTracedDriver(unittest.TestCase):
+
+    def test_calls_in_spans(self):
+        tracer = RecordingTracer()
+        driver = MagicMock()
+        driver.create_stack.return_value = '1'
+        driver.get_stack.side_effect = ValueError('failed')
+        traced = TracedDriver(driver, tracer, 'heat', 'test')
+        self.assertEqual(traced.create_stack('name', 'template'), '1')
+        driver.create_stack.assert_called_once_with('name', 'template')
+        with self.assertRaises(ValueError):
+            traced.get_stack('1')
+        self.assertEqual([span.name for span in tracer.spans], ['heat.create_stack', 'heat.get_stack'])
+        self.assertEqual(tracer.spans[0].attributes, {'ovd.location': 'test'})
+        self.assertIsInstance(tracer.spans[1].error, ValueError)
+
+    def test_does_not_trace_attributes(self):
+        tracer = RecordingTracer()
+        traced = TracedDriver(MagicMock(max_stacks=5), tracer, 'heat', 'test')
+        self.assertEqual(traced.max_stacks, 5)
+        self.assertEqual(tracer.spans, [])
+
+
+class TestTracing(unittest.TestCase):
+
+    def tearDown(self):
+        set_tracer(None)
+
+    def test_disabled_by_default(self):
+        self.assertFalse(get_tracer().enabled)
+        driver = MagicMock()
+        self.assertIs(trace_driver(driver, 'heat', 'test'), driver)
+        auth = MagicMock()
+        get_auth_ref = auth.get_auth_ref
+        self.assertIs(trace_authentication(auth, 'test').get_auth_ref, get_auth_ref)
+
+    def test_trace_driver(self):
+        tracer = RecordingTracer()
+        set_tracer(tracer)
+        trace_driver(MagicMock(), 'neutron', 'test').get_network_by_name('net')
+        self.assertEqual([span.name for span in tracer.spans], ['neutron.get_network_by_name'])
+
+    def test_trace_authentication(self):
+        tracer = RecordingTracer()
+        set_tracer(tracer)
+        auth = MagicMock()
+        auth.get_auth_ref.return_value = 'auth_ref'
+        get_auth_ref = auth.get_auth_ref
+        traced = trace_authentication(auth, 'test')
+        session = MagicMock()
+        self.assertEqual(traced.get_auth_ref(session), 'auth_ref')
+        get_auth_ref.assert_called_once_with(session)
+        self.assertEqual([(span.name, span.attributes) for span in tracer.spans], [('keystone.authenticate', {'ovd.location': 'test'})])
+
+
+@unittest.skipUnless(InMemorySpanExporter is not None, 'the OpenTelemetry SDK is not installed')
+class TestOpenTelemetryTracer(unittest.TestCase):
+
+    def setUp(self):
+        from osvimdriver.tracing import OpenTelemetryTracer
+        self.exporter = InMemorySpanExporter()
+        self.tracer = OpenTelemetryTracer(sample_ratio=1.0, span_processor=SimpleSpanProcessor(self.exporter))
+
+    def tearDown(self):
+        self.tracer.shutdown()
+
+    def test_child_spans(self):
+        with self.tracer.span('execute_lifecycle', {'ovd.lifecycle': 'Create', 'ovd.location': None}):
+            with self.tracer.span('heat.create_stack'):
+                pass
+        child, parent = self.exporter.get_finished_spans()
+        self.assertEqual(child.parent.span_id, parent.context.span_id)
+        self.assertEqual(dict(parent.attributes), {'ovd.lifecycle': 'Create'})
+
+    def test_continues_trace_of_request(self):
+        app = flask.Flask(__name__)
+        with app.test_request_context(headers={'traceparent': '00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01'}):
+            with self.tracer.span('execute_lifecycle'):
+                pass
+        span, = self.exporter.get_finished_spans()
+        self.assertEqual(format(span.context.trace_id, '032x'), '0af7651916cd43dd8448eb211c80319c')
+        self.assertEqual(format(span.parent.span_id, '016x'), 'b7ad6b7169203331')
+
+    def test_unsampled(self):
+        from osvimdriver.tracing import OpenTelemetryTracer
+        tracer = OpenTelemetryTracer(sample_ratio=0, span_processor=SimpleSpanProcessor(self.exporter))
+        with tracer.span('execute_lifecycle'):
+            pass
+        self.assertEqual(len(self.exporter.get_finished_spans()), 0)
@@ -0,0 +1,23 @@
+import unittest
+import yaml
+import osvimdriver.yamlutil as yamlutil
+
+
+class TestYamlUtil(unittest.TestCase):
+
+    def test_uses_libyaml_when_available(self):
+        if yaml.__with_libyaml__:
+            self.assertTrue(yamlutil.LIBYAML_AVAILABLE)
+            self.assertIs(yamlutil.SafeLoader, yaml.CSafeLoader)
+            self.assertIs(yamlutil.Dumper, yaml.CDumper)
+        else:
+            self.assertIs(yamlutil.SafeLoader, yaml.SafeLoader)
+            self.assertIs(yamlutil.Dumper, yaml.Dumper)
+
+    def test_safe_load(self):
+        content = 'a: 1\nb:\n  - x\n  - {c: null}\nd: |\n  line1\n  line2\n'
+        self.assertEqual(yamlutil.safe_load(content), yaml.safe_load(content))
+
+    def test_safe_load_rejects_unsafe_tags(self):
+        with self.assertRaises(yaml.YAMLError):
+            yamlutil.safe_load('a: !!python/object/apply:os.getcwd []')
@@ -0,0 +1,144 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+from osvimdriver.tosca.cache import TranslationCache, translation_cache_key, find_imported_files
+
+TEMPLATE_WITH_IMPORTS = '''
+tosca_definitions_version: tosca_simple_yaml_1_2
+imports:
+  - ./types.yaml
+  - etsi_nfv_sol001
+'''
+
+
+class TestTranslationCacheKey(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.template_path = os.path.join(self.tmp_dir, 'tosca.yaml')
+        self.__write_types('types: A')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __write_types(self, content):
+        with open(os.path.join(self.tmp_dir, 'types.yaml'), 'w') as f:
+            f.write(content)
+
+    def test_same_template_has_same_key(self):
+        self.assertEqual(translation_cache_key(TEMPLATE_WITH_IMPORTS, self.template_path), translation_cache_key(TEMPLATE_WITH_IMPORTS, self.template_path))
+
+    def test_same_files_in_different_directories_have_same_key(self):
+        other_dir = tempfile.mkdtemp()
+        try:
+            shutil.copy(os.path.join(self.tmp_dir, 'types.yaml'), os.path.join(other_dir, 'types.yaml'))
+            other_template_path = os.path.join(other_dir, 'tosca.yaml')
+            self.assertEqual(translation_cache_key(TEMPLATE_WITH_IMPORTS, self.template_path), translation_cache_key(TEMPLATE_WITH_IMPORTS, other_template_path))
+        finally:
+            shutil.rmtree(other_dir)
+
+    def test_same_nested_imports_in_different_directories_have_same_key(self):
+        self.__write_types('imports:\n  - nested/more_types.yaml\n')
+        other_dir = tempfile.mkdtemp()
+        try:
+            for directory in [self.tmp_dir, other_dir]:
+                os.makedirs(os.path.join(directory, 'nested'))
+                with open(os.path.join(directory, 'nested', 'more_types.yaml'), 'w') as f:
+                    f.write('types: A')
+            shutil.copy(os.path.join(self.tmp_dir, 'types.yaml'), os.path.join(other_dir, 'types.yaml'))
+            self.assertEqual(translation_cache_key(TEMPLATE_WITH_IMPORTS, self.template_path),
+                             translation_cache_key(TEMPLATE_WITH_IMPORTS, os.path.join(other_dir, 'tosca.yaml')))
+        finally:
+            shutil.rmtree(other_dir)
+
+    def test_different_template_has_different_key(self):
+        self.assertNotEqual(translation_cache_key(TEMPLATE_WITH_IMPORTS), translation_cache_key(TEMPLATE_WITH_IMPORTS + '\n# changed'))
+
+    def test_change_to_relative_import_changes_key(self):
+        first_key = translation_cache_key(TEMPLATE_WITH_IMPORTS, self.template_path)
+        self.__write_types('types: B')
+        self.assertNotEqual(first_key, translation_cache_key(TEMPLATE_WITH_IMPORTS, self.template_path))
+
+    def test_missing_relative_import(self):
+        os.remove(os.path.join(self.tmp_dir, 'types.yaml'))
+        key = translation_cache_key(TEMPLATE_WITH_IMPORTS, self.template_path)
+        self.assertEqual(len(key), 64)
+
+    def test_invalid_yaml(self):
+        key = translation_cache_key('imports: [', self.template_path)
+        self.assertEqual(len(key), 64)
+
+    def test_change_to_nested_import_changes_key(self):
+        self.__write_types('imports:\n  - nested/more_types.yaml\n')
+        os.makedirs(os.path.join(self.tmp_dir, 'nested'))
+        nested_path = os.path.join(self.tmp_dir, 'nested', 'more_types.yaml')
+        with open(nested_path, 'w') as f:
+            f.write('imports:\n  - ../types.yaml\ntypes: A')
+        first_key = translation_cache_key(TEMPLATE_WITH_IMPORTS, self.template_path)
+        with open(nested_path, 'w') as f:
+            f.write('imports:\n  - ../types.yaml\ntypes: B')
+        self.assertNotEqual(first_key, translation_cache_key(TEMPLATE_WITH_IMPORTS, self.template_path))
+
+    def test_change_to_absolute_import_changes_key(self):
+        template = 'imports:\n  - {0}\n'.format(os.path.join(self.tmp_dir, 'types.yaml'))
+        first_key = translation_cache_key(template)
+        self.__write_types('types: B')
+        self.assertNotEqual(first_key, translation_cache_key(template))
+
+    def test_find_imported_files(self):
+        self.__write_types('imports:\n  - other_types.yaml\n  - {named: {file: ./types.yaml}}\n')
+        with open(os.path.join(self.tmp_dir, 'other_types.yaml'), 'w') as f:
+            f.write('types: A')
+        imported_files = find_imported_files(TEMPLATE_WITH_IMPORTS, self.template_path)
+        self.assertEqual([path for path, _ in imported_files], [os.path.join(self.tmp_dir, 'types.yaml'), os.path.join(self.tmp_dir, 'other_types.yaml')])
+
+    def test_url_import_is_not_cached(self):
+        self.assertIsNone(translation_cache_key('imports:\n  - https://example.com/types.yaml\n', self.template_path))
+        self.__write_types('imports:\n  - {file: types.yaml, repository: my_repo}\n')
+        self.assertIsNone(translation_cache_key(TEMPLATE_WITH_IMPORTS, self.template_path))
+
+    def test_version_change_changes_key(self):
+        first_key = translation_cache_key(TEMPLATE_WITH_IMPORTS)
+        with patch.dict('osvimdriver.tosca.cache.TRANSLATOR_VERSIONS', {'heat-translator': 'other'}):
+            self.assertNotEqual(first_key, translation_cache_key(TEMPLATE_WITH_IMPORTS))
+
+
+class TestTranslationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_get_and_put(self):
+        cache = TranslationCache()
+        self.assertIsNone(cache.get('A'))
+        cache.put('A', 'heat_template_version: 2013-05-23')
+        self.assertEqual(cache.get('A'), 'heat_template_version: 2013-05-23')
+
+    def test_evicts_least_recently_used(self):
+        cache = TranslationCache(max_size=2)
+        cache.put('A', 'a')
+        cache.put('B', 'b')
+        cache.get('A')
+        cache.put('C', 'c')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('B'))
+        self.assertEqual(cache.get('A'), 'a')
+
+    def test_persists_to_directory(self):
+        directory = os.path.join(self.tmp_dir, 'translations')
+        TranslationCache(directory=directory).put('A', 'a')
+        self.assertTrue(os.path.exists(os.path.join(directory, 'A.yaml')))
+        cache = TranslationCache(directory=directory)
+        self.assertEqual(cache.get('A'), 'a')
+        self.assertEqual(len(cache), 1)
+
+    def test_put_ignores_write_failure(self):
+        cache = TranslationCache(directory=self.tmp_dir)
+        with patch('osvimdriver.tosca.cache.tempfile.mkstemp', side_effect=OSError('read only')):
+            cache.put('A', 'a')
+        self.assertEqual(cache.get('A'), 'a')
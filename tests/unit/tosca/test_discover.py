@@ -58,6 +58,8 @@ discover_network_with_token_output_file = os.path.join(tosca_templates_dir, TOSC
 discover_network_with_get_operation_output_file = os.path.join(tosca_templates_dir, TOSCA_DISCOVER_NETWORK_WITH_GET_OPERATION_OUTPUT_FILE)
 discover_network_full_attributes_support_file = os.path.join(tosca_templates_dir, TOSCA_DISCOVER_NETWORK_FULL_ATTRIBUTES_SUPPORT_FILE)
 
+NETWORK_FIELDS = ['name', 'id', 'provider:segmentation_id', 'provider:physical_network', 'provider:network_type', 'subnets']
+
 
 class TestNetworkSearchImpl(unittest.TestCase):
 
@@ -126,7 +128,7 @@ class TestNetworkSearchImpl(unittest.TestCase):
         tosca_template = self.__get_template(discover_network_tosca_file)
         search_impl = NetworkSearchImpl(self.mock_openstack_location)
         search_result = search_impl.discover(tosca_template)
-        self.mock_neutron_driver.get_network_by_name.assert_called_once_with('TestNetwork')
+        self.mock_neutron_driver.get_network_by_name.assert_called_once_with('TestNetwork', fields=NETWORK_FIELDS)
         self.assertIsInstance(search_result, DiscoveryResult)
         self.assertEqual(search_result.discover_id, 'TestNetwork')
         self.assertEqual(search_result.outputs, {})
@@ -149,7 +151,7 @@ class TestNetworkSearchImpl(unittest.TestCase):
         self.assertIsInstance(search_result, DiscoveryResult)
         self.assertEqual(search_result.discover_id, 'NetworkA')
         self.assertEqual(search_result.outputs, {})
-        self.mock_neutron_driver.get_network_by_name.assert_called_once_with('NetworkA')
+        self.mock_neutron_driver.get_network_by_name.assert_called_once_with('NetworkA', fields=NETWORK_FIELDS)
 
     def test_discover_network_with_unsupported_property_function_fails(self):
         tosca_template = self.__get_template(discover_network_with_unsupported_property_function_file)
@@ -178,7 +180,7 @@ class TestNetworkSearchImpl(unittest.TestCase):
         tosca_template = self.__get_template(discover_network_with_outputs_file)
         search_impl = NetworkSearchImpl(self.mock_openstack_location)
         search_result = search_impl.discover(tosca_template)
-        self.mock_neutron_driver.get_network_by_name.assert_called_once_with('TestNetwork')
+        self.mock_neutron_driver.get_network_by_name.assert_called_once_with('TestNetwork', fields=NETWORK_FIELDS)
         self.assertIsInstance(search_result, DiscoveryResult)
         self.assertEqual(search_result.discover_id, 'TestNetwork')
         self.assertEqual(search_result.outputs, {'network_name': 'TestNetwork'})
@@ -188,7 +190,7 @@ class TestNetworkSearchImpl(unittest.TestCase):
         tosca_template = self.__get_template(discover_network_with_fixed_output_file)
         search_impl = NetworkSearchImpl(self.mock_openstack_location)
         search_result = search_impl.discover(tosca_template)
-        self.mock_neutron_driver.get_network_by_name.assert_called_once_with('TestNetwork')
+        self.mock_neutron_driver.get_network_by_name.assert_called_once_with('TestNetwork', fields=NETWORK_FIELDS)
         self.assertIsInstance(search_result, DiscoveryResult)
         self.assertEqual(search_result.discover_id, 'TestNetwork')
         self.assertEqual(search_result.outputs, {'found': True})
@@ -304,13 +306,15 @@ class TestNetworkSearchImpl(unittest.TestCase):
             else:
                 raise ValueError('Not a mocked subnet: {0}'.formt(subnet_id))
         self.mock_neutron_driver.get_subnet_by_id.side_effect = mock_get_subnet_by_id
+        # Neutron does not guarantee the order of a list
+        self.mock_neutron_driver.get_subnets_by_ids.return_value = [self.test_subnet_b, self.test_subnet_a]
 
     def test_discover_full_attribute_support(self):
         self.__configure_mock_neutron_driver_with_network_and_subnets('TestNetwork')
         tosca_template = self.__get_template(discover_network_full_attributes_support_file)
         search_impl = NetworkSearchImpl(self.mock_openstack_location)
         search_result = search_impl.discover(tosca_template)
-        self.mock_neutron_driver.get_network_by_name.assert_called_once_with('TestNetwork')
+        self.mock_neutron_driver.get_network_by_name.assert_called_once_with('TestNetwork', fields=NETWORK_FIELDS)
         self.assertIsInstance(search_result, DiscoveryResult)
         self.assertEqual(search_result.discover_id, 'TestNetwork')
         self.assertEqual(search_result.outputs, {
@@ -326,6 +330,19 @@ class TestNetworkSearchImpl(unittest.TestCase):
             'physical_network': self.test_network['provider:physical_network'],
             'dhcp_enabled': self.test_subnet_a['enable_dhcp']
         })
+        self.mock_neutron_driver.get_subnets_by_ids.assert_called_once_with(['1234', '5678'])
+        self.mock_neutron_driver.get_subnet_by_id.assert_not_called()
+
+    def test_discover_retrieves_first_subnet_missing_from_list(self):
+        self.__configure_mock_neutron_driver_with_network_and_subnets('TestNetwork')
+        self.mock_neutron_driver.get_subnets_by_ids.return_value = [self.test_subnet_b]
+        tosca_template = self.__get_template(discover_network_full_attributes_support_file)
+        search_impl = NetworkSearchImpl(self.mock_openstack_location)
+        search_result = search_impl.discover(tosca_template)
+        self.assertEqual(search_result.outputs['cidr'], self.test_subnet_a['cidr'])
+        self.assertEqual(search_result.outputs['gateway_ip'], self.test_subnet_a['gateway_ip'])
+        self.mock_neutron_driver.get_subnets_by_ids.assert_called_once_with(['1234', '5678'])
+        self.mock_neutron_driver.get_subnet_by_id.assert_called_once_with('1234')
 
     def test_discover_not_found_raises_exception(self):
         self.__configure_mock_neutron_driver_with_not_found('TestNetwork')
@@ -0,0 +1,61 @@
+import unittest
+import yaml
+from collections import OrderedDict
+import translator.hot.syntax.hot_template as hot_template
+import translator.hot.syntax.hot_resource as hot_resource
+from osvimdriver.tosca.dumper import HeatYaml, install_heat_dumper
+from osvimdriver.yamlutil import LIBYAML_AVAILABLE
+
+
+def represent_ordereddict(dumper, data):
+    nodes = [(dumper.represent_data(key), dumper.represent_data(value)) for key, value in data.items()]
+    return yaml.nodes.MappingNode('tag:yaml.org,2002:map', nodes)
+
+
+class TestHeatYaml(unittest.TestCase):
+
+    def test_dump_matches_python_dumper(self):
+        python_yaml = HeatYaml(dumper=yaml.Dumper)
+        heat_yaml = HeatYaml()
+        for y in [python_yaml, heat_yaml]:
+            y.add_representer(OrderedDict, represent_ordereddict)
+            y.add_representer(dict, represent_ordereddict)
+        data = OrderedDict([
+            ('resources', OrderedDict([
+                ('server', {'type': 'OS::Nova::Server', 'properties': {
+                    'user_data': '#!/bin/bash\necho "hello"\n  indented\n',
+                    'name': 'héllo',
+                    'metadata': {'long': 'word ' * 40, 'number': '123', 'flag': 'yes', 'empty': ''},
+                    'networks': [{'port': {'get_resource': 'port'}}]
+                }})
+            ])),
+            ('outputs', OrderedDict())
+        ])
+        self.assertEqual(heat_yaml.dump(data, default_flow_style=False), python_yaml.dump(data, default_flow_style=False))
+
+    def test_representers_not_added_to_default_dumper(self):
+        heat_yaml = HeatYaml()
+        heat_yaml.add_representer(OrderedDict, represent_ordereddict)
+        self.assertIs(heat_yaml.dumper.yaml_representers[OrderedDict], represent_ordereddict)
+        self.assertIsNot(yaml.Dumper.yaml_representers.get(OrderedDict, None), represent_ordereddict)
+
+    def test_other_attributes_from_yaml(self):
+        self.assertIs(HeatYaml().nodes, yaml.nodes)
+
+
+class TestInstallHeatDumper(unittest.TestCase):
+
+    def setUp(self):
+        self.original_modules = (hot_template.yaml, hot_resource.yaml)
+
+    def tearDown(self):
+        hot_template.yaml, hot_resource.yaml = self.original_modules
+
+    def test_install(self):
+        heat_yaml = HeatYaml()
+        install_heat_dumper(heat_yaml)
+        if LIBYAML_AVAILABLE:
+            self.assertIs(hot_template.yaml, heat_yaml)
+            self.assertIs(hot_resource.yaml, heat_yaml)
+        else:
+            self.assertEqual((hot_template.yaml, hot_resource.yaml), self.original_modules)
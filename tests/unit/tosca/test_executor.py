@@ -0,0 +1,83 @@
+import unittest
+import time
+import threading
+from osvimdriver.tosca.executor import TranslationExecutor, TranslationBusyError, TranslationTimeoutError, get_shared_executor
+
+
+class TestTranslationExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executors = []
+
+    def tearDown(self):
+        for executor in self.executors:
+            executor.shutdown()
+
+    def __executor(self, **kwargs):
+        executor = TranslationExecutor(**kwargs)
+        self.executors.append(executor)
+        return executor
+
+    def test_init_without_workers_fails(self):
+        with self.assertRaises(ValueError) as context:
+            TranslationExecutor(max_workers=0)
+        self.assertEqual(str(context.exception), 'max_workers must be a positive integer')
+
+    def test_run(self):
+        executor = self.__executor(max_workers=1)
+        self.assertEqual(executor.run(sum, [1, 2, 3]), 6)
+        with self.assertRaises(ValueError):
+            executor.run(int, 'not_a_number')
+        # The worker is not affected by an error raised by a job
+        self.assertEqual(executor.run(sum, [1, 2]), 3)
+
+    def test_run_timeout_replaces_workers(self):
+        executor = self.__executor(max_workers=1, timeout_seconds=0.5)
+        with self.assertRaises(TranslationTimeoutError) as context:
+            executor.run(time.sleep, 30)
+        self.assertEqual(str(context.exception), 'Translation did not complete within 0.5 seconds')
+        executor.timeout_seconds = 60
+        self.assertEqual(executor.run(sum, [1, 2]), 3)
+
+    def test_run_timeout_excludes_time_waiting_for_worker(self):
+        executor = self.__executor(max_workers=1, timeout_seconds=1.5)
+        # Start the worker, so only the jobs below are timed
+        executor.run(sum, [])
+        results = []
+        def run_job():
+            try:
+                results.append(executor.run(time.sleep, 1))
+            except Exception as e:
+                results.append(e)
+        threads = [threading.Thread(target=run_job) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # The second job waits 1 second for the worker, then runs for 1 second, which is within its timeout
+        self.assertEqual(results, [None, None])
+
+    def test_run_rejects_jobs_when_queue_full(self):
+        executor = self.__executor(max_workers=1, max_queue_depth=0)
+        # Start the worker, so the sleep below is running by the time the second job is submitted
+        executor.run(sum, [])
+        worker_thread = threading.Thread(target=executor.run, args=(time.sleep, 1))
+        worker_thread.start()
+        time.sleep(0.2)
+        try:
+            with self.assertRaises(TranslationBusyError):
+                executor.run(sum, [1])
+        finally:
+            worker_thread.join()
+        self.assertEqual(executor.run(sum, [1]), 1)
+
+    def test_run_with_memory_limit(self):
+        executor = self.__executor(max_workers=1, memory_limit_mb=512)
+        with self.assertRaises(MemoryError):
+            executor.run(bytearray, 1024 * 1024 * 1024)
+
+    def test_get_shared_executor(self):
+        executor = get_shared_executor(max_workers=1, timeout_seconds=10)
+        self.executors.append(executor)
+        self.assertIs(get_shared_executor(max_workers=1, timeout_seconds=10), executor)
+        self.assertIsNot(get_shared_executor(max_workers=2, timeout_seconds=10), executor)
@@ -0,0 +1,60 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+from osvimdriver.tosca.loader import DefinitionsLoader, install_definitions_loader, definitions_loader
+import osvimdriver.tosca.definitions as tosca_definitions
+
+
+class TestDefinitionsLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.definition_file = os.path.join(self.tmp_dir, 'types.yaml')
+        with open(self.definition_file, 'w') as f:
+            f.write('node_types:\n  MyType:\n    derived_from: tosca.nodes.Root\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_definition_file_parses_once(self):
+        mock_yaml_loader = MagicMock(return_value={'node_types': {'MyType': {}}})
+        loader = DefinitionsLoader([self.definition_file], yaml_loader=mock_yaml_loader)
+        first = loader.load_yaml(self.definition_file)
+        second = loader.load_yaml(os.path.join(self.tmp_dir, '.', 'types.yaml'))
+        self.assertEqual(first, {'node_types': {'MyType': {}}})
+        self.assertEqual(first, second)
+        mock_yaml_loader.assert_called_once_with(self.definition_file, True)
+
+    def test_load_definition_file_returns_copies(self):
+        loader = DefinitionsLoader([self.definition_file])
+        first = loader.load_yaml(self.definition_file)
+        first['node_types']['MyType']['derived_from'] = 'changed'
+        second = loader.load_yaml(self.definition_file)
+        self.assertEqual(second['node_types']['MyType']['derived_from'], 'tosca.nodes.Root')
+
+    def test_load_other_file_passed_through(self):
+        mock_yaml_loader = MagicMock(return_value={})
+        loader = DefinitionsLoader([self.definition_file], yaml_loader=mock_yaml_loader)
+        other_file = os.path.join(self.tmp_dir, 'other.yaml')
+        loader.load_yaml(other_file)
+        loader.load_yaml(other_file)
+        self.assertEqual(mock_yaml_loader.call_count, 2)
+
+    def test_load_url_passed_through(self):
+        mock_yaml_loader = MagicMock(return_value={})
+        loader = DefinitionsLoader([self.definition_file], yaml_loader=mock_yaml_loader)
+        loader.load_yaml('http://example.com/types.yaml', a_file=False)
+        loader.load_yaml('http://example.com/types.yaml', a_file=False)
+        self.assertEqual(mock_yaml_loader.call_count, 2)
+
+    def test_load_driver_definitions(self):
+        for definition_file in tosca_definitions.DEFINITION_FILES:
+            self.assertIsInstance(definitions_loader.load_yaml(definition_file), dict)
+
+    @patch('osvimdriver.tosca.loader.toscaparser.imports')
+    def test_install_definitions_loader(self, mock_imports):
+        loader = DefinitionsLoader([self.definition_file])
+        install_definitions_loader(loader)
+        self.assertEqual(mock_imports.YAML_LOADER, loader.load_yaml)
@@ -0,0 +1,34 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from osvimdriver.tosca.translations.tosca_os_nfv_vducp import OSNfvVducp
+
+
+class TestOSNfvVducp(unittest.TestCase):
+
+    def __build_vducp(self, templates, tosca_props, virtual_link=None, properties=None):
+        vducp = OSNfvVducp.__new__(OSNfvVducp)
+        vducp.nodetemplate = MagicMock(templates=templates)
+        vducp.virtual_link = virtual_link
+        vducp.properties = properties if properties is not None else {}
+        vducp.get_tosca_props = MagicMock(return_value=tosca_props)
+        return vducp
+
+    @patch('osvimdriver.tosca.translations.tosca_os_nfv_vducp.ToscaNfvVducp.handle_properties')
+    def test_security_groups_in_topology_use_get_resource(self, _):
+        templates = {'sg_a': {'type': 'tosca.nodes.network.NeutronSecurityGroup'}, 'cp': {}}
+        vducp = self.__build_vducp(templates, {'security_groups': ['sg_a', 'external', {'get_input': 'sg'}]})
+        vducp.handle_properties()
+        self.assertEqual(vducp.properties['security_groups'], [{'get_resource': 'sg_a'}, 'external', {'get_input': 'sg'}])
+
+    @patch('osvimdriver.tosca.translations.tosca_os_nfv_vducp.ToscaNfvVducp.handle_properties')
+    def test_network_not_in_topology_uses_name(self, _):
+        vducp = self.__build_vducp({'cp': {}}, {}, virtual_link='external_net', properties={'network': '{ get_resource: external_net }'})
+        vducp.handle_properties()
+        self.assertEqual(vducp.properties['network'], 'external_net')
+
+    @patch('osvimdriver.tosca.translations.tosca_os_nfv_vducp.ToscaNfvVducp.handle_properties')
+    def test_network_in_topology_with_only_name_uses_name(self, _):
+        templates = {'cp': {}, 'vl': {'type': 'tosca.nodes.network.NeutronNetwork', 'properties': {'name': 'existing_net'}}}
+        vducp = self.__build_vducp(templates, {}, virtual_link='vl', properties={'network': '{ get_resource: vl }'})
+        vducp.handle_properties()
+        self.assertEqual(vducp.properties['network'], 'existing_net')